@@ -0,0 +1,27 @@
+"""
+Jisaku Scan
+
+Repository maintenance scans: unused files (jisaku_scan.unused) and
+untested files (jisaku_scan.untested).
+
+`python3 -m jisaku_scan check` runs both on one shared scan of the tree;
+find-unused-files.py and find-untested-files.py are thin wrappers that
+run one of them. `python3 -m jisaku_scan watch` keeps the scan in memory
+and answers `python3 -m jisaku_scan query` (jisaku_scan.daemon).
+`python3 -m jisaku_scan check --shard I/N` and `merge` split the scan across
+machines (jisaku_scan.shard).
+`python3 -m jisaku_scan exports` finds unused exports (jisaku_scan.exports).
+`python3 -m jisaku_scan affected-tests` lists the tests importing changed
+files (jisaku_scan.impact).
+`python3 -m jisaku_scan chunks` reports the weight of each lazily loaded
+route (jisaku_scan.chunks).
+`python3 -m jisaku_scan barrels` ranks barrels by fan-out cost
+(jisaku_scan.fanout).
+`python3 -m jisaku_scan assets` finds unreferenced files in public/
+(jisaku_scan.assets).
+`python3 -m jisaku_scan components` reports components imported but never
+rendered, or rendered once through a shared barrel (jisaku_scan.components).
+"""
+
+# Bump when extraction or resolution logic changes to invalidate on-disk caches
+SCANNER_VERSION = '4'
@@ -0,0 +1,9 @@
+"""
+Run the scanners as a module: python3 -m jisaku_scan check [--unused] [--untested]
+"""
+
+from jisaku_scan.cli import main
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Unused Static Assets
+
+Finds files in public/ that nothing references. Vite copies public/ into
+the build output as is and the PWA plugin precaches every file matching
+the workbox globPatterns of vite.config.ts, so an unused asset still adds
+to the install and precache payload.
+
+Assets are referenced by their path relative to public/, usually as an
+absolute URL ('/pwa-192x192.svg'): from index.html, from the Vite and PWA
+config (includeAssets, manifest icons), from Vue templates, CSS url() and
+TS string literals. Every text file of the project (REFERRING_SUFFIXES) is
+read once as bytes and searched with a single LiteralMatcher over all
+asset paths; nothing is decoded or parsed. A match must not extend a
+longer name on either side ('icon.svg' does not match 'app-icon.svg').
+
+Paths built at runtime (`${import.meta.env.BASE_URL}${file}`, as sql.js
+locates sql-wasm.wasm) are not seen; such assets are listed in the
+'unused_assets' section of jisaku_scan/ignore.json. The scanner's own
+files are not searched, so that entry does not keep the asset alive by
+naming it. An asset referenced only by another unused asset still counts
+as referenced.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from jisaku_scan.ignore import load_ignore_rules
+from jisaku_scan.matcher import LiteralMatcher
+from jisaku_scan.parallel import imap_ordered
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.stats import STATS
+
+
+PUBLIC_DIR = 'public'
+
+# The scanner's own files (ignore.json names the assets it exempts) are not searched
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+# Files searched for asset references
+REFERRING_SUFFIXES = frozenset(['.html', '.ts', '.js', '.mjs', '.cjs', '.vue', '.css', '.json', '.webmanifest'])
+
+# An asset path is delimited by anything but a name character ('/', quotes, '?', ')', ...)
+ASSET_NOT_AFTER = r'[\w.-]'
+ASSET_AFTER = r'(?![\w-])'
+
+
+class UnusedAsset(NamedTuple):
+    """
+    Asset that no file references.
+
+    Attributes:
+        path: Asset, relative to the root
+        size: Size in bytes
+    """
+
+    path: str
+    size: int
+
+
+def find_references(task: Tuple[str, LiteralMatcher]) -> Set[str]:
+    """
+    Find the asset paths one file references.
+
+    Args:
+        task: (absolute path of the file, matcher over every asset path)
+
+    Returns:
+        Asset paths found in the file (empty if it cannot be read)
+    """
+    file_path, matcher = task
+    try:
+        with open(file_path, 'rb') as f:
+            return matcher.matches(f.read())
+    except OSError:
+        return set()
+
+
+def find_unused_assets(root_dir: Path, scan: Optional[ProjectScan] = None, jobs: int = 1,
+                       public_dir: str = PUBLIC_DIR) -> List[UnusedAsset]:
+    """
+    Find the files of the public directory that no project file references.
+
+    Args:
+        root_dir: Root directory
+        scan: Shared scan of root_dir (built if not given)
+        jobs: Maximum number of worker processes for reading
+        public_dir: Directory served as is, relative to root_dir
+
+    Returns:
+        Unused assets, largest first
+
+    Raises:
+        ValueError: If the ignore configuration is invalid
+    """
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    root_dir = scan.root
+    index = scan.index
+    rules = load_ignore_rules('unused_assets')
+
+    rel_files = index.rel_files()
+    prefix = os.path.normpath(public_dir) + os.sep
+    # '/'-separated path below public_dir (as in URLs) -> path relative to the root
+    assets: Dict[str, str] = {
+        rel_file[len(prefix):].replace(os.sep, '/'): rel_file
+        for rel_file in rel_files if rel_file.startswith(prefix)
+    }
+    if not assets:
+        STATS.collect(scan)
+        return []
+
+    matcher = LiteralMatcher(assets, not_after=ASSET_NOT_AFTER, after=ASSET_AFTER, binary=True)
+    referring = [rel_file for rel_file in rel_files if os.path.splitext(rel_file)[1] in REFERRING_SUFFIXES]
+    package = index.relative(PACKAGE_DIR)
+    if package is not None:
+        referring = [rel_file for rel_file in referring if not rel_file.startswith(package + os.sep)]
+    referenced: Set[str] = set()
+    with STATS.phase('references'):
+        tasks = [(str(root_dir / rel_file), matcher) for rel_file in referring]
+        for rel_file, found in zip(referring, imap_ordered(find_references, tasks, jobs)):
+            if rel_file.startswith(prefix):
+                # A text asset naming itself does not keep itself alive
+                found.discard(rel_file[len(prefix):].replace(os.sep, '/'))
+            referenced.update(found)
+    STATS.add('asset_files_read', len(referring))
+
+    unused = []
+    for asset, rel_file in assets.items():
+        if asset in referenced or rel_file in rules.files or rules.ignores_dir(os.path.dirname(rel_file)):
+            continue
+        stat = index.stat(root_dir / rel_file)
+        unused.append(UnusedAsset(rel_file, stat.st_size if stat is not None else 0))
+    unused.sort(key=lambda asset: (-asset.size, asset.path))
+
+    STATS.collect(scan)
+    return unused
@@ -0,0 +1,312 @@
+"""
+Barrel Index
+
+Parse-once index of re-exports (`export ... from '...'`) in barrel files.
+
+Every barrel is read and parsed a single time into a name -> source map.
+Lookups follow `export * from` and nested barrels transitively, and
+multi-line `export { ... }` lists are handled like single-line ones.
+The same parse also decides whether a file is a barrel export, so both
+scripts classify barrels identically.
+"""
+
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# String literals (kept) or comments (removed)
+COMMENT_PATTERN = re.compile(r'''('(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")|/\*.*?\*/|//[^\n]*''', re.DOTALL)
+
+# export { a, b as c } from '...' / export type { ... } from '...'
+# export * from '...' / export * as ns from '...'
+REEXPORT_PATTERN = re.compile(
+    r'''export\s+(?:type\s+)?(?:\*\s*(?:as\s+([\w$]+)\s*)?|\{([^}]*)\}\s*)from\s*(['"])([^'"]+)\3\s*;?'''
+)
+
+# One entry of an export/import specifier list: [type] name [as alias]
+SPECIFIER_PATTERN = re.compile(r'^(?:type\s+)?([\w$]+)(?:\s+as\s+([\w$]+))?$')
+
+# Local declarations: export const foo / export function foo / export class Foo ...
+DECLARED_EXPORT_PATTERN = re.compile(
+    r'\bexport\s+(?:declare\s+)?(?:async\s+)?'
+    r'(?:const|let|var|function\s*\*?|class|interface|type|enum|abstract\s+class)\s+([\w$]+)'
+)
+# Local export lists: export { foo, bar as baz } (without a from clause)
+LOCAL_EXPORT_LIST_PATTERN = re.compile(r'\bexport\s+(?:type\s+)?\{([^}]*)\}(?!\s*from)')
+DEFAULT_EXPORT_PATTERN = re.compile(r'\bexport\s+default\b')
+
+
+def strip_comments(content: str) -> str:
+    """
+    Remove block and line comments, leaving string literals untouched.
+
+    Args:
+        content: Source text
+
+    Returns:
+        Source text without comments
+    """
+    return COMMENT_PATTERN.sub(lambda m: m.group(1) or '', content)
+
+
+def parse_specifiers(specifiers: str) -> List[Tuple[str, str]]:
+    """
+    Parse a `{ ... }` specifier list into (source name, local/exported name) pairs.
+
+    Handles `type` modifiers, `as` aliases, trailing commas and newlines.
+
+    Args:
+        specifiers: Text between the braces
+
+    Returns:
+        List of (name, alias) tuples; alias equals name when there is no `as`
+    """
+    pairs = []
+    for part in specifiers.split(','):
+        match = SPECIFIER_PATTERN.match(' '.join(part.split()))
+        if match:
+            name = match.group(1)
+            pairs.append((name, match.group(2) or name))
+    return pairs
+
+
+class ModuleExports:
+    """
+    Re-exports found in a single module.
+
+    Attributes:
+        named: exported name -> (specifier, name in the source module);
+            the source name is '*' for `export * as ns from`
+        star: specifiers of `export * from` statements, in file order
+        is_barrel: True if the module contains only re-export statements
+    """
+
+    def __init__(self, named: Dict[str, Tuple[str, str]], star: List[str], is_barrel: bool):
+        self.named = named
+        self.star = star
+        self.is_barrel = is_barrel
+
+
+def parse_module_exports(content: str) -> ModuleExports:
+    """
+    Parse the re-export statements of a module.
+
+    Args:
+        content: Source text of the module
+
+    Returns:
+        ModuleExports describing the module's re-exports
+    """
+    content = strip_comments(content)
+    named: Dict[str, Tuple[str, str]] = {}
+    star: List[str] = []
+
+    # Walk the statements in order; a barrel consumes all of its text
+    # with re-export statements
+    pos = 0
+    is_barrel = True
+    consumed_any = False
+    for match in REEXPORT_PATTERN.finditer(content):
+        if content[pos:match.start()].strip():
+            is_barrel = False
+        pos = match.end()
+        consumed_any = True
+
+        namespace, specifiers, _, specifier = match.groups()
+        if specifiers is not None:
+            for source_name, exported_name in parse_specifiers(specifiers):
+                named.setdefault(exported_name, (specifier, source_name))
+        elif namespace:
+            named.setdefault(namespace, (specifier, '*'))
+        else:
+            star.append(specifier)
+
+    if content[pos:].strip() or not consumed_any:
+        is_barrel = False
+
+    return ModuleExports(named, star, is_barrel)
+
+
+def resolve_relative(importing_file: Path, specifier: str) -> Optional[Path]:
+    """
+    Default resolver for re-export specifiers (relative paths only).
+
+    Args:
+        importing_file: The barrel containing the specifier
+        specifier: Module specifier (e.g., './BaseSwitch.vue', './composables')
+
+    Returns:
+        Path to the target file, or None if not found
+    """
+    if not specifier.startswith(('./', '../')):
+        return None
+    target = (importing_file.parent / specifier).resolve()
+    if target.is_dir():
+        index_file = target / 'index.ts'
+        return index_file if index_file.exists() else None
+    if target.exists():
+        return target
+    for ext in ['.ts', '.vue', '.js']:
+        candidate = target.parent / (target.name + ext)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+class BarrelIndex:
+    """
+    Cache of parsed re-exports, keyed by file, with transitive name lookup.
+
+    Each file is read at most once. Name lookups are memoized too, so a
+    barrel imported from hundreds of files is only walked once per name.
+    """
+
+    def __init__(self, resolve: Optional[Callable[[Path, str], Optional[Path]]] = None):
+        """
+        Create an empty index.
+
+        Args:
+            resolve: Function resolving (importing file, specifier) to a file path;
+                defaults to relative-only resolution
+        """
+        self._resolve = resolve or resolve_relative
+        self._exports: Dict[Path, Optional[ModuleExports]] = {}
+        self._declared: Dict[Path, Set[str]] = {}
+        self._lookups: Dict[Tuple[Path, str], List[Path]] = {}
+        # Counters read by --timings
+        self.files_read = 0
+        self.lookups = 0
+
+    def invalidate(self, file_paths: Iterable[Path]) -> None:
+        """
+        Forget the parsed exports of changed files.
+
+        Name lookups are transitive, so all of them are dropped.
+
+        Args:
+            file_paths: Paths of files that changed, were added or were removed
+        """
+        for file_path in file_paths:
+            self._exports.pop(file_path, None)
+            self._declared.pop(file_path, None)
+        self._lookups.clear()
+
+    def _read(self, file_path: Path) -> Optional[str]:
+        self.files_read += 1
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except (UnicodeDecodeError, OSError):
+            return None
+
+    def exports(self, file_path: Path) -> Optional[ModuleExports]:
+        """
+        Get the parsed re-exports of a file (parsed on first access).
+
+        Args:
+            file_path: Path to the module
+
+        Returns:
+            ModuleExports, or None if the file cannot be read
+        """
+        if file_path not in self._exports:
+            content = self._read(file_path)
+            self._exports[file_path] = None if content is None else parse_module_exports(content)
+        return self._exports[file_path]
+
+    def is_barrel(self, file_path: Path) -> bool:
+        """
+        Check if a file is a barrel export (only contains re-export statements).
+
+        Args:
+            file_path: Path to the file to check
+
+        Returns:
+            True if the file is a barrel export
+        """
+        exports = self.exports(Path(file_path))
+        return exports is not None and exports.is_barrel
+
+    def declared_names(self, file_path: Path) -> Set[str]:
+        """
+        Get the names a non-barrel module declares as exports.
+
+        Used to decide whether `export * from` a plain module provides a name.
+
+        Args:
+            file_path: Path to the module
+
+        Returns:
+            Set of exported names ('default' included when present)
+        """
+        if file_path not in self._declared:
+            content = self._read(file_path)
+            names: Set[str] = set()
+            if content is not None:
+                content = strip_comments(content)
+                names.update(DECLARED_EXPORT_PATTERN.findall(content))
+                for specifiers in LOCAL_EXPORT_LIST_PATTERN.findall(content):
+                    names.update(alias for _, alias in parse_specifiers(specifiers))
+                if DEFAULT_EXPORT_PATTERN.search(content):
+                    names.add('default')
+            self._declared[file_path] = names
+        return self._declared[file_path]
+
+    def lookup(self, barrel_file: Path, export_name: str) -> List[Path]:
+        """
+        Find the files an exported name is re-exported through.
+
+        For example, if index.ts has "export { default as BaseSwitch } from './BaseSwitch.vue'",
+        looking up BaseSwitch returns [BaseSwitch.vue]. Nested barrels and
+        `export * from` chains are followed, and every file on the way is returned.
+
+        Args:
+            barrel_file: Path to the barrel export file (index.ts)
+            export_name: The name of the export being imported
+
+        Returns:
+            List of files the name passes through (empty if not found)
+        """
+        self.lookups += 1
+        return self._lookup(Path(barrel_file), export_name, set())
+
+    def _lookup(self, barrel_file: Path, export_name: str, visiting: Set[Tuple[Path, str]]) -> List[Path]:
+        key = (barrel_file, export_name)
+        cached = self._lookups.get(key)
+        if cached is not None:
+            return cached
+        if key in visiting:
+            # Re-export cycle
+            return []
+        visiting.add(key)
+
+        result: List[Path] = []
+        exports = self.exports(barrel_file)
+        if exports is not None:
+            entry = exports.named.get(export_name)
+            if entry is not None:
+                specifier, source_name = entry
+                target = self._resolve(barrel_file, specifier)
+                if target is not None:
+                    result = [target]
+                    if source_name != '*':
+                        result += self._lookup(target, source_name, visiting)
+            else:
+                for specifier in exports.star:
+                    target = self._resolve(barrel_file, specifier)
+                    if target is None:
+                        continue
+                    found = self._lookup(target, export_name, visiting)
+                    if found:
+                        result = [target] + found
+                        break
+                    target_exports = self.exports(target)
+                    if (target_exports is None or not target_exports.is_barrel) and \
+                            export_name in self.declared_names(target):
+                        result = [target]
+                        break
+
+        visiting.discard(key)
+        self._lookups[key] = result
+        return result
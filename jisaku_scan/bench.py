@@ -0,0 +1,261 @@
+"""
+Benchmark Harness
+
+Times each phase of the scanners on synthetic trees (see
+jisaku_scan.synthetic) and compares the results against a JSON baseline.
+
+Phases:
+    walk      Build the file index, resolver and barrel index (ProjectScan)
+    parse     Read every scanned file and extract its imports (no parse cache)
+    resolve   Resolve every specifier against the index and tsconfig paths
+    barrels   Turn resolutions into edges, following named imports through barrels
+    report    Classify files, mark and sweep from the entry points, find
+              orphaned tests and untested files
+
+Each repetition starts from a fresh ProjectScan, so memoization does not
+carry over between runs. One untimed warm-up run fills the OS file cache.
+
+Trees are generated in a temporary directory removed after the run, so
+benchmark output never lands in the working tree; --dir keeps them in a
+given directory (outside the repository) to reuse them between runs.
+"""
+
+import json
+import platform
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from jisaku_scan.graph import DependencyGraph
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.synthetic import generate_repo
+from jisaku_scan.untested import find_untested_files
+from jisaku_scan.unused import (
+    find_orphaned_test_files, find_source_files, is_scanned_file, mark_and_sweep,
+    parse_files, resolve_edges, resolve_specifiers,
+)
+
+
+PHASES = ['walk', 'parse', 'resolve', 'barrels', 'report']
+
+# Differences below this many seconds are noise, never a regression
+NOISE_FLOOR = 0.002
+
+
+def run_once(root_dir: Path, jobs: int = 1) -> Dict[str, object]:
+    """
+    Run every phase once and time it.
+
+    Args:
+        root_dir: Root of the tree to scan
+        jobs: Worker processes for the parse phase
+
+    Returns:
+        Dict with 'times' (phase -> seconds), 'files' (files indexed) and
+        'findings' (analysis -> count)
+    """
+    times: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    # Always walked: the timings must not depend on where the tree lives
+    scan = ProjectScan(root_dir, use_git=False)
+    times['walk'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rel_files = scan.index.rel_files()
+    scanned = [rel_file for rel_file in rel_files if is_scanned_file(Path(rel_file))]
+    parsed_files = parse_files(scan.root, scanned, scan.index, jobs=jobs)
+    times['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resolutions = {
+        rel_file: resolve_specifiers(scan.root / rel_file, parsed_files[rel_file], scan.resolver)
+        for rel_file in scanned if parsed_files[rel_file] is not None
+    }
+    times['resolve'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph = DependencyGraph()
+    for rel_file, file_resolutions in resolutions.items():
+        file_path = scan.root / rel_file
+        graph.set_edges(str(file_path), resolve_edges(
+            file_path, parsed_files[rel_file], scan.barrels, scan.resolver, file_resolutions
+        ))
+    times['barrels'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    source_files = find_source_files(scan.root, scan.index, scan.barrels)
+    _, unused = mark_and_sweep(scan.root, graph, source_files)
+    unused.extend(find_orphaned_test_files(scan.root, scan.index))
+    untested = find_untested_files(str(scan.root), scan.index, scan.barrels)
+    times['report'] = time.perf_counter() - start
+
+    return {
+        'times': times,
+        'files': len(rel_files),
+        'findings': {'unused': len(unused), 'untested': len(untested)},
+    }
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize repeated timings of one phase.
+
+    Args:
+        samples: Seconds per repetition
+
+    Returns:
+        Dict with min, median, mean and stdev (seconds)
+    """
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run_benchmark(size: str, total_files: int, repeat: int = 5, jobs: int = 1,
+                  bench_dir: Optional[Path] = None, seed: int = 0) -> Dict[str, object]:
+    """
+    Generate (or reuse) a synthetic tree and time the scanners on it.
+
+    Args:
+        size: Name of the size (e.g. '10k'), used for the tree directory
+        total_files: Number of files to generate
+        repeat: Timed repetitions (after one warm-up run)
+        jobs: Worker processes for the parse phase
+        bench_dir: Directory keeping the generated trees (a temporary
+            directory, removed afterwards, if not given)
+        seed: Seed of the generator
+
+    Returns:
+        Benchmark result (see format_result for the fields)
+
+    Raises:
+        ValueError: If the scan indexes fewer files than the tree has (timings
+            of an empty scan would pass any baseline)
+    """
+    if bench_dir is None:
+        with tempfile.TemporaryDirectory(prefix='jisaku-bench-') as temp_dir:
+            return run_benchmark(size, total_files, repeat, jobs, Path(temp_dir), seed)
+
+    root_dir = Path(bench_dir) / size
+    file_count = generate_repo(root_dir, total_files, seed)
+
+    warmup = run_once(root_dir, jobs)
+    if warmup['files'] < file_count:
+        raise ValueError(f"the scan of '{root_dir}' indexed {warmup['files']} of {file_count} generated files")
+    runs = [run_once(root_dir, jobs) for _ in range(max(1, repeat))]
+
+    phases = {phase: summarize([run['times'][phase] for run in runs]) for phase in PHASES}
+    phases['total'] = summarize([sum(run['times'].values()) for run in runs])
+    return {
+        'size': size,
+        'files': file_count,
+        'seed': seed,
+        'repeat': len(runs),
+        'jobs': jobs,
+        'python': platform.python_version(),
+        'phases': phases,
+        'findings': runs[-1]['findings'],
+    }
+
+
+def compare(result: Dict[str, object], baseline: Dict[str, object],
+            tolerance: float = 0.1) -> List[str]:
+    """
+    Compare a result against a baseline of the same size.
+
+    A phase regresses when its median exceeds the baseline median by more
+    than the tolerance (and by more than the noise floor).
+
+    Args:
+        result: Result of run_benchmark
+        baseline: Earlier result, as saved to the baseline file
+        tolerance: Allowed slowdown as a fraction (0.1 = 10%)
+
+    Returns:
+        Human-readable regression messages (empty if none)
+    """
+    problems = []
+    if baseline.get('files') != result['files']:
+        problems.append(f"tree size differs from the baseline ({baseline.get('files')} vs {result['files']} files)")
+    if baseline.get('findings') != result['findings']:
+        problems.append(f"findings differ from the baseline ({baseline.get('findings')} vs {result['findings']})")
+    for phase, stats in result['phases'].items():
+        base = baseline.get('phases', {}).get(phase)
+        if base is None:
+            continue
+        limit = base['median'] * (1 + tolerance)
+        if stats['median'] > limit and stats['median'] - base['median'] > NOISE_FLOOR:
+            problems.append(
+                f"{phase}: median {stats['median'] * 1000:.1f} ms vs baseline {base['median'] * 1000:.1f} ms "
+                f"(+{(stats['median'] / base['median'] - 1) * 100:.0f}%)"
+            )
+    return problems
+
+
+def format_result(result: Dict[str, object], baseline: Optional[Dict[str, object]] = None) -> str:
+    """
+    Format a result as a table of phase timings in milliseconds.
+
+    Args:
+        result: Result of run_benchmark
+        baseline: Baseline of the same size, adds a column with its medians
+
+    Returns:
+        Printable table
+    """
+    lines = [
+        f"{result['size']}: {result['files']} files, {result['repeat']} runs, "
+        f"jobs={result['jobs']}, Python {result['python']}, findings {result['findings']}",
+        f"  {'phase':<8} {'min':>9} {'median':>9} {'mean':>9} {'stdev':>8}" + (f" {'baseline':>9}" if baseline else ''),
+    ]
+    for phase, stats in result['phases'].items():
+        line = f"  {phase:<8}" + ''.join(
+            f" {stats[key] * 1000:>{width}.1f}" for key, width in [('min', 9), ('median', 9), ('mean', 9), ('stdev', 8)]
+        )
+        if baseline:
+            base = baseline.get('phases', {}).get(phase)
+            line += f" {base['median'] * 1000:>9.1f}" if base else f" {'-':>9}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, object]]:
+    """
+    Read a baseline file.
+
+    Args:
+        path: JSON file written by save_baseline
+
+    Returns:
+        Mapping of size name -> result (empty if the file does not exist)
+
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('results', {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: Path, results: List[Dict[str, object]]) -> None:
+    """
+    Write results to a baseline file, keeping other sizes already in it.
+
+    Args:
+        path: JSON file to write
+        results: Results of run_benchmark
+    """
+    merged = load_baseline(path)
+    merged.update({result['size']: result for result in results})
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'results': merged}, f, indent=2, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,466 @@
+"""
+Parse Cache
+
+Persistent on-disk cache of per-file import extraction results.
+
+Entries are stored in a SQLite database and keyed by mtime, size and a
+content hash. A file whose mtime and size are unchanged is not read at
+all; a file whose mtime changed but whose content hash matches (e.g. after
+a git checkout) is read and hashed but not parsed again. When the file
+index comes from git, entries also record the file's blob ID: a file
+unmodified since the git index whose blob ID matches is fresh without
+even being stat'ed.
+
+Each analysis passes a namespace (the name of its import extractor) and
+gets its own database, so analyses with different extractors keep their
+entries side by side: `make check`, the exports scan and the chunk
+weights scan no longer evict each other. A database is dropped when its
+fingerprint (scanner version plus the scanner's own sources and ignore
+configuration) changes, leaving the other namespaces alone.
+
+Databases live in node_modules/.cache/jisaku-scan below the scanned root
+(see cache_dir_for), next to the other tool caches of that project.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from jisaku_scan import SCANNER_VERSION
+from jisaku_scan.stats import STATS
+
+
+# Cache location relative to the scanned root, next to the other tool caches
+CACHE_SUBDIR = Path('node_modules') / '.cache' / 'jisaku-scan'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    parsed TEXT NOT NULL,
+    tree TEXT,
+    resolved TEXT,
+    edges TEXT,
+    blob TEXT
+);
+'''
+
+
+def content_hash(data: Any) -> str:
+    """
+    Hash file content for cache validation.
+
+    Args:
+        data: Raw file content (bytes or any buffer, e.g. an mmap)
+
+    Returns:
+        Hex digest of the content
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def cache_dir_for(root_dir: Path) -> Path:
+    """Get the cache directory of a project root (node_modules/.cache/jisaku-scan below it)."""
+    return Path(root_dir) / CACHE_SUBDIR
+
+
+def fingerprint(*parts: Iterable[str], files: Iterable[Path] = ()) -> str:
+    """
+    Build a cache fingerprint from the scanner version, config values and files.
+
+    The sources of this package (and its JSON config) are always included,
+    so any change to the extraction or resolution code invalidates existing
+    caches.
+
+    Args:
+        parts: Iterables of configuration strings (e.g. ignore sets)
+        files: Extra files (scripts, config files) whose content should
+            invalidate the cache when changed
+
+    Returns:
+        Hex digest identifying this scanner configuration
+    """
+    digest = hashlib.blake2b(SCANNER_VERSION.encode(), digest_size=16)
+    for part in parts:
+        for value in sorted(part):
+            digest.update(b'\0' + value.encode())
+    package_dir = Path(__file__).resolve().parent
+    package_files = sorted([*package_dir.glob('*.py'), *package_dir.glob('*.json')])
+    for file_path in [*package_files, *files]:
+        try:
+            digest.update(b'\1' + Path(file_path).read_bytes())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+# Files at least this large are memory-mapped instead of read into a bytes object
+MMAP_THRESHOLD = 1 << 20
+
+# (content hash, size, reused, result, decoded); hash is None if the file could not be read
+ParseOutcome = Tuple[Optional[str], int, bool, Any, bool]
+
+# Byte-level check deciding whether a file can contain anything the parser finds
+Prefilter = Callable[[Any], bool]
+
+
+def read_and_parse(task: Tuple[str, Optional[str], Callable[[str], Any], Optional[Prefilter]]) -> ParseOutcome:
+    """
+    Read, hash and parse a single file.
+
+    Runs in worker processes, so it only takes and returns picklable values.
+    Large files are memory-mapped. A file the prefilter rejects is never
+    decoded; its result is what the parser returns for empty content.
+
+    Args:
+        task: (file path, known content hash or None, parse function,
+            prefilter or None); the file is not parsed again when its hash
+            equals the known one
+
+    Returns:
+        (content hash, size, reused, result, decoded); result is None when
+        the file is not valid UTF-8
+    """
+    file_path, known_digest, parse_content, prefilter = task
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return _hash_and_parse(data, known_digest, parse_content, prefilter)
+            data = f.read()
+    except (OSError, ValueError):
+        return None, 0, False, None, False
+    return _hash_and_parse(data, known_digest, parse_content, prefilter)
+
+
+def _hash_and_parse(data: Any, known_digest: Optional[str], parse_content: Callable[[str], Any],
+                    prefilter: Optional[Prefilter]) -> ParseOutcome:
+    """Hash file content (bytes or mmap) and parse it unless unchanged or rejected by the prefilter."""
+    digest = content_hash(data)
+    if digest == known_digest:
+        return digest, len(data), True, None, False
+    if prefilter is not None and not prefilter(data):
+        return digest, len(data), False, parse_content(''), False
+    try:
+        result = parse_content(str(data, 'utf-8'))
+    except UnicodeDecodeError:
+        result = None
+    return digest, len(data), False, result, True
+
+
+class ParseCache:
+    """
+    SQLite-backed cache of parse and resolution results for one project root and namespace.
+
+    All rows are loaded on open and changes are written back in a single
+    transaction by close(), so lookups during the scan are dictionary hits.
+    """
+
+    def __init__(self, root_dir: Path, config_fingerprint: str, namespace: str,
+                 cache_dir: Optional[Path] = None):
+        """
+        Open (or create) the cache of one namespace for a project root.
+
+        If the database cannot be opened the cache silently behaves as empty.
+
+        Args:
+            root_dir: Root directory being scanned
+            config_fingerprint: Value from fingerprint(); a mismatch drops the
+                entries of this namespace
+            namespace: Name of the import extractor whose results are cached;
+                each namespace has its own database
+            cache_dir: Directory holding the cache databases (cache_dir_for(root_dir) if not given)
+        """
+        if cache_dir is None:
+            cache_dir = cache_dir_for(root_dir)
+        root_key = hashlib.blake2b(str(root_dir).encode(), digest_size=6).hexdigest()
+        self.path = Path(cache_dir) / f'parse-{root_key}-{namespace}.sqlite'
+        self.hits = 0
+        self.misses = 0
+        # Hits answered by the git blob ID (counted in hits too)
+        self.blob_hits = 0
+        # path -> [mtime_ns, size, hash, parsed, tree, resolved, edges, blob]
+        self._rows: Dict[str, list] = {}
+        self._dirty: Set[str] = set()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=5)
+            self._conn.executescript(SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            if row is None or row[0] != config_fingerprint:
+                with self._conn:
+                    # Recreate the table so schema changes are picked up too
+                    self._conn.execute('DROP TABLE files')
+                    self._conn.executescript(SCHEMA)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                        (config_fingerprint,)
+                    )
+            else:
+                for path, *values in self._conn.execute(
+                        'SELECT path, mtime_ns, size, hash, parsed, tree, resolved, edges, blob FROM files'):
+                    self._rows[path] = values
+        except (OSError, sqlite3.Error):
+            self._conn = None
+            self._rows.clear()
+
+    def parse(self, rel_path: str, file_path: Path, stat: Optional[os.stat_result],
+              parse_content: Callable[[str], Any]) -> Any:
+        """
+        Get the parse result for a file, parsing only when its content changed.
+
+        Args:
+            rel_path: Path relative to the project root (cache key)
+            file_path: Absolute path used to read the file
+            stat: stat result of the file (from the file index)
+            parse_content: Function turning decoded content into a JSON-serializable result
+
+        Returns:
+            The parse result, or None if the file cannot be read or decoded
+        """
+        if self.is_fresh(rel_path, stat):
+            return self.result(rel_path)
+        outcome = read_and_parse((str(file_path), self.known_digest(rel_path), parse_content, None))
+        return self.record(rel_path, stat, outcome)
+
+    def result(self, rel_path: str) -> Any:
+        """
+        Get the cached parse result of a fresh entry (see is_fresh).
+
+        Args:
+            rel_path: Path relative to the project root
+
+        Returns:
+            The cached parse result
+        """
+        self.hits += 1
+        return json.loads(self._rows[rel_path][3])
+
+    def known_digest(self, rel_path: str) -> Optional[str]:
+        """Get the content hash recorded for a file, if any."""
+        row = self._rows.get(rel_path)
+        return row[2] if row is not None else None
+
+    def record(self, rel_path: str, stat: Optional[os.stat_result], outcome: ParseOutcome,
+               blob: Optional[str] = None) -> Any:
+        """
+        Store the outcome of read_and_parse for a file.
+
+        Args:
+            rel_path: Path relative to the project root
+            stat: stat result of the file
+            outcome: (digest, size, reused, result, decoded) from read_and_parse
+            blob: git blob ID of the file, if unmodified since the git index
+
+        Returns:
+            The parse result (the cached one if the content was unchanged)
+        """
+        digest, size, reused, result, _ = outcome
+        if digest is None:
+            return None
+        mtime_ns = stat.st_mtime_ns if stat is not None else 0
+        row = self._rows.get(rel_path)
+        if reused and row is not None:
+            # Same content with a new mtime: refresh the key, keep the result
+            self.hits += 1
+            row[0], row[1], row[7] = mtime_ns, size, blob
+            self._dirty.add(rel_path)
+            return json.loads(row[3])
+
+        self.misses += 1
+        self._rows[rel_path] = [mtime_ns, size, digest, json.dumps(result), None, None, None, blob]
+        self._dirty.add(rel_path)
+        return result
+
+    def resolved(self, rel_path: str, tree_key: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Get cached import resolutions for a file.
+
+        Resolutions are only valid for the file set they were computed
+        against, identified by tree_key.
+
+        Args:
+            rel_path: Path relative to the project root
+            tree_key: Signature of the current file set
+
+        Returns:
+            Mapping of specifier -> resolved path (or None), or None if not cached
+        """
+        row = self._rows.get(rel_path)
+        if row is None or row[4] != tree_key or row[5] is None:
+            return None
+        return json.loads(row[5])
+
+    def store_resolved(self, rel_path: str, tree_key: str, resolutions: Dict[str, Optional[str]]) -> None:
+        """
+        Store import resolutions for a file.
+
+        Args:
+            rel_path: Path relative to the project root
+            tree_key: Signature of the current file set
+            resolutions: Mapping of specifier -> resolved path (or None)
+        """
+        row = self._rows.get(rel_path)
+        if row is None:
+            return
+        row[4], row[5] = tree_key, json.dumps(resolutions)
+        self._dirty.add(rel_path)
+
+    def edges(self, rel_path: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Get the dependency edges last recorded for a file.
+
+        Args:
+            rel_path: Path relative to the project root
+
+        Returns:
+            Dict of edge kind -> sorted list of values, or None if not recorded
+        """
+        row = self._rows.get(rel_path)
+        if row is None or row[6] is None:
+            return None
+        return json.loads(row[6])
+
+    def store_edges(self, rel_path: str, edges: Dict[str, Iterable[str]]) -> None:
+        """
+        Record the outgoing dependency edges of a file.
+
+        Args:
+            rel_path: Path relative to the project root
+            edges: Dict of edge kind (e.g. 'used', 'reexports') -> values
+        """
+        row = self._rows.get(rel_path)
+        if row is None:
+            return
+        row[6] = json.dumps({kind: sorted(values) for kind, values in edges.items()})
+        self._dirty.add(rel_path)
+
+    def is_fresh(self, rel_path: str, stat: Optional[os.stat_result], blob: Optional[str] = None) -> bool:
+        """
+        Check whether a cached entry matches the file's current mtime and size.
+
+        Args:
+            rel_path: Path relative to the project root
+            stat: Current stat result of the file
+            blob: git blob ID of the file, recorded on a fresh entry for matches_blob
+
+        Returns:
+            True if the entry can be used without reading the file
+        """
+        row = self._rows.get(rel_path)
+        fresh = row is not None and stat is not None and \
+            row[0] == stat.st_mtime_ns and row[1] == stat.st_size
+        if fresh and blob is not None and row[7] != blob:
+            row[7] = blob
+            self._dirty.add(rel_path)
+        return fresh
+
+    def matches_blob(self, rel_path: str, blob: Optional[str]) -> bool:
+        """
+        Check whether a cached entry was recorded for the same git blob.
+
+        Args:
+            rel_path: Path relative to the project root
+            blob: git blob ID of the file if unmodified since the git index (see FileIndex.blob)
+
+        Returns:
+            True if the entry can be used without reading or stat'ing the file
+        """
+        if blob is None:
+            return False
+        row = self._rows.get(rel_path)
+        if row is None or row[7] != blob:
+            return False
+        self.blob_hits += 1
+        return True
+
+    def paths(self) -> List[str]:
+        """Get the relative paths of all cached files."""
+        return list(self._rows)
+
+    def close(self, present: Optional[Set[str]] = None) -> None:
+        """
+        Write changed entries back and close the database.
+
+        Args:
+            present: Relative paths that still exist; entries for other
+                files are removed (nothing is removed if not given)
+        """
+        if self._conn is None:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO files (path, mtime_ns, size, hash, parsed, tree, resolved, edges, blob) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(path, *self._rows[path]) for path in self._dirty]
+                )
+                if present is not None:
+                    stale = [(path,) for path in self._rows if path not in present]
+                    self._conn.executemany('DELETE FROM files WHERE path = ?', stale)
+        except sqlite3.Error:
+            pass
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+
+@contextmanager
+def open_parse_cache(root_dir: Path, extract: Callable[[str], Any], rel_files: Iterable[str],
+                     use_cache: bool = True) -> Iterator[Optional[ParseCache]]:
+    """
+    Open the parse cache of an import extractor and write it back on exit.
+
+    The namespace is the extractor's name, so analyses with the same extractor
+    share entries and the others keep theirs apart. The fingerprint covers the
+    extractor and tsconfig.json (path aliases); fingerprint() adds the scanner
+    version, its sources and the ignore configuration.
+
+    Args:
+        root_dir: Root directory being scanned
+        extract: Import extractor whose results are cached
+        rel_files: Files of the tree; entries of other files are dropped on exit
+        use_cache: Yield None (no cache) if false
+
+    Yields:
+        ParseCache, or None without use_cache
+    """
+    if not use_cache:
+        yield None
+        return
+    config = fingerprint([extract.__name__], files=[root_dir / 'tsconfig.json'])
+    cache = ParseCache(root_dir, config, extract.__name__)
+    try:
+        yield cache
+    finally:
+        with STATS.phase('cache write'):
+            cache.close(present=set(rel_files))
+
+
+def tree_signature(paths: Iterable[str]) -> str:
+    """
+    Hash a set of relative paths into a short signature.
+
+    Args:
+        paths: Relative file paths
+
+    Returns:
+        Hex digest identifying the file set
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(paths):
+        digest.update(path.encode() + b'\0')
+    return digest.hexdigest()
+
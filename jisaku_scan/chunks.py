@@ -0,0 +1,210 @@
+"""
+Route Chunk Weights
+
+Estimates what each route loads: the transitive module closure of every
+page the router imports lazily (`component: () => import('@/pages/...')`
+in src/router/index.ts), with its total source bytes.
+
+The module graph is built with extract_runtime_imports, so only edges that
+survive the build are followed: `import type`, type-only named imports and
+`export type ... from` are erased by the compiler, and dynamic imports start
+chunks of their own. Named imports of a barrel are followed to the modules
+providing the names rather than to every re-export, as Rollup tree-shakes
+side-effect-free modules. Stylesheets referenced from <style> blocks count
+towards the route that imports the component.
+
+Modules statically reachable from src/main.ts are in the entry chunk,
+loaded for every route; each route reports its closure with and without
+them. Modules reached by two or more routes outside the entry chunk are
+listed heaviest first, as candidates for bloat shared between pages.
+
+Sizes are source bytes of project files, not minified output, and
+packages from node_modules are not followed.
+"""
+
+import os
+from array import array
+from itertools import compress
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional
+
+from jisaku_scan.cache import open_parse_cache
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.graph import STYLES, USED, CompactGraph
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.stats import STATS
+from jisaku_scan.tokenizer import scan_module_references
+from jisaku_scan.unused import build_module_graph, extract_runtime_imports
+
+
+DEFAULT_ROUTER = os.path.join('src', 'router', 'index.ts')
+DEFAULT_ENTRY = os.path.join('src', 'main.ts')
+
+
+class RouteWeight(NamedTuple):
+    """
+    Module closure of one lazily loaded route component.
+
+    Attributes:
+        page: Route component, relative to the root
+        modules: Number of modules in its closure (itself included)
+        total_bytes: Source bytes of the closure
+        own_bytes: Source bytes of the closure outside the entry chunk
+    """
+
+    page: str
+    modules: int
+    total_bytes: int
+    own_bytes: int
+
+
+class SharedModule(NamedTuple):
+    """
+    Module loaded by several routes outside the entry chunk.
+
+    Attributes:
+        path: Module, relative to the root
+        size: Source bytes
+        routes: Number of routes whose closure contains it
+    """
+
+    path: str
+    size: int
+    routes: int
+
+
+class ChunkReport(NamedTuple):
+    """
+    Result of find_route_weights.
+
+    Attributes:
+        entry_modules: Number of modules statically reachable from the entry
+        entry_bytes: Source bytes of those modules
+        routes: Weight of each route, heaviest (own_bytes) first
+        shared: Modules shared by two or more routes, heaviest first
+    """
+
+    entry_modules: int
+    entry_bytes: int
+    routes: List[RouteWeight]
+    shared: List[SharedModule]
+
+
+def module_sizes(compact: CompactGraph, index: FileIndex, marks: Iterable[bytearray]) -> array:
+    """
+    Get the source bytes of the marked modules of a compact graph.
+
+    Only the modules marked in some of the marks are stat'ed.
+
+    Args:
+        compact: Compact module graph
+        index: File index of the root (memoized stat)
+        marks: Results of CompactGraph.mark
+
+    Returns:
+        array of sizes by node ID (0 for unmarked or unreadable modules)
+    """
+    sizes = array('q', [0]) * len(compact.nodes)
+    loaded = bytearray(len(compact.nodes))
+    for marked in marks:
+        loaded = bytearray(a | b for a, b in zip(loaded, marked))
+    for node_id in compress(range(len(loaded)), loaded):
+        stat = index.stat(Path(compact.nodes[node_id]))
+        if stat is not None:
+            sizes[node_id] = stat.st_size
+    return sizes
+
+
+def find_route_pages(scan: ProjectScan, router_file: str = DEFAULT_ROUTER) -> List[str]:
+    """
+    Find the modules a router file imports lazily.
+
+    Args:
+        scan: Shared scan of the project
+        router_file: Router module relative to the root
+
+    Returns:
+        Absolute paths of the resolved `import()` targets, in file order
+
+    Raises:
+        ValueError: If the router file cannot be read
+    """
+    router_path = scan.root / router_file
+    try:
+        with open(router_path, 'r', encoding='utf-8') as f:
+            references = scan_module_references(f.read())
+    except (OSError, UnicodeDecodeError) as e:
+        raise ValueError(f"cannot read router '{router_path}': {e}") from e
+
+    pages = {}
+    for reference in references:
+        if reference.kind == 'dynamic':
+            resolved = scan.resolver.resolve(router_path, reference.specifier)
+            if resolved is not None:
+                pages[str(resolved)] = None
+    return list(pages)
+
+
+def find_route_weights(root_dir: Path, router_file: str = DEFAULT_ROUTER, entry_file: str = DEFAULT_ENTRY,
+                       top: int = 20, scan: Optional[ProjectScan] = None, use_cache: bool = True,
+                       jobs: int = 1) -> ChunkReport:
+    """
+    Compute the module closure and source bytes of every lazily loaded route.
+
+    Args:
+        root_dir: Root directory
+        router_file: Router module relative to root_dir
+        entry_file: Application entry relative to root_dir
+        top: Maximum number of shared modules reported
+        scan: Shared scan of root_dir (built if not given)
+        use_cache: Reuse and update the on-disk parse cache
+        jobs: Maximum number of worker processes for parsing
+
+    Returns:
+        ChunkReport
+
+    Raises:
+        ValueError: If the router file cannot be read
+    """
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    root_dir = scan.root
+    index = scan.index
+    pages = find_route_pages(scan, router_file)
+
+    # Type-only and dynamic imports are left out: the runtime extractor has its
+    # own cache namespace, shared with the barrel fan-out and component analyses
+    with open_parse_cache(root_dir, extract_runtime_imports, index.rel_files(), use_cache) as cache:
+        graph = build_module_graph(root_dir, index, scan.barrels, cache, jobs, scan.resolver,
+                                   extract=extract_runtime_imports)
+
+    with STATS.phase('weights'):
+        compact = graph.compact()
+        adjacencies = [compact.forward[USED], compact.forward[STYLES]]
+        entry = compact.mark(compact.ids_of([str(root_dir / entry_file)]), adjacencies)
+        closures = [compact.mark(compact.ids_of([page]), adjacencies) for page in pages]
+
+        sizes = module_sizes(compact, index, [entry, *closures])
+
+        outside_entry = bytearray(1 - marked for marked in entry)
+        routes = []
+        reached = array('i', [0]) * len(compact.nodes)
+        for page, closure in zip(pages, closures):
+            own = bytearray(a & b for a, b in zip(closure, outside_entry))
+            for node_id in compress(range(len(own)), own):
+                reached[node_id] += 1
+            routes.append(RouteWeight(
+                os.path.relpath(page, root_dir), sum(closure),
+                sum(compress(sizes, closure)), sum(compress(sizes, own)),
+            ))
+        routes.sort(key=lambda route: (-route.own_bytes, route.page))
+
+        shared = [
+            SharedModule(os.path.relpath(compact.nodes[node_id], root_dir), sizes[node_id], count)
+            for node_id, count in enumerate(reached) if count > 1
+        ]
+        shared.sort(key=lambda module: (-module.size, module.path))
+        report = ChunkReport(sum(entry), sum(compress(sizes, entry)), routes, shared[:top])
+
+    STATS.collect(scan, cache)
+    return report
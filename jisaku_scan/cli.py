@@ -0,0 +1,961 @@
+"""
+Command Line Interface
+
+Entry points of the scanners.
+
+`python3 -m jisaku_scan check` runs the unused and untested analyses in one
+process on one shared scan of the tree and reports them together.
+find-unused-files.py and find-untested-files.py are thin wrappers around
+unused_main and untested_main.
+
+`python3 -m jisaku_scan check --shard I/N` parses one slice of the tree
+and writes a partial graph; `python3 -m jisaku_scan merge` combines the
+partial graphs of all shards and reports like `check` (see
+jisaku_scan.shard).
+
+`python3 -m jisaku_scan exports` lists exported symbols that nothing
+imports (see jisaku_scan.exports).
+
+`python3 -m jisaku_scan affected-tests` lists the test files that import
+changed files, directly or transitively (see jisaku_scan.impact).
+
+`python3 -m jisaku_scan chunks` reports the module closure and source
+bytes of each lazily loaded route (see jisaku_scan.chunks).
+
+`python3 -m jisaku_scan barrels` ranks barrels by the modules their
+consumers load without using them (see jisaku_scan.fanout).
+
+`python3 -m jisaku_scan assets` lists the files in public/ that nothing
+references, with their sizes (see jisaku_scan.assets).
+
+`python3 -m jisaku_scan components` joins the component tags of every
+template with the imports: components imported but never rendered, and
+components of shared barrels rendered in one place (see
+jisaku_scan.components).
+
+`python3 -m jisaku_scan bench` times the scanners on synthetic trees and
+`python3 -m jisaku_scan synth` writes such a tree.
+
+`python3 -m jisaku_scan watch` keeps the scan resident and answers
+`python3 -m jisaku_scan query` from memory (see jisaku_scan.daemon).
+
+Exit codes (all entry points): 0 if nothing was found, 1 if files were
+reported, a benchmark phase regressed or the arguments are invalid.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Only what check and merge run is imported here: every other command imports
+# its modules in its handler, so a check does not load the watch daemon, the
+# benchmark or the other analyses
+from jisaku_scan.coverage import DEFAULT_LCOV, DEFAULT_THRESHOLD, FileCoverage, load_coverage, read_lines_threshold
+from jisaku_scan.graph import DependencyGraph
+from jisaku_scan.incremental import git_changed_files
+from jisaku_scan.parallel import default_jobs
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.shard import merge_partials, parse_shard
+from jisaku_scan.stats import STATS
+from jisaku_scan.untested import find_test_gaps
+from jisaku_scan.unused import extract_imports, extract_imports_regex, find_unused_files, write_shard
+
+
+def add_root_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the positional root directory argument."""
+    parser.add_argument('root_directory', nargs='?', default='.',
+                        help="The directory to search (default: current directory '.')")
+
+
+def add_stats_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the instrumentation options."""
+    parser.add_argument('--timings', action='store_true',
+                        help='Print per-phase wall time and hot-path counters after the report')
+    parser.add_argument('--stats-json', metavar='FILE',
+                        help="Write phase timings and counters as JSON to FILE ('-' for stdout)")
+
+
+def enable_stats(args: argparse.Namespace) -> None:
+    """Turn on statistics collection if --timings or --stats-json was given."""
+    STATS.enabled = bool(args.timings or args.stats_json)
+
+
+def report_stats(args: argparse.Namespace) -> None:
+    """Print and/or write the collected statistics."""
+    if args.timings:
+        print()
+        print(STATS.format_table())
+    if args.stats_json:
+        STATS.write_json(args.stats_json)
+
+
+def add_fail_fast_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the option stopping an analysis at its first finding."""
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='Stop at the first finding and report only it (for git hooks)')
+
+
+def add_coverage_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the coverage options of the untested files analysis."""
+    parser.add_argument('--coverage', nargs='?', const=DEFAULT_LCOV, metavar='LCOV',
+                        help='Also report tested files whose line coverage in this lcov report is below the '
+                             f'threshold (default report: {DEFAULT_LCOV}, from pnpm test:coverage)')
+    parser.add_argument('--coverage-threshold', type=float, metavar='PERCENT',
+                        help='Per-file line coverage threshold (default: coverage.thresholds.lines of '
+                             f'vitest.config.ts, else {DEFAULT_THRESHOLD:g})')
+
+
+def load_coverage_option(args: argparse.Namespace,
+                         root_dir: Path) -> Tuple[Optional[Dict[str, FileCoverage]], float]:
+    """
+    Load the coverage report given with --coverage.
+
+    Args:
+        args: Parsed options (see add_coverage_arguments)
+        root_dir: Absolute root directory
+
+    Returns:
+        Tuple of (per-file coverage or None without --coverage, threshold in percent)
+    """
+    threshold = args.coverage_threshold
+    if threshold is None:
+        threshold = read_lines_threshold(root_dir)
+    if not args.coverage:
+        return None, threshold
+    with STATS.phase('coverage'):
+        try:
+            return load_coverage(Path(args.coverage), root_dir), threshold
+        except ValueError as e:
+            print(f"Error: {e}")
+            print("Generate it with: pnpm test:coverage")
+            sys.exit(1)
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the parse cache and worker options of the analyses parsing the tree."""
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse every file, without reading or updating the on-disk parse cache')
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for parsing (default: CPU count; small trees run serially)')
+
+
+def add_unused_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the unused files analysis."""
+    add_cache_arguments(parser)
+    parser.add_argument('--changed', metavar='GIT_REF',
+                        help='Only re-evaluate and report files affected by changes since GIT_REF')
+    parser.add_argument('--graph', metavar='FILE',
+                        help='Write the module graph to FILE (Graphviz DOT if it ends in .dot, else JSON)')
+    parser.add_argument('--legacy-regex', action='store_true',
+                        help='Extract imports with the original regexes instead of the tokenizer')
+
+
+def run_unused(root_dir: Path, args: argparse.Namespace, scan: Optional[ProjectScan] = None,
+               graph: Optional[DependencyGraph] = None) -> bool:
+    """
+    Run the unused files analysis and print its report.
+
+    Args:
+        root_dir: Absolute root directory
+        args: Parsed options (see add_unused_arguments)
+        scan: Shared scan of root_dir (built if not given)
+        graph: Module graph merged from shards (built if not given)
+
+    Returns:
+        True if unused files were found
+    """
+    if args.changed:
+        print(f"Searching for unused files in: {root_dir} (changed since {args.changed})")
+    else:
+        print(f"Searching for unused files in: {root_dir}")
+    print("-" * 60)
+
+    try:
+        unused_files = find_unused_files(root_dir, use_cache=not args.no_cache, changed_ref=args.changed,
+                                         jobs=max(1, args.jobs),
+                                         extract=extract_imports_regex if args.legacy_regex else extract_imports,
+                                         graph_out=Path(args.graph) if args.graph else None,
+                                         scan=scan, fail_fast=args.fail_fast, graph=graph)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if unused_files and args.fail_fast:
+        print("Found a potentially unused file (stopped at the first, --fail-fast):")
+        print(f"  {unused_files[0].relative_to(root_dir)}")
+        return True
+
+    if unused_files:
+        print(f"Found {len(unused_files)} potentially unused files:")
+        print()
+        for file_path in unused_files:
+            rel_path = file_path.relative_to(root_dir)
+            print(f"  {rel_path}")
+        print()
+        print("Note: This script may have false positives. Some files may be used")
+        print("dynamically, through string concatenation, or in ways not detected.")
+        print("Review each file carefully before deleting.")
+        return True
+
+    print("✅ All source files appear to be used!")
+    return False
+
+
+def run_untested(root_dir: str, scan: Optional[ProjectScan] = None, fail_fast: bool = False,
+                 coverage: Optional[Dict[str, FileCoverage]] = None,
+                 threshold: float = DEFAULT_THRESHOLD) -> bool:
+    """
+    Run the untested files analysis and print its report.
+
+    Args:
+        root_dir: Root directory (as given on the command line)
+        scan: Shared scan of root_dir (built if not given)
+        fail_fast: Stop at the first file without tests
+        coverage: Per-file coverage; tested files below the threshold are
+            reported too if given
+        threshold: Line coverage in percent below which a file is reported
+
+    Returns:
+        True if files without tests (or with too little coverage) were found
+    """
+    print(f"Searching for untested files in: {os.path.abspath(root_dir)}")
+    print("-" * 60)
+
+    if scan is None:
+        scan = ProjectScan(Path(root_dir))
+    with STATS.phase('untested'):
+        gaps = find_test_gaps(root_dir, scan.index, scan.barrels, fail_fast, coverage, threshold)
+    STATS.collect(scan)
+    untested_files = [gap.path for gap in gaps if gap.coverage is None]
+    low_coverage = [gap for gap in gaps if gap.coverage is not None]
+
+    if gaps and fail_fast:
+        if untested_files:
+            print("Found a file without a colocated test file (stopped at the first, --fail-fast):")
+            print(f"  {untested_files[0]}")
+        else:
+            print(f"Found a file below {threshold:g}% line coverage (stopped at the first, --fail-fast):")
+            print(f"  {low_coverage[0].path} ({low_coverage[0].coverage:.1f}%)")
+        return True
+
+    if untested_files:
+        print(f"Found {len(untested_files)} files without colocated test files:")
+        print()
+        for file_path in untested_files:
+            print(f"  {file_path}")
+        print()
+        print("Consider adding .test.ts files for these source files.")
+    if low_coverage:
+        if untested_files:
+            print()
+        print(f"Found {len(low_coverage)} tested files below {threshold:g}% line coverage:")
+        print()
+        for gap in low_coverage:
+            print(f"  {gap.path} ({gap.coverage:.1f}%)")
+        print()
+        print("Consider extending the tests of these files.")
+    if gaps:
+        return True
+
+    if coverage is not None:
+        print(f"✅ All source files have colocated test files with at least {threshold:g}% line coverage!")
+    else:
+        print("✅ All source files have colocated test files!")
+    return False
+
+
+def unused_main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of find-unused-files.py."""
+    parser = argparse.ArgumentParser(description='Find source files that are not reachable from any entry point.')
+    add_root_argument(parser)
+    add_unused_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_stats_arguments(parser)
+    args = parser.parse_args(argv)
+    root_dir = Path(args.root_directory).resolve()
+
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+
+    enable_stats(args)
+    found = run_unused(root_dir, args)
+    report_stats(args)
+    # Exit with error code to indicate unused files found
+    sys.exit(1 if found else 0)
+
+
+def untested_main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of find-untested-files.py."""
+    parser = argparse.ArgumentParser(description='Find source files without a colocated .test.ts file.')
+    add_root_argument(parser)
+    add_coverage_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_stats_arguments(parser)
+    args = parser.parse_args(argv)
+    root_dir = args.root_directory
+
+    if not os.path.isdir(root_dir):
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+
+    enable_stats(args)
+    coverage, threshold = load_coverage_option(args, Path(root_dir).resolve())
+    found = run_untested(root_dir, fail_fast=args.fail_fast, coverage=coverage, threshold=threshold)
+    report_stats(args)
+    # Exit with error code to indicate missing tests
+    sys.exit(1 if found else 0)
+
+
+def run_shard(root_dir: Path, args: argparse.Namespace, scan: ProjectScan) -> None:
+    """
+    Parse one shard of the tree and write its partial graph.
+
+    Args:
+        root_dir: Absolute root directory
+        args: Parsed options of the check command (with --shard)
+        scan: Shared scan of root_dir
+    """
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if args.changed or args.graph:
+        print("Error: --shard cannot be combined with --changed or --graph (pass --graph to merge)")
+        sys.exit(1)
+
+    if not args.shard_out:
+        print("Error: --shard needs --shard-out FILE, outside the scanned tree")
+        sys.exit(1)
+    out_path = Path(args.shard_out).resolve()
+    if root_dir in out_path.parents:
+        # The merge compares file trees: a partial inside the checkout changes it
+        print(f"Error: --shard-out must be outside the scanned tree: {args.shard_out}")
+        sys.exit(1)
+    print(f"Scanning shard {shard[0]}/{shard[1]} of: {root_dir}")
+    print("-" * 60)
+    count = write_shard(root_dir, shard, out_path, use_cache=not args.no_cache, jobs=max(1, args.jobs),
+                        extract=extract_imports_regex if args.legacy_regex else extract_imports, scan=scan)
+    print(f"Wrote the imports of {count} files to {out_path}")
+    print("Combine the partial graphs of all shards with: python3 -m jisaku_scan merge")
+
+
+def check(args: argparse.Namespace) -> bool:
+    """
+    Run the selected analyses on one shared scan.
+
+    Also runs `merge`, with the module graph combined from partial graphs,
+    and `check --shard`, which only writes a partial graph.
+
+    Args:
+        args: Parsed options of the check or merge command
+
+    Returns:
+        True if any analysis reported files
+    """
+    root_dir = Path(args.root_directory).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+
+    # Neither flag means both analyses
+    run_all = not (args.unused or args.untested)
+    enable_stats(args)
+    scan = ProjectScan(root_dir)
+    if args.command == 'check' and args.shard:
+        run_shard(root_dir, args, scan)
+        report_stats(args)
+        return False
+
+    graph = None
+    if args.command == 'merge':
+        try:
+            with STATS.phase('merge'):
+                graph = merge_partials([Path(path) for path in args.partials], scan.root, scan.index)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    found = False
+    if args.unused or run_all:
+        found |= run_unused(root_dir, args, scan, graph)
+    if (args.untested or run_all) and not (found and args.fail_fast):
+        if args.unused or run_all:
+            print()
+        coverage, threshold = load_coverage_option(args, root_dir)
+        found |= run_untested(str(root_dir), scan, args.fail_fast, coverage, threshold)
+    report_stats(args)
+    return found
+
+
+def run_exports(args: argparse.Namespace) -> bool:
+    """
+    Run the unused exports analysis and print its report.
+
+    Args:
+        args: Parsed options of the exports command
+
+    Returns:
+        True if unused exports were found
+    """
+    from jisaku_scan.exports import find_unused_exports
+
+    root_dir = Path(args.root_directory).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+
+    enable_stats(args)
+    print(f"Searching for unused exports in: {root_dir}")
+    print("-" * 60)
+    try:
+        unused_exports = find_unused_exports(root_dir, use_cache=not args.no_cache, jobs=max(1, args.jobs))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if unused_exports:
+        by_file: Dict[Path, List[str]] = {}
+        for file_path, name in unused_exports:
+            by_file.setdefault(file_path, []).append(name)
+        print(f"Found {len(unused_exports)} exports that nothing imports, in {len(by_file)} files:")
+        print()
+        for file_path, names in by_file.items():
+            print(f"  {file_path.relative_to(root_dir)}")
+            print(f"    {', '.join(names)}")
+        print()
+        print("Note: exports used only through string-built paths, globals or tooling")
+        print("conventions are not detected. Review each export before removing it.")
+        found = True
+    else:
+        print("✅ Every export is imported somewhere!")
+        found = False
+    report_stats(args)
+    return found
+
+
+def run_affected_tests(args: argparse.Namespace) -> None:
+    """
+    Print the test files affected by the given or changed files, one per line.
+
+    The output is meant for the test runner (pnpm test $(...)); nothing is
+    printed when no test is affected.
+
+    Args:
+        args: Parsed options of the affected-tests command
+    """
+    from jisaku_scan.impact import find_affected_tests
+
+    root_dir = Path(args.root).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory", file=sys.stderr)
+        sys.exit(1)
+
+    enable_stats(args)
+    scan = ProjectScan(root_dir)
+    changed = set()
+    for path in args.paths:
+        rel = scan.index.relative(Path(os.path.abspath(path)))
+        if rel is None:
+            print(f"Error: '{path}' is outside '{root_dir}'", file=sys.stderr)
+            sys.exit(1)
+        changed.add(rel)
+    try:
+        if args.changed:
+            with STATS.phase('git'):
+                changed.update(git_changed_files(root_dir, args.changed))
+        tests = find_affected_tests(root_dir, changed, scan, use_cache=not args.no_cache, jobs=max(1, args.jobs))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for rel_file in tests:
+        print(rel_file)
+    report_stats(args)
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for the reports (B below 1 KiB, else KiB or MiB with one decimal)."""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def run_chunks(args: argparse.Namespace) -> None:
+    """
+    Compute the weight of each lazily loaded route and print the report.
+
+    Args:
+        args: Parsed options of the chunks command
+    """
+    from jisaku_scan.chunks import DEFAULT_ENTRY, DEFAULT_ROUTER, find_route_weights
+
+    root_dir = Path(args.root_directory).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+    router = args.router or DEFAULT_ROUTER
+    entry = args.entry or DEFAULT_ENTRY
+
+    enable_stats(args)
+    print(f"Computing route chunk weights in: {root_dir}")
+    print("-" * 60)
+    try:
+        report = find_route_weights(root_dir, router, entry, max(0, args.top),
+                                    use_cache=not args.no_cache, jobs=max(1, args.jobs))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Entry chunk ({entry}): {report.entry_modules} modules, {format_size(report.entry_bytes)}")
+    print()
+    if not report.routes:
+        print(f"No lazily imported routes found in {router}")
+    else:
+        width = max(len(route.page) for route in report.routes)
+        print(f"{len(report.routes)} lazily loaded routes (own = outside the entry chunk):")
+        print()
+        for route in report.routes:
+            print(f"  {route.page:<{width}}  {route.modules:>5} modules  "
+                  f"{format_size(route.total_bytes):>10}  own {format_size(route.own_bytes):>10}")
+    if report.shared:
+        width = max(len(module.path) for module in report.shared)
+        print()
+        print(f"Heaviest modules shared by several routes (top {len(report.shared)}):")
+        print()
+        for module in report.shared:
+            print(f"  {module.path:<{width}}  {format_size(module.size):>10}  {module.routes:>3} routes")
+    print()
+    print("Note: sizes are source bytes of project files before minification;")
+    print("packages from node_modules are not included.")
+    report_stats(args)
+
+
+def run_barrels(args: argparse.Namespace) -> None:
+    """
+    Compute the fan-out cost of each barrel and print the report.
+
+    Args:
+        args: Parsed options of the barrels command
+    """
+    from jisaku_scan.fanout import DEFAULT_FRACTION, find_barrel_costs
+
+    root_dir = Path(args.root_directory).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+    fraction = DEFAULT_FRACTION if args.fraction is None else args.fraction
+    if not 0 < fraction <= 1:
+        print(f"Error: --fraction must be in (0, 1], got {fraction}")
+        sys.exit(1)
+
+    enable_stats(args)
+    print(f"Computing barrel fan-out in: {root_dir}")
+    print("-" * 60)
+    costs = find_barrel_costs(root_dir, fraction, use_cache=not args.no_cache, jobs=max(1, args.jobs))
+    if not costs:
+        print("No imported barrels found")
+    else:
+        print(f"{len(costs)} imported barrels, by load wasted on consumers "
+              f"(partial = using less than {fraction:.0%} of the fan-out):")
+        for cost in costs:
+            print()
+            print(f"  {cost.path}")
+            print(f"    fan-out {cost.modules} modules, {format_size(cost.size)}; "
+                  f"{cost.importers} importers, {cost.partial} partial; wasted {format_size(cost.wasted)}")
+            for consumer in cost.consumers[:max(0, args.top)]:
+                if not consumer.wasted:
+                    break
+                print(f"    - {consumer.path}: needs {format_size(consumer.needed)}, "
+                      f"wastes {format_size(consumer.wasted)} ({', '.join(consumer.names)})")
+        print()
+        print("Note: consumers reaching the same modules through other imports waste less")
+        print("than shown; import the listed names directly from their modules to save the rest.")
+    report_stats(args)
+
+
+def run_components(args: argparse.Namespace) -> bool:
+    """
+    Build the component usage index and print the report.
+
+    Args:
+        args: Parsed options of the components command
+
+    Returns:
+        True if components are imported but never rendered (single-use
+        components are informational)
+    """
+    from jisaku_scan.components import find_component_usage
+
+    root_dir = Path(args.root_directory).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+
+    enable_stats(args)
+    print(f"Indexing component usage in: {root_dir}")
+    print("-" * 60)
+    try:
+        report = find_component_usage(root_dir, use_cache=not args.no_cache, jobs=max(1, args.jobs))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"{report.components} imported components, {report.templates} templates scanned")
+    print()
+    if report.unrendered:
+        print(f"{len(report.unrendered)} components imported but never rendered:")
+        print()
+        for component in report.unrendered:
+            print(f"  {component.path}")
+            print(f"    imported by {', '.join(component.importers)}")
+    else:
+        print("✅ Every imported component is rendered somewhere!")
+    if report.single_use:
+        print()
+        print(f"{len(report.single_use)} components rendered in one place through a shared barrel:")
+        print()
+        for component in report.single_use:
+            barrels = ', '.join(f"{barrel} ({importers} importers)" for barrel, importers in component.barrels)
+            print(f"  {component.path} ({format_size(component.size)})")
+            print(f"    rendered by {component.consumer}; re-exported by {barrels}")
+        print()
+        print("Note: importing these directly from their file (or moving them next to")
+        print("their consumer) keeps them out of what other barrel consumers load.")
+    report_stats(args)
+    return bool(report.unrendered)
+
+
+def run_assets(args: argparse.Namespace) -> bool:
+    """
+    Run the unused assets analysis and print its report.
+
+    Args:
+        args: Parsed options of the assets command
+
+    Returns:
+        True if unused assets were found
+    """
+    from jisaku_scan.assets import PUBLIC_DIR, find_unused_assets
+
+    root_dir = Path(args.root_directory).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+    public_dir = args.public or PUBLIC_DIR
+
+    enable_stats(args)
+    print(f"Searching for unused assets in: {root_dir / public_dir}")
+    print("-" * 60)
+    try:
+        unused_assets = find_unused_assets(root_dir, jobs=max(1, args.jobs), public_dir=public_dir)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if unused_assets:
+        total = sum(asset.size for asset in unused_assets)
+        width = max(len(asset.path) for asset in unused_assets)
+        print(f"Found {len(unused_assets)} assets that nothing references ({format_size(total)}):")
+        print()
+        for asset in unused_assets:
+            print(f"  {asset.path:<{width}}  {format_size(asset.size):>10}")
+        print()
+        print("Note: assets located through paths built at runtime are not detected.")
+        print("Review each asset before deleting it.")
+        found = True
+    else:
+        print("✅ Every asset is referenced somewhere!")
+        found = False
+    report_stats(args)
+    return found
+
+
+def run_bench(args: argparse.Namespace) -> bool:
+    """
+    Run the benchmark for the selected sizes, compare and save baselines.
+
+    Args:
+        args: Parsed options of the bench command
+
+    Returns:
+        True if a phase regressed against the baseline
+    """
+    from jisaku_scan import bench
+    from jisaku_scan.synthetic import SIZES
+
+    for size in args.size or []:
+        if size not in SIZES:
+            print(f"Error: unknown size '{size}' (choose from {', '.join(SIZES)})")
+            sys.exit(1)
+    baseline = {}
+    if args.baseline:
+        try:
+            baseline = bench.load_baseline(Path(args.baseline))
+        except ValueError as e:
+            print(f"Error: invalid baseline '{args.baseline}': {e}")
+            sys.exit(1)
+
+    results = []
+    regressed = False
+    for size in args.size or ['1k']:
+        try:
+            result = bench.run_benchmark(size, SIZES[size], repeat=args.repeat, jobs=max(1, args.jobs),
+                                         bench_dir=Path(args.dir) if args.dir else None)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        results.append(result)
+        print(bench.format_result(result, baseline.get(size)))
+        if size in baseline:
+            problems = bench.compare(result, baseline[size], args.tolerance)
+            for problem in problems:
+                print(f"  REGRESSION {problem}")
+            regressed |= bool(problems)
+        print()
+
+    if args.save_baseline:
+        bench.save_baseline(Path(args.save_baseline), results)
+        print(f"Baseline saved to {args.save_baseline}")
+    return regressed
+
+
+def run_watch(args: argparse.Namespace) -> None:
+    """
+    Start the watch daemon and serve queries until stopped.
+
+    Args:
+        args: Parsed options of the watch command
+    """
+    from jisaku_scan.daemon import ResidentScan, default_socket_path, serve
+    from jisaku_scan.watcher import DEFAULT_POLL_INTERVAL, make_watcher
+
+    root_dir = Path(args.root_directory).resolve()
+    if not root_dir.is_dir():
+        print(f"Error: '{root_dir}' is not a valid directory")
+        sys.exit(1)
+    socket_path = Path(args.socket) if args.socket else default_socket_path(root_dir)
+    extract = extract_imports_regex if args.legacy_regex else extract_imports
+    poll = args.poll
+    if poll is not None and poll <= 0:
+        # --poll without an interval (a zero interval would spin)
+        poll = DEFAULT_POLL_INTERVAL
+
+    state = ResidentScan(root_dir, jobs=max(1, args.jobs), extract=extract)
+    watcher = make_watcher(root_dir, state.scan.index, poll)
+    print(f"Watching {root_dir} ({watcher.kind}, {len(state.graph.edges)} modules, "
+          f"built in {state.updated * 1000:.0f} ms)")
+    print(f"Listening on {socket_path}")
+    try:
+        serve(state, watcher, socket_path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    print("Watch daemon stopped")
+
+
+def run_query(args: argparse.Namespace) -> bool:
+    """
+    Send a query to the watch daemon and print the answer.
+
+    Args:
+        args: Parsed options of the query command
+
+    Returns:
+        True if any queried file is unused/untested (or the full list is not empty)
+    """
+    from jisaku_scan.daemon import default_socket_path, send_query
+
+    root_dir = Path(args.root).resolve()
+    socket_path = Path(args.socket) if args.socket else default_socket_path(root_dir)
+    request = {'query': args.query, 'paths': [os.path.abspath(path) for path in args.paths]}
+    try:
+        response = send_query(socket_path, request)
+    except OSError as e:
+        print(f"Error: no watch daemon answering on '{socket_path}' ({e})")
+        print("Start one with: python3 -m jisaku_scan watch")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: invalid response from the watch daemon: {e}")
+        sys.exit(1)
+    if 'error' in response:
+        print(f"Error: {response['error']}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(response, indent=2))
+    if args.query in ('status', 'stop'):
+        if not args.json:
+            for key, value in response.items():
+                print(f"{key}: {value}")
+        return False
+    if 'files' in response:
+        found = [entry for entry in response['files'] if entry[args.query]]
+        if not args.json:
+            for entry in response['files']:
+                state = args.query if entry[args.query] else ('missing' if not entry['exists'] else 'ok')
+                print(f"{state:<9} {entry['path']}")
+        return bool(found)
+    if not args.json:
+        for path in response[args.query]:
+            print(f"  {path}")
+    return bool(response[args.query])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of `python3 -m jisaku_scan`."""
+    parser = argparse.ArgumentParser(prog='python3 -m jisaku_scan',
+                                     description='Repository maintenance scans for the Jisaku project.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = commands.add_parser('check', help='Find unused and untested files in one pass')
+    add_root_argument(check_parser)
+    check_parser.add_argument('--unused', action='store_true',
+                              help='Find files not reachable from any entry point')
+    check_parser.add_argument('--untested', action='store_true',
+                              help='Find source files without a colocated .test.ts file')
+    add_unused_arguments(check_parser)
+    add_coverage_arguments(check_parser)
+    add_fail_fast_argument(check_parser)
+    check_parser.add_argument('--shard', metavar='I/N',
+                              help='Only parse shard I of N and write its partial graph (see merge)')
+    check_parser.add_argument('--shard-out', metavar='FILE',
+                              help='Partial graph file of --shard, outside the scanned tree (required with --shard)')
+    add_stats_arguments(check_parser)
+
+    merge_parser = commands.add_parser('merge', help='Combine the partial graphs of check --shard and report')
+    merge_parser.add_argument('partials', nargs='+', metavar='PARTIAL', help='Partial graph of every shard')
+    merge_parser.add_argument('--root', dest='root_directory', default='.',
+                              help="Root directory the shards scanned (default: '.')")
+    merge_parser.add_argument('--unused', action='store_true',
+                              help='Find files not reachable from any entry point')
+    merge_parser.add_argument('--untested', action='store_true',
+                              help='Find source files without a colocated .test.ts file')
+    merge_parser.add_argument('--graph', metavar='FILE',
+                              help='Write the module graph to FILE (Graphviz DOT if it ends in .dot, else JSON)')
+    add_coverage_arguments(merge_parser)
+    add_fail_fast_argument(merge_parser)
+    add_stats_arguments(merge_parser)
+    # Nothing is parsed at the merge
+    merge_parser.set_defaults(no_cache=True, changed=None, jobs=1, legacy_regex=False)
+
+    exports_parser = commands.add_parser('exports', help='Find exported symbols that nothing imports')
+    add_root_argument(exports_parser)
+    add_cache_arguments(exports_parser)
+    add_stats_arguments(exports_parser)
+
+    impact_parser = commands.add_parser('affected-tests',
+                                        help='List the test files that import changed files, transitively')
+    impact_parser.add_argument('paths', nargs='*', help='Changed files (relative to the current directory)')
+    impact_parser.add_argument('--changed', metavar='GIT_REF',
+                               help='Also take the files changed since GIT_REF (and untracked files)')
+    impact_parser.add_argument('--root', default='.', help="Root directory of the project (default: '.')")
+    add_cache_arguments(impact_parser)
+    add_stats_arguments(impact_parser)
+
+    chunks_parser = commands.add_parser('chunks', help='Report the modules and source bytes each route loads')
+    add_root_argument(chunks_parser)
+    chunks_parser.add_argument('--router',
+                               help='Router module with the lazy route imports (default: src/router/index.ts)')
+    chunks_parser.add_argument('--entry', help='Application entry, loaded with every route (default: src/main.ts)')
+    chunks_parser.add_argument('--top', type=int, default=20,
+                               help='Number of shared modules to list (default: 20)')
+    add_cache_arguments(chunks_parser)
+    add_stats_arguments(chunks_parser)
+
+    barrels_parser = commands.add_parser('barrels', help='Rank barrels by the load wasted on their consumers')
+    add_root_argument(barrels_parser)
+    barrels_parser.add_argument('--fraction', type=float,
+                                help='Share of a fan-out below which a consumer counts as partial (default: 0.25)')
+    barrels_parser.add_argument('--top', type=int, default=5,
+                                help='Consumers to list per barrel, most wasteful first (default: 5)')
+    add_cache_arguments(barrels_parser)
+    add_stats_arguments(barrels_parser)
+
+    components_parser = commands.add_parser('components',
+                                            help='Find components imported but never rendered in a template')
+    add_root_argument(components_parser)
+    add_cache_arguments(components_parser)
+    add_stats_arguments(components_parser)
+
+    assets_parser = commands.add_parser('assets', help='Find files in public/ that nothing references')
+    add_root_argument(assets_parser)
+    assets_parser.add_argument('--public', help='Directory served as is, relative to the root (default: public)')
+    assets_parser.add_argument('-j', '--jobs', type=int, default=default_jobs(),
+                               help='Worker processes for reading (default: CPU count; small trees run serially)')
+    add_stats_arguments(assets_parser)
+
+    bench_parser = commands.add_parser('bench', help='Time each scanner phase on synthetic trees')
+    bench_parser.add_argument('--size', action='append',
+                              help='Tree size (1k, 10k or 100k); repeat for several (default: 1k)')
+    bench_parser.add_argument('--repeat', type=int, default=5, help='Timed runs per size (default: 5)')
+    bench_parser.add_argument('-j', '--jobs', type=int, default=1,
+                              help='Worker processes for the parse phase (default: 1)')
+    bench_parser.add_argument('--dir', metavar='DIR',
+                              help='Keep the generated trees in DIR, outside the repository '
+                                   '(default: a temporary directory)')
+    bench_parser.add_argument('--baseline', metavar='FILE', help='Compare against this JSON baseline')
+    bench_parser.add_argument('--save-baseline', metavar='FILE', help='Write the results to this JSON baseline')
+    bench_parser.add_argument('--tolerance', type=float, default=0.1,
+                              help='Allowed slowdown of a phase median before it counts as a regression (default: 0.1)')
+
+    synth_parser = commands.add_parser('synth', help='Generate a synthetic tree shaped like this repository')
+    synth_parser.add_argument('out_dir', help='Directory to write the tree into')
+    synth_parser.add_argument('--files', type=int, default=1000, help='Number of files (default: 1000)')
+    synth_parser.add_argument('--seed', type=int, default=0, help='Seed of the generator (default: 0)')
+
+    watch_parser = commands.add_parser('watch', help='Keep the scan in memory and answer queries over a socket')
+    add_root_argument(watch_parser)
+    watch_parser.add_argument('--socket', metavar='PATH',
+                              help='Unix socket to listen on (default: one per root in the cache directory)')
+    watch_parser.add_argument('--poll', type=float, nargs='?', const=0.0, metavar='SECONDS',
+                              help='Poll the tree instead of using inotify (default interval: 1s)')
+    watch_parser.add_argument('-j', '--jobs', type=int, default=default_jobs(),
+                              help='Worker processes for the initial parse (default: CPU count)')
+    watch_parser.add_argument('--legacy-regex', action='store_true',
+                              help='Extract imports with the original regexes instead of the tokenizer')
+
+    query_parser = commands.add_parser('query', help='Ask the watch daemon about files')
+    query_parser.add_argument('query', choices=['unused', 'untested', 'status', 'stop'],
+                              help='What to ask; unused/untested without paths list every such file')
+    query_parser.add_argument('paths', nargs='*', help='Files to ask about')
+    query_parser.add_argument('--root', default='.', help="Root the daemon watches (default: '.')")
+    query_parser.add_argument('--socket', metavar='PATH', help='Socket of the daemon (default: derived from --root)')
+    query_parser.add_argument('--json', action='store_true', help='Print the raw JSON answer')
+
+    args = parser.parse_args(argv)
+    if args.command in ('check', 'merge'):
+        sys.exit(1 if check(args) else 0)
+    elif args.command == 'exports':
+        sys.exit(1 if run_exports(args) else 0)
+    elif args.command == 'affected-tests':
+        run_affected_tests(args)
+    elif args.command == 'chunks':
+        run_chunks(args)
+    elif args.command == 'barrels':
+        run_barrels(args)
+    elif args.command == 'components':
+        sys.exit(1 if run_components(args) else 0)
+    elif args.command == 'assets':
+        sys.exit(1 if run_assets(args) else 0)
+    elif args.command == 'bench':
+        sys.exit(1 if run_bench(args) else 0)
+    elif args.command == 'synth':
+        from jisaku_scan.synthetic import generate_repo
+        try:
+            count = generate_repo(Path(args.out_dir), args.files, args.seed)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Generated {count} files in {args.out_dir}")
+    elif args.command == 'watch':
+        run_watch(args)
+    elif args.command == 'query':
+        sys.exit(1 if run_query(args) else 0)
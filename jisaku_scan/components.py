@@ -0,0 +1,229 @@
+"""
+Component Usage
+
+Joins the component tags of every SFC template with the import graph. A
+component can be imported (often through a barrel) yet never appear in a
+`<template>`, which the unused files analysis cannot tell apart from a
+rendered one.
+
+Imports are read with extract_runtime_imports, sharing the parse cache
+namespace of the route chunk weights and barrel fan-out analyses (apart
+from the entries of the unused files analysis), so type-only
+imports (`import type { EntityOption } from '@/shared/components'`) do not
+count as component imports. A default import of a .vue file binds the
+component under its file name; a named import from a barrel is followed
+through the barrel index to the .vue file and binds it under its alias.
+
+The templates of every importing SFC are then scanned once with a single
+LiteralMatcher over `<Name` and `<kebab-name` for all bound names (as Vue
+resolves `<BaseSwitch>` and `<base-switch>` to the same binding), instead
+of one search per name. A component counts as rendered by a file whose
+template has a tag of the name the file imports it under.
+
+Reported:
+
+- components imported by SFCs but rendered by none of them; an import
+  from a .ts module (router, composables, render functions) counts as use
+  and such components are not reported;
+- components re-exported by a barrel that two or more modules import, but
+  rendered in a single place: importing them directly (or moving them next
+  to their consumer) shrinks what every other consumer of the barrel loads.
+
+Tests are not scanned, as in the unused files analysis: mounting a
+component in a test does not render it in the app. Components used
+through `<component :is>` or registered globally are not seen; ignored
+components are listed in the 'component_usage' section of
+jisaku_scan/ignore.json.
+"""
+
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from jisaku_scan.barrels import parse_specifiers
+from jisaku_scan.cache import open_parse_cache
+from jisaku_scan.ignore import load_ignore_rules
+from jisaku_scan.matcher import LiteralMatcher
+from jisaku_scan.parallel import imap_ordered
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.sfc import split_sfc
+from jisaku_scan.stats import STATS
+from jisaku_scan.unused import extract_runtime_imports, is_scanned_file, parse_files
+
+
+# A component tag ends at whitespace, '/' (self-closing) or '>'
+TAG_AFTER = r'(?=[\s/>])'
+
+# Upper-case letters inside a word, as in Vue's hyphenate()
+HYPHENATE_PATTERN = re.compile(r'\B([A-Z])')
+
+
+class UnrenderedComponent(NamedTuple):
+    """
+    Component that SFCs import but never render.
+
+    Attributes:
+        path: Component, relative to the root
+        importers: SFCs importing it, relative to the root, sorted
+    """
+
+    path: str
+    importers: List[str]
+
+
+class SingleUseComponent(NamedTuple):
+    """
+    Component of a shared barrel rendered in a single place.
+
+    Attributes:
+        path: Component, relative to the root
+        size: Source bytes
+        consumer: The SFC rendering it, relative to the root
+        barrels: Shared barrels re-exporting it, with their number of importers
+    """
+
+    path: str
+    size: int
+    consumer: str
+    barrels: List[Tuple[str, int]]
+
+
+class ComponentReport(NamedTuple):
+    """
+    Result of find_component_usage.
+
+    Attributes:
+        components: Number of imported components
+        templates: Number of templates scanned
+        unrendered: Components imported but never rendered, by path
+        single_use: Components rendered once through a shared barrel, largest first
+    """
+
+    components: int
+    templates: int
+    unrendered: List[UnrenderedComponent]
+    single_use: List[SingleUseComponent]
+
+
+def hyphenate(name: str) -> str:
+    """Convert a PascalCase component name to its kebab-case tag ('BaseSwitch' -> 'base-switch')."""
+    return HYPHENATE_PATTERN.sub(r'-\1', name).lower()
+
+
+def find_template_tags(task: Tuple[str, LiteralMatcher]) -> Set[str]:
+    """
+    Find the component tags used in the templates of one SFC.
+
+    Args:
+        task: (absolute path of the .vue file, matcher over every '<Tag')
+
+    Returns:
+        Tag literals found in its <template> blocks (empty if unreadable)
+    """
+    file_path, matcher = task
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            blocks = split_sfc(f.read())
+    except (OSError, UnicodeDecodeError):
+        return set()
+    return matcher.matches('\n'.join(block.content for block in blocks if block.tag == 'template'))
+
+
+def find_component_usage(root_dir: Path, scan: Optional[ProjectScan] = None, use_cache: bool = True,
+                         jobs: int = 1) -> ComponentReport:
+    """
+    Index component tag usage across all templates and join it with the imports.
+
+    Args:
+        root_dir: Root directory
+        scan: Shared scan of root_dir (built if not given)
+        use_cache: Reuse and update the on-disk parse cache
+        jobs: Maximum number of worker processes for parsing and reading templates
+
+    Returns:
+        ComponentReport
+
+    Raises:
+        ValueError: If the ignore configuration is invalid
+    """
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    root_dir = scan.root
+    index = scan.index
+    rules = load_ignore_rules('component_usage')
+    rel_files = index.rel_files()
+    scanned = [rel_file for rel_file in rel_files if is_scanned_file(Path(rel_file))]
+
+    with open_parse_cache(root_dir, extract_runtime_imports, rel_files, use_cache) as cache:
+        parsed_files = parse_files(root_dir, scanned, index, cache, jobs, extract_runtime_imports)
+
+    with STATS.phase('imports'):
+        # component -> importing file -> names it is bound to there
+        bound: Dict[Path, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        # barrel -> importing files; component -> barrels re-exporting it
+        barrel_importers: Dict[Path, Set[str]] = defaultdict(set)
+        component_barrels: Dict[Path, Set[Path]] = defaultdict(set)
+        for rel_file, parsed in parsed_files.items():
+            if parsed is None:
+                continue
+            file_path = root_dir / rel_file
+            for name, specifier in parsed['bindings']:
+                target = scan.resolver.resolve(file_path, specifier)
+                if name == 'default' and target is not None and target.suffix == '.vue':
+                    bound[target][rel_file].add(target.stem)
+            for names, specifier in parsed['named']:
+                target = scan.resolver.resolve(file_path, specifier)
+                exports = scan.barrels.exports(target) if target is not None else None
+                if exports is None or not (exports.named or exports.star):
+                    continue
+                barrel_importers[target].add(rel_file)
+                for source_name, alias in parse_specifiers(names):
+                    path = scan.barrels.lookup(target, source_name)
+                    if path and path[-1].suffix == '.vue':
+                        bound[path[-1]][rel_file].add(alias)
+                        component_barrels[path[-1]].update([target, *path[:-1]])
+
+    with STATS.phase('templates'):
+        # '<Tag' literal -> bound names it stands for
+        literals: Dict[str, Set[str]] = defaultdict(set)
+        for importers in bound.values():
+            for names in importers.values():
+                for name in names:
+                    literals['<' + name].add(name)
+                    literals['<' + hyphenate(name)].add(name)
+        templates = sorted({rel_file for importers in bound.values() for rel_file in importers
+                            if rel_file.endswith('.vue')})
+        matcher = LiteralMatcher(literals, after=TAG_AFTER)
+        tasks = [(str(root_dir / rel_file), matcher) for rel_file in templates]
+        rendered_names: Dict[str, Set[str]] = {}
+        for rel_file, found in zip(templates, imap_ordered(find_template_tags, tasks, jobs)):
+            rendered_names[rel_file] = {name for literal in found for name in literals[literal]}
+    STATS.add('templates_read', len(templates))
+
+    with STATS.phase('usage'):
+        unrendered = []
+        single_use = []
+        for component, importers in bound.items():
+            rel_component = str(component.relative_to(root_dir))
+            if rel_component in rules.files or rules.ignores_dir(str(Path(rel_component).parent)):
+                continue
+            if not all(rel_file.endswith('.vue') for rel_file in importers):
+                # Used from a script module (router, composable, render function)
+                continue
+            renderers = [rel_file for rel_file, names in importers.items()
+                         if not names.isdisjoint(rendered_names.get(rel_file, ()))]
+            if not renderers:
+                unrendered.append(UnrenderedComponent(rel_component, sorted(importers)))
+                continue
+            shared = sorted((str(barrel.relative_to(root_dir)), len(barrel_importers[barrel]))
+                            for barrel in component_barrels.get(component, ()) if len(barrel_importers[barrel]) > 1)
+            if len(renderers) == 1 and shared:
+                stat = index.stat(component)
+                single_use.append(SingleUseComponent(rel_component, stat.st_size if stat is not None else 0,
+                                                     renderers[0], shared))
+        unrendered.sort()
+        single_use.sort(key=lambda component: (-component.size, component.path))
+
+    STATS.collect(scan, cache)
+    return ComponentReport(len(bound), len(templates), unrendered, single_use)
@@ -0,0 +1,141 @@
+"""
+Coverage Report
+
+Per-file coverage read from the lcov report of `pnpm test:coverage`
+(vitest with the 'lcov' reporter writes coverage/lcov.info).
+
+The report is streamed line by line and only the summary counters of each
+record (LF/LH, FNF/FNH, BRF/BRH) are kept; the per-line DA and BRDA entries
+that make up most of the file are skipped without being parsed. Memory
+grows with the number of files in the report, not with its size.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+
+DEFAULT_LCOV = os.path.join('coverage', 'lcov.info')
+
+# Per-file line coverage (percent) below which a file is reported, unless
+# vitest.config.ts sets coverage.thresholds.lines
+DEFAULT_THRESHOLD = 70.0
+
+# lines: N inside the coverage thresholds block of vitest.config.ts
+LINES_THRESHOLD_PATTERN = re.compile(r'\bthresholds\s*:\s*\{[^}]*?\blines\s*:\s*(\d+(?:\.\d+)?)')
+
+# Summary counters kept per record, by lcov tag
+SUMMARY_TAGS = {
+    'LF': 'lines_found', 'LH': 'lines_hit',
+    'FNF': 'functions_found', 'FNH': 'functions_hit',
+    'BRF': 'branches_found', 'BRH': 'branches_hit',
+}
+
+
+class FileCoverage(NamedTuple):
+    """
+    Coverage counters of one source file.
+
+    Attributes:
+        lines_found: Instrumented lines (LF)
+        lines_hit: Lines executed at least once (LH)
+        functions_found: Functions (FNF)
+        functions_hit: Functions called (FNH)
+        branches_found: Branches (BRF)
+        branches_hit: Branches taken (BRH)
+    """
+
+    lines_found: int = 0
+    lines_hit: int = 0
+    functions_found: int = 0
+    functions_hit: int = 0
+    branches_found: int = 0
+    branches_hit: int = 0
+
+    @property
+    def lines(self) -> float:
+        """Line coverage in percent (100 for a file without instrumented lines)."""
+        return 100.0 * self.lines_hit / self.lines_found if self.lines_found else 100.0
+
+
+def iter_lcov_records(lcov_path: Path) -> Iterator[Tuple[str, FileCoverage]]:
+    """
+    Stream the records of an lcov report.
+
+    Args:
+        lcov_path: lcov.info file
+
+    Yields:
+        (source file as written in the report, its coverage counters)
+
+    Raises:
+        ValueError: If the file cannot be read or a counter is not a number
+    """
+    source: Optional[str] = None
+    counters: Dict[str, int] = {}
+    try:
+        with open(lcov_path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                # DA:/BRDA:/FN:/FNDA: are per-line details, the bulk of the file
+                if line.startswith(('DA:', 'BRDA:', 'FN:', 'FNDA:')):
+                    continue
+                line = line.rstrip('\n')
+                if line.startswith('SF:'):
+                    source = line[3:]
+                    counters = {}
+                elif line == 'end_of_record':
+                    if source is not None:
+                        yield source, FileCoverage(**counters)
+                    source = None
+                else:
+                    tag, _, value = line.partition(':')
+                    field = SUMMARY_TAGS.get(tag)
+                    if field is not None:
+                        try:
+                            counters[field] = int(value)
+                        except ValueError:
+                            raise ValueError(f"{lcov_path}:{number}: invalid {tag} value {value!r}") from None
+    except (OSError, UnicodeDecodeError) as e:
+        raise ValueError(f"cannot read coverage report '{lcov_path}': {e}") from e
+
+
+def load_coverage(lcov_path: Path, root_dir: Path) -> Dict[str, FileCoverage]:
+    """
+    Index an lcov report by source file.
+
+    Args:
+        lcov_path: lcov.info file
+        root_dir: Project root; relative SF paths are relative to it, absolute
+            ones are made relative to it
+
+    Returns:
+        Mapping of path relative to root_dir -> coverage counters
+
+    Raises:
+        ValueError: If the report cannot be read or is malformed
+    """
+    root = str(Path(root_dir).resolve())
+    coverage = {}
+    for source, counters in iter_lcov_records(lcov_path):
+        rel_file = os.path.relpath(source, root) if os.path.isabs(source) else os.path.normpath(source)
+        coverage[rel_file] = counters
+    return coverage
+
+
+def read_lines_threshold(root_dir: Path) -> float:
+    """
+    Read the line coverage threshold from vitest.config.ts.
+
+    Args:
+        root_dir: Project root
+
+    Returns:
+        coverage.thresholds.lines, or DEFAULT_THRESHOLD if the config has none
+    """
+    try:
+        with open(Path(root_dir) / 'vitest.config.ts', 'r', encoding='utf-8') as f:
+            match = LINES_THRESHOLD_PATTERN.search(f.read())
+    except (OSError, UnicodeDecodeError):
+        return DEFAULT_THRESHOLD
+    return float(match.group(1)) if match else DEFAULT_THRESHOLD
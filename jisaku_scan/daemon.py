@@ -0,0 +1,352 @@
+"""
+Watch Daemon
+
+Keeps the file index, barrel index and module graph of a project in memory
+and answers "is X unused / untested?" queries over a local Unix socket.
+
+Started with `python3 -m jisaku_scan watch`, queried with
+`python3 -m jisaku_scan query`. File changes reported by the watcher (see
+jisaku_scan.watcher) are applied incrementally: the index re-lists only the
+directories that changed, changed files are parsed again, and only they and
+the files importing them (directly or through barrels) are resolved again.
+The reports are recomputed from the resident graph on the next query;
+file classification (which files can be reported, which lack tests) is
+only redone when files are added or removed or a barrel changes.
+
+Protocol: the client sends one JSON object per connection, terminated by a
+newline, and receives one JSON object back. Requests:
+    {"query": "unused", "paths": [...]}    status of absolute paths, or the
+                                            full list when paths is empty
+    {"query": "untested", "paths": [...]}  same for untested files
+    {"query": "status"}                    daemon and tree information
+    {"query": "stop"}                      shut the daemon down
+"""
+
+import json
+import os
+import selectors
+import socket
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from jisaku_scan.cache import cache_dir_for, open_parse_cache
+from jisaku_scan.graph import UNRESOLVED, DependencyGraph
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.untested import find_untested_files
+from jisaku_scan.unused import (
+    Extractor, extract_imports, find_orphaned_test_files, find_source_files, is_scanned_file,
+    mark_and_sweep, parse_files, update_graph,
+)
+
+
+# Largest request accepted from a client
+MAX_REQUEST_BYTES = 1 << 20
+
+# Seconds a client may take to send its request
+CLIENT_TIMEOUT = 5.0
+
+
+def default_socket_path(root_dir: Path) -> Path:
+    """
+    Get the socket path of the daemon watching a root.
+
+    Args:
+        root_dir: Root directory of the project
+
+    Returns:
+        Socket path in the cache directory of the root
+    """
+    return cache_dir_for(Path(root_dir).resolve()) / 'watch.sock'
+
+
+class ResidentScan:
+    """
+    Project scan, parsed imports and module graph kept up to date in memory.
+
+    Attributes:
+        root: Absolute root directory
+        scan: Shared ProjectScan (file index, resolver, barrel index)
+        graph: Module graph of every scanned file
+        parsed: Extract results by relative path
+        updated: Wall time (seconds) of the last build or update
+    """
+
+    def __init__(self, root_dir: Path, jobs: int = 1, extract: Extractor = extract_imports):
+        """
+        Scan the tree and build the module graph (parse results come from the on-disk cache).
+
+        Args:
+            root_dir: Root directory of the project
+            jobs: Worker processes for the initial parse
+            extract: Import extractor
+        """
+        self.root = Path(root_dir).resolve()
+        self.jobs = jobs
+        self.extract = extract
+        self.updated = 0.0
+        self._report: Optional[Tuple[Set[str], Set[str]]] = None
+        # (source files, orphaned test files, untested files)
+        self._classified: Optional[Tuple[List[Path], List[Path], List[str]]] = None
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Scan the whole tree again and rebuild the module graph."""
+        start = time.perf_counter()
+        # Same file list as check: refresh filters what it lists through the git ignore rules
+        self.scan = ProjectScan(self.root)
+        index = self.scan.index
+        scanned = [rel_file for rel_file in index.rel_files() if is_scanned_file(Path(rel_file))]
+        with open_parse_cache(self.root, self.extract, index.rel_files()) as cache:
+            self.parsed = parse_files(self.root, scanned, index, cache, self.jobs, self.extract)
+        self.graph = DependencyGraph()
+        update_graph(self.graph, self.root, scanned, self.parsed, self.scan.barrels, self.scan.resolver)
+        self._report = None
+        self._classified = None
+        self.updated = time.perf_counter() - start
+
+    def apply(self, changed: Set[str]) -> None:
+        """
+        Apply file changes to the index and the module graph.
+
+        Args:
+            changed: Changed, added or removed paths (files or directories) relative to the root
+        """
+        if 'tsconfig.json' in changed:
+            # Path aliases changed: every resolution may differ
+            self.rebuild()
+            return
+        if self.scan.index.backend == 'git' and any(os.path.basename(rel) == '.gitignore' for rel in changed):
+            # Ignore rules changed: files may enter or leave the git file list
+            self.rebuild()
+            return
+        start = time.perf_counter()
+        root, index = self.root, self.scan.index
+        barrels, resolver = self.scan.barrels, self.scan.resolver
+
+        added, removed = index.refresh(changed)
+        if added or removed:
+            resolver.clear()
+        touched_rel = changed | added | removed
+        barrels.invalidate(root / rel for rel in touched_rel)
+
+        for rel in removed:
+            self.graph.remove(str(root / rel))
+            self.parsed.pop(rel, None)
+        stale = sorted(
+            rel for rel in touched_rel - removed if is_scanned_file(Path(rel)) and index.is_file(root / rel)
+        )
+
+        touched = {str(root / rel) for rel in touched_rel}
+        for rel in added:
+            # A new file can shadow a sibling with the same stem (./foo -> foo.ts)
+            stem = str((root / rel).with_suffix(''))
+            touched.update(stem + ext for ext in ['', '.ts', '.vue', '.js'])
+
+        affected = {node for node in self.graph.importers_of(touched) if node in self.graph.edges}
+        if added or removed:
+            # New files may satisfy imports that did not resolve before
+            affected.update(node for node, edges in self.graph.edges.items() if edges.get(UNRESOLVED))
+        prefix = len(str(root)) + 1
+        recompute = set(stale) | {node[prefix:] for node in affected}
+
+        self.parsed.update(parse_files(root, stale, index, None, 1, self.extract))
+        update_graph(self.graph, root, sorted(recompute), self.parsed, barrels, resolver)
+        self._report = None
+        if added or removed or any(os.path.basename(rel) == 'index.ts' for rel in changed):
+            self._classified = None
+        self.updated = time.perf_counter() - start
+
+    def report(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Get the unused and untested files, recomputed if anything changed.
+
+        Returns:
+            Tuple of (unused files, untested files) as paths relative to the root
+        """
+        if self._classified is None:
+            index, barrels = self.scan.index, self.scan.barrels
+            self._classified = (
+                find_source_files(self.root, index, barrels),
+                find_orphaned_test_files(self.root, index),
+                find_untested_files(str(self.root), index, barrels),
+            )
+        if self._report is None:
+            source_files, orphaned_tests, untested = self._classified
+            _, unused = mark_and_sweep(self.root, self.graph, source_files)
+            unused.extend(orphaned_tests)
+            prefix = len(str(self.root)) + 1
+            self._report = ({str(file_path)[prefix:] for file_path in unused}, set(untested))
+        return self._report
+
+    def relative(self, path: str) -> Optional[str]:
+        """Convert a path from a client to a path relative to the root (None if outside)."""
+        return self.scan.index.relative(Path(path))
+
+
+def handle_request(state: ResidentScan, request: Dict[str, object], watcher_kind: str) -> Dict[str, object]:
+    """
+    Answer one query.
+
+    Args:
+        state: Resident scan of the project
+        request: Decoded request (see the module docstring)
+        watcher_kind: Kind of the file watcher, for status
+
+    Returns:
+        JSON-serializable response
+    """
+    query = request.get('query')
+    if query in ('unused', 'untested'):
+        unused, untested = state.report()
+        found = unused if query == 'unused' else untested
+        paths = request.get('paths') or []
+        if not isinstance(paths, list):
+            return {'error': "'paths' must be a list"}
+        if not paths:
+            return {query: sorted(found)}
+        files = []
+        for path in paths:
+            rel = state.relative(str(path))
+            files.append({
+                'path': rel if rel is not None else path,
+                'exists': rel is not None and state.scan.index.is_file(state.root / rel),
+                query: rel in found,
+            })
+        return {'files': files}
+    if query == 'status':
+        unused, untested = state.report()
+        return {
+            'root': str(state.root),
+            'pid': os.getpid(),
+            'watcher': watcher_kind,
+            'files': sum(len(entry[1]) for entry in state.scan.index.dirs.values()),
+            'modules': len(state.graph.edges),
+            'unused': len(unused),
+            'untested': len(untested),
+            'last_update_ms': round(state.updated * 1000, 1),
+        }
+    if query == 'stop':
+        return {'stopped': True}
+    return {'error': f'unknown query {query!r}'}
+
+
+def _read_request(client: socket.socket) -> Dict[str, object]:
+    data = b''
+    while b'\n' not in data and len(data) < MAX_REQUEST_BYTES:
+        chunk = client.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    request = json.loads(data.decode('utf-8'))
+    if not isinstance(request, dict):
+        raise ValueError('request must be a JSON object')
+    return request
+
+
+def _bind(socket_path: Path) -> socket.socket:
+    """Bind the server socket, replacing a stale socket file left by a dead daemon."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+        else:
+            raise ValueError(f"a watch daemon is already listening on '{socket_path}'")
+        finally:
+            probe.close()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(16)
+    return server
+
+
+def serve(state: ResidentScan, watcher, socket_path: Path) -> None:
+    """
+    Apply file changes and answer queries until a stop request arrives.
+
+    Pending file events are applied before every answer, so a query sent
+    right after saving a file already sees the change (inotify only; the
+    polling watcher sees it on its next walk).
+
+    Args:
+        state: Resident scan of the project
+        watcher: InotifyWatcher or PollingWatcher of the tree
+        socket_path: Unix socket to listen on
+
+    Raises:
+        ValueError: If another daemon is listening on socket_path
+    """
+    server = _bind(socket_path)
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ, 'client')
+    if watcher.fileno() is not None:
+        selector.register(watcher.fileno(), selectors.EVENT_READ, 'watcher')
+    # Classify the tree now rather than on the first query
+    state.report()
+    running = True
+    try:
+        while running:
+            ready = selector.select(watcher.timeout)
+            changed = watcher.read_changes()
+            if changed is None:
+                state.rebuild()
+            elif changed:
+                state.apply(changed)
+
+            for key, _ in ready:
+                if key.data != 'client':
+                    continue
+                client, _ = server.accept()
+                with client:
+                    client.settimeout(CLIENT_TIMEOUT)
+                    try:
+                        request = _read_request(client)
+                    except (OSError, ValueError) as e:
+                        response: Dict[str, object] = {'error': f'invalid request: {e}'}
+                    else:
+                        response = handle_request(state, request, watcher.kind)
+                        running = request.get('query') != 'stop'
+                    try:
+                        client.sendall(json.dumps(response).encode('utf-8') + b'\n')
+                    except OSError:
+                        pass
+    finally:
+        selector.close()
+        server.close()
+        watcher.close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+
+
+def send_query(socket_path: Path, request: Dict[str, object], timeout: float = 30.0) -> Dict[str, object]:
+    """
+    Send a query to a running daemon.
+
+    Args:
+        socket_path: Socket of the daemon
+        request: Request object (see the module docstring)
+        timeout: Seconds to wait for the answer
+
+    Returns:
+        Decoded response
+
+    Raises:
+        OSError: If no daemon is listening or the connection fails
+        ValueError: If the response is not valid JSON
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        chunks: List[bytes] = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b''.join(chunks).decode('utf-8'))
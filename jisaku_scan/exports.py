@@ -0,0 +1,243 @@
+"""
+Unused Exports
+
+Finds exported symbols that nothing imports, so a module that is used can
+still be checked for dead exports (a barrel such as src/api/index.ts may
+keep dozens of them alive).
+
+Every scanned file is parsed once with extract_imports_and_exports, which
+yields its imports (named, default and namespace bindings) and the names it
+declares as exports in the same pass. Re-exports come from the barrel
+index. Each imported name is followed from the module it is imported from
+through `export { a as b } from`, `export * as ns from`, `export * from` and
+nested barrels to the module declaring it, marking every export on the way
+used; what stays unmarked is reported. A symbol is reported once, at the
+module declaring it: re-export lines of barrels only pass names on and are
+not reported themselves.
+
+Namespace imports (`import * as ns`), dynamic imports and `<script src>`
+use every export of the target. Imports from test files count as uses.
+Only .ts and .js modules are reported (a .vue component's default export
+is implicit); ignored directories and files are listed in the
+'unused_exports' section of jisaku_scan/ignore.json.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from jisaku_scan.barrels import ModuleExports, parse_specifiers
+from jisaku_scan.cache import open_parse_cache
+from jisaku_scan.ignore import load_ignore_rules
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.stats import STATS
+from jisaku_scan.unused import extract_imports_and_exports, is_scanned_file, parse_files
+
+
+# Export name standing for every export of a module
+ALL = '*'
+
+
+class SymbolIndex:
+    """
+    Exported names of every module and the names imported from them.
+
+    Modules are absolute path strings, as in the module graph.
+    """
+
+    def __init__(self, scan: ProjectScan):
+        """
+        Create an empty index.
+
+        Args:
+            scan: Shared scan of the project (resolver and barrel index)
+        """
+        self.scan = scan
+        # Names each module declares itself (export const a, export default ...)
+        self.declared: Dict[str, Set[str]] = {}
+        # Modules with re-exports, parsed by the barrel index
+        self._reexporting: Set[str] = set()
+        self.used: Dict[str, Set[str]] = {}
+        self._visited: Set[Tuple[str, str]] = set()
+        # (importing module, specifier, export name) of every import
+        self._imports: List[Tuple[str, str, str]] = []
+
+    def add_module(self, module: str, parsed: Dict[str, list]) -> None:
+        """
+        Record the exports and imports of a parsed module.
+
+        Args:
+            module: Absolute path of the module
+            parsed: Result of extract_imports_and_exports for the module
+        """
+        self.declared[module] = set(parsed.get('exports', ()))
+        if parsed['reexports']:
+            self._reexporting.add(module)
+        for imports_str, specifier in parsed['named']:
+            self._imports.extend((module, specifier, name) for name, _ in parse_specifiers(imports_str))
+        self._imports.extend((module, specifier, name) for name, specifier in parsed.get('bindings', ()))
+
+    def _reexports(self, module: str) -> Optional[ModuleExports]:
+        if module not in self._reexporting:
+            return None
+        return self.scan.barrels.exports(Path(module))
+
+    def _resolve(self, module: str, specifier: str) -> Optional[str]:
+        resolved = self.scan.resolver.resolve(Path(module), specifier)
+        return str(resolved) if resolved else None
+
+    def exported_names(self, module: str) -> Set[str]:
+        """
+        Get the names a module exports itself: declarations and named re-exports.
+
+        Names passed on by `export * from` belong to the module they come from.
+
+        Args:
+            module: Absolute path of the module
+
+        Returns:
+            Set of export names
+        """
+        names = set(self.declared.get(module, ()))
+        reexports = self._reexports(module)
+        if reexports is not None:
+            names.update(reexports.named)
+        return names
+
+    def _provides(self, module: str, name: str, visiting: Set[str]) -> bool:
+        """Check whether a module exports a name, itself or through `export * from`."""
+        if module in visiting:
+            return False
+        visiting.add(module)
+        if name in self.exported_names(module):
+            return True
+        reexports = self._reexports(module)
+        if reexports is None:
+            return False
+        for specifier in reexports.star:
+            target = self._resolve(module, specifier)
+            if target is not None and self._provides(target, name, visiting):
+                return True
+        return False
+
+    def use(self, module: str, name: str) -> None:
+        """
+        Mark an export of a module used, and the exports it is re-exported from.
+
+        Args:
+            module: Absolute path of the module imported from
+            name: Imported export name, or ALL for every export
+        """
+        pending = [(module, name)]
+        while pending:
+            module, name = pending.pop()
+            if (module, name) in self._visited:
+                continue
+            self._visited.add((module, name))
+            self.used.setdefault(module, set()).add(name)
+            reexports = self._reexports(module)
+            if reexports is None:
+                continue
+
+            if name == ALL:
+                # The whole namespace: every named re-export and every star source
+                pending.extend((module, exported) for exported in reexports.named)
+                for specifier in reexports.star:
+                    target = self._resolve(module, specifier)
+                    if target is not None:
+                        pending.append((target, ALL))
+                continue
+
+            entry = reexports.named.get(name)
+            if entry is not None:
+                specifier, source_name = entry
+                target = self._resolve(module, specifier)
+                if target is not None:
+                    pending.append((target, source_name))
+            elif name not in self.declared.get(module, ()):
+                # First `export * from` providing the name, as the barrel index does
+                for specifier in reexports.star:
+                    target = self._resolve(module, specifier)
+                    if target is not None and self._provides(target, name, set()):
+                        pending.append((target, name))
+                        break
+
+    def resolve_imports(self) -> None:
+        """Mark every recorded import used (see use)."""
+        for module, specifier, name in self._imports:
+            target = self._resolve(module, specifier)
+            if target is not None:
+                self.use(target, name)
+
+    def unused(self, module: str) -> List[str]:
+        """
+        Get the exports a module declares that nothing imports.
+
+        Named re-exports are left out: an unused one is reported at the
+        module declaring the name, which it never marked used.
+
+        Args:
+            module: Absolute path of the module
+
+        Returns:
+            Sorted export names
+        """
+        used = self.used.get(module, set())
+        if ALL in used:
+            return []
+        return sorted(self.declared.get(module, set()) - used)
+
+
+def is_reported_module(rel_file: str) -> bool:
+    """Check if the exports of a file are reported (.ts and .js modules, no tests or declarations)."""
+    return (rel_file.endswith(('.ts', '.js'))
+            and not rel_file.endswith(('.test.ts', '.d.ts')))
+
+
+def find_unused_exports(root_dir: Path, use_cache: bool = True, jobs: int = 1,
+                        scan: Optional[ProjectScan] = None) -> List[Tuple[Path, str]]:
+    """
+    Find exported symbols that no module imports.
+
+    Args:
+        root_dir: Root directory
+        use_cache: Reuse and update the on-disk parse cache
+        jobs: Maximum number of worker processes for parsing
+        scan: Shared scan of root_dir (built if not given)
+
+    Returns:
+        Sorted list of (file path, export name) pairs
+
+    Raises:
+        ValueError: If the ignore configuration is invalid
+    """
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    root_dir = scan.root
+    index = scan.index
+    rules = load_ignore_rules('unused_exports')
+
+    rel_files = index.rel_files()
+    # Test files are not part of the module graph, but their imports count
+    scanned = [rel_file for rel_file in rel_files
+               if is_scanned_file(Path(rel_file)) or rel_file.endswith('.test.ts')]
+    with open_parse_cache(root_dir, extract_imports_and_exports, rel_files, use_cache) as cache:
+        parsed_files = parse_files(root_dir, scanned, index, cache, jobs, extract_imports_and_exports)
+
+    with STATS.phase('symbols'):
+        symbols = SymbolIndex(scan)
+        for rel_file, parsed in parsed_files.items():
+            if parsed is not None:
+                symbols.add_module(str(root_dir / rel_file), parsed)
+        symbols.resolve_imports()
+
+        unused = []
+        for rel_file in scanned:
+            if not is_reported_module(rel_file) or rel_file in rules.files:
+                continue
+            if rules.ignores_dir(str(Path(rel_file).parent)):
+                continue
+            module = str(root_dir / rel_file)
+            unused.extend((root_dir / rel_file, name) for name in symbols.unused(module))
+
+    STATS.collect(scan, cache)
+    return unused
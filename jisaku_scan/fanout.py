@@ -0,0 +1,193 @@
+"""
+Barrel Fan-out
+
+Estimates what barrels cost the Vite dev server and vitest, which serve
+modules unbundled: importing one name from a barrel such as
+src/shared/components/index.ts loads the barrel and every module it
+re-exports, with their imports, before the consumer runs.
+
+For each barrel (a module with runtime re-exports) the fan-out is its
+transitive closure over imports, re-exports and stylesheets. Each consumer
+importing named exports from it is compared with a direct import of the
+modules providing those names (found through the barrel index): the
+difference is the load it wastes. Barrels are ranked by the waste summed
+over their consumers, and the consumers wasting the most are listed first
+as the best candidates for a direct import.
+
+Type-only imports and re-exports are erased before the module is served,
+so the graph is built with extract_runtime_imports, sharing the parse cache
+namespace of the route chunk weights analysis (the entries of the unused
+files analysis are kept apart and survive a run). Default, namespace and
+side-effect imports of a barrel, and names the barrel declares itself,
+need the whole barrel and are not counted as waste.
+
+Each consumer is measured as if the barrel were its only path to those
+modules; modules it also reaches through other imports are counted as
+wasted anyway, so the figures are upper bounds.
+"""
+
+from collections import defaultdict
+from itertools import compress
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set
+
+from jisaku_scan.barrels import parse_specifiers
+from jisaku_scan.cache import open_parse_cache, tree_signature
+from jisaku_scan.chunks import module_sizes
+from jisaku_scan.graph import REEXPORTS, STYLES, USED, DependencyGraph
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.stats import STATS
+from jisaku_scan.unused import extract_runtime_imports, is_scanned_file, parse_files, update_graph
+
+
+# Share of a barrel's fan-out below which a consumer counts as using a small part of it
+DEFAULT_FRACTION = 0.25
+
+
+class BarrelConsumer(NamedTuple):
+    """
+    Module importing named exports from a barrel.
+
+    Attributes:
+        path: Consumer, relative to the root
+        names: Imported export names, sorted
+        needed: Source bytes a direct import of the providing modules would load
+        wasted: Source bytes loaded through the barrel beyond that
+    """
+
+    path: str
+    names: List[str]
+    needed: int
+    wasted: int
+
+
+class BarrelCost(NamedTuple):
+    """
+    Fan-out of one barrel and what its consumers waste.
+
+    Attributes:
+        path: Barrel, relative to the root
+        modules: Number of modules it loads (itself included)
+        size: Source bytes of those modules
+        importers: Number of modules importing it
+        partial: Consumers using less than the fraction threshold of its size
+        wasted: Bytes wasted, summed over consumers
+        consumers: Consumers of named exports, most wasteful first
+    """
+
+    path: str
+    modules: int
+    size: int
+    importers: int
+    partial: int
+    wasted: int
+    consumers: List[BarrelConsumer]
+
+
+def find_barrel_costs(root_dir: Path, fraction: float = DEFAULT_FRACTION, scan: Optional[ProjectScan] = None,
+                      use_cache: bool = True, jobs: int = 1) -> List[BarrelCost]:
+    """
+    Compute the fan-out of every barrel and the load its consumers waste.
+
+    Args:
+        root_dir: Root directory
+        fraction: Share of the fan-out below which a consumer counts as partial
+        scan: Shared scan of root_dir (built if not given)
+        use_cache: Reuse and update the on-disk parse cache
+        jobs: Maximum number of worker processes for parsing
+
+    Returns:
+        Barrels with at least one importer, most wasted bytes first
+    """
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    root_dir = scan.root
+    index = scan.index
+    rel_files = index.rel_files()
+    # Test files load barrels in vitest too
+    scanned = [rel_file for rel_file in rel_files
+               if is_scanned_file(Path(rel_file)) or rel_file.endswith('.test.ts')]
+
+    with open_parse_cache(root_dir, extract_runtime_imports, rel_files, use_cache) as cache:
+        parsed_files = parse_files(root_dir, scanned, index, cache, jobs, extract_runtime_imports)
+        graph = DependencyGraph()
+        tree_key = tree_signature(rel_files) if cache is not None else ''
+        update_graph(graph, root_dir, scanned, parsed_files, scan.barrels, scan.resolver, cache, tree_key)
+
+    with STATS.phase('fan-out'):
+        barrels = [node for node, edges in graph.edges.items() if edges.get(REEXPORTS)]
+        is_barrel = set(barrels)
+
+        # Names each consumer imports from each barrel; None if it needs all of it
+        imported: Dict[str, Dict[str, Optional[Set[str]]]] = defaultdict(dict)
+        for rel_file, parsed in parsed_files.items():
+            if parsed is None:
+                continue
+            file_path = root_dir / rel_file
+            consumer = str(file_path)
+            targets = {}
+            for specifier in set(parsed['imports']):
+                resolved = scan.resolver.resolve(file_path, specifier)
+                if resolved is not None and str(resolved) in is_barrel:
+                    targets[specifier] = str(resolved)
+            if not targets:
+                continue
+            named_specifiers = set()
+            for names, specifier in parsed['named']:
+                barrel = targets.get(specifier)
+                if barrel is not None:
+                    named_specifiers.add(specifier)
+                    used = imported[barrel].setdefault(consumer, set())
+                    if used is not None:
+                        used.update(name for name, _ in parse_specifiers(names))
+            whole = {specifier for _, specifier in parsed['bindings']}
+            # Side-effect imports have neither named imports nor bindings
+            whole.update(specifier for specifier in targets if specifier not in named_specifiers)
+            for specifier in whole:
+                if specifier in targets:
+                    imported[targets[specifier]][consumer] = None
+
+        compact = graph.compact()
+        adjacencies = [compact.forward[USED], compact.forward[REEXPORTS], compact.forward[STYLES]]
+        fanouts = {barrel: compact.mark(compact.ids_of([barrel]), adjacencies) for barrel in imported}
+        sizes = module_sizes(compact, index, fanouts.values())
+
+        needed_bytes: Dict[FrozenSet[str], int] = {}
+        costs = []
+        for barrel, consumers in imported.items():
+            fanout = fanouts[barrel]
+            size = sum(compress(sizes, fanout))
+            measured = []
+            for consumer, names in consumers.items():
+                sources = _providing_modules(scan, barrel, names)
+                if sources is None:
+                    continue
+                if sources not in needed_bytes:
+                    needed_bytes[sources] = sum(compress(sizes, compact.mark(compact.ids_of(sources), adjacencies)))
+                needed = needed_bytes[sources]
+                measured.append(BarrelConsumer(str(Path(consumer).relative_to(root_dir)), sorted(names),
+                                               needed, max(0, size - needed)))
+            measured.sort(key=lambda consumer: (-consumer.wasted, consumer.path))
+            costs.append(BarrelCost(
+                str(Path(barrel).relative_to(root_dir)), sum(fanout), size, len(consumers),
+                sum(1 for consumer in measured if consumer.needed < fraction * size),
+                sum(consumer.wasted for consumer in measured), measured,
+            ))
+        costs.sort(key=lambda cost: (-cost.wasted, cost.path))
+
+    STATS.collect(scan, cache)
+    return costs
+
+
+def _providing_modules(scan: ProjectScan, barrel: str, names: Optional[Set[str]]) -> Optional[FrozenSet[str]]:
+    """Find the modules a direct import of the names would load, or None if the barrel itself is needed."""
+    if not names:
+        return None
+    sources: Set[str] = set()
+    for name in names:
+        path = scan.barrels.lookup(Path(barrel), name)
+        if not path:
+            # Declared by the barrel itself (or not found)
+            return None
+        sources.add(str(path[-1]))
+    return frozenset(sources)
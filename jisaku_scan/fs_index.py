@@ -0,0 +1,372 @@
+"""
+File Index
+
+A single-pass, in-memory index of the project tree.
+
+The scanners used to call os.walk once per phase (all files, source files,
+orphaned tests, untested files). The index walks the tree once with
+os.scandir and every phase queries it instead of touching the disk again.
+
+Inside a git work tree the index can instead be built from the local git
+index (use_git): tracked files plus untracked files that are not ignored,
+so .gitignore'd output such as coverage/ is never listed, with the blob ID
+of every unmodified tracked file as a content key for the parse cache.
+Only new untracked directories are walked, and what the walk lists there
+(or refresh lists again later) is filtered through the git ignore rules,
+so a git index kept up to date stays equal to a fresh one. Outside a git
+work tree, for a root that is ignored or has no tracked file, or if git
+fails, the index falls back to the walk.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from jisaku_scan.incremental import git_ignored, git_list_files
+
+
+# Directories that are never descended into
+SKIP_DIRS = frozenset({'node_modules', '.git', 'dist', 'build', 'playwright-report', 'test-results'})
+
+
+def join_rel(rel_dir: str, name: str) -> str:
+    """
+    Join a relative directory and a name the same way os.walk + relpath would.
+
+    Args:
+        rel_dir: Directory relative to the index root ('.' for the root itself)
+        name: File or directory name
+
+    Returns:
+        Relative path of the entry
+    """
+    return name if rel_dir == '.' else rel_dir + os.sep + name
+
+
+class FileIndex:
+    """
+    Index of every file under a root directory, built with one os.scandir walk.
+
+    Stores per-directory subdirectory and file lists (in scandir order, like
+    os.walk, or git order) and memoizes stat results so each file is stat'ed
+    at most once.
+
+    Attributes:
+        backend: 'git' if the file list came from the git index, else 'walk'
+    """
+
+    def __init__(self, root_dir: Path, skip_dirs: Iterable[str] = SKIP_DIRS, use_git: bool = False):
+        """
+        Walk root_dir (or read its git index) and build the index.
+
+        Args:
+            root_dir: Root directory to index
+            skip_dirs: Directory names that are not descended into
+            use_git: List the files from the git index when root_dir is in a
+                git work tree (see the module docstring)
+        """
+        self.root = Path(root_dir)
+        self.skip_dirs = frozenset(skip_dirs)
+        # rel_dir -> (subdirectory names, file names)
+        self.dirs: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._file_sets: Dict[str, FrozenSet[str]] = {}
+        self._stats: Dict[str, os.stat_result] = {}
+        # rel_file -> blob ID of files unmodified since the git index
+        self._blobs: Dict[str, str] = {}
+        # Number of os.stat calls made by stat()
+        self.stat_calls = 0
+        listing = git_list_files(self.root) if use_git else None
+        if listing is None:
+            self.backend = 'walk'
+            self._build()
+        else:
+            self.backend = 'git'
+            self._build_from_git(*listing)
+
+    def _build(self, top: str = '.', added: Optional[Set[str]] = None) -> None:
+        """
+        Walk a directory tree, recording directories and files.
+
+        Args:
+            top: Directory to walk, relative to the root
+            added: Collects the relative paths of the files found, if given
+        """
+        stack = [top]
+        while stack:
+            rel_dir = stack.pop()
+            listing = self._list_dir(rel_dir)
+            if listing is None:
+                continue
+            subdirs, filenames, followed = listing
+            self.dirs[rel_dir] = (subdirs, filenames)
+            self._file_sets.pop(rel_dir, None)
+            stack.extend(followed)
+            if added is not None:
+                added.update(join_rel(rel_dir, filename) for filename in filenames)
+
+    def _build_from_git(self, files: Dict[str, Optional[str]], walked_dirs: List[str]) -> None:
+        """
+        Record the files listed by git_list_files.
+
+        Args:
+            files: Relative file path -> blob ID (None if modified or untracked)
+            walked_dirs: Untracked directories and symlinked directories (listed
+                like the walk does: symlinks are not followed)
+        """
+        self._add_dir('.')
+        for rel_file, blob in files.items():
+            rel_dir, name = os.path.split(rel_file)
+            if self._is_skipped(rel_dir):
+                continue
+            self._add_dir(rel_dir or '.')[1].append(name)
+            if blob is not None:
+                self._blobs[rel_file] = blob
+        for rel_dir in walked_dirs:
+            parent, name = os.path.split(rel_dir)
+            if self._is_skipped(rel_dir) or rel_dir in self.dirs:
+                continue
+            self._add_dir(parent or '.')[0].append(name)
+            if not os.path.islink(os.path.join(str(self.root), rel_dir)):
+                self._build(rel_dir)
+
+    def _is_skipped(self, rel_dir: str) -> bool:
+        """Check whether a relative directory is in (or below) a skipped directory."""
+        return bool(rel_dir) and not self.skip_dirs.isdisjoint(rel_dir.split(os.sep))
+
+    def _add_dir(self, rel_dir: str) -> Tuple[List[str], List[str]]:
+        """Get the entry of a directory, creating it (and its ancestors) if needed."""
+        entry = self.dirs.get(rel_dir)
+        if entry is None:
+            entry = self.dirs[rel_dir] = ([], [])
+            if rel_dir != '.':
+                parent, name = os.path.split(rel_dir)
+                self._add_dir(parent or '.')[0].append(name)
+        return entry
+
+    def _list_dir(self, rel_dir: str) -> Optional[Tuple[List[str], List[str], List[str]]]:
+        """
+        List one directory with os.scandir.
+
+        With the git backend, entries git ignores are left out.
+
+        Args:
+            rel_dir: Directory relative to the root
+
+        Returns:
+            (subdirectory names, file names, relative subdirectories to descend
+            into), or None if the directory cannot be listed
+        """
+        abs_dir = str(self.root) if rel_dir == '.' else os.path.join(str(self.root), rel_dir)
+        subdirs: List[str] = []
+        filenames: List[str] = []
+        followed: List[str] = []
+        try:
+            with os.scandir(abs_dir) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        filenames.append(entry.name)
+                    elif entry.name not in self.skip_dirs:
+                        subdirs.append(entry.name)
+                        # Like os.walk, list symlinked directories but don't follow them
+                        if not entry.is_symlink():
+                            followed.append(join_rel(rel_dir, entry.name))
+        except OSError:
+            return None
+        if self.backend == 'git' and (subdirs or filenames):
+            ignored = git_ignored(self.root, [join_rel(rel_dir, name) for name in subdirs + filenames])
+            if ignored:
+                subdirs = [name for name in subdirs if join_rel(rel_dir, name) not in ignored]
+                filenames = [name for name in filenames if join_rel(rel_dir, name) not in ignored]
+                followed = [sub_dir for sub_dir in followed if sub_dir not in ignored]
+        return subdirs, filenames, followed
+
+    def _drop(self, top: str, removed: Set[str]) -> None:
+        """Forget a directory and everything below it, collecting its files in removed."""
+        prefix = top + os.sep
+        for rel_dir in [rel_dir for rel_dir in self.dirs if rel_dir == top or rel_dir.startswith(prefix)]:
+            removed.update(join_rel(rel_dir, filename) for filename in self.dirs.pop(rel_dir)[1])
+            self._file_sets.pop(rel_dir, None)
+
+    def refresh(self, rel_paths: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        Bring the index up to date after files or directories changed on disk.
+
+        The parent directory of every changed path is listed again; new
+        subdirectories are walked and vanished ones forgotten. Memoized stat
+        results of the paths are dropped.
+
+        Args:
+            rel_paths: Changed paths (files or directories) relative to the root
+
+        Returns:
+            Tuple of (added files, removed files) as relative paths
+        """
+        added: Set[str] = set()
+        removed: Set[str] = set()
+        rescan: Set[str] = set()
+        for rel_path in rel_paths:
+            self._stats.pop(str(self.root / rel_path), None)
+            self._blobs.pop(rel_path, None)
+            # The nearest indexed ancestor (paths in skipped directories end at their parent)
+            rel_dir = os.path.dirname(rel_path) or '.'
+            while rel_dir not in self.dirs and rel_dir != '.':
+                rel_dir = os.path.dirname(rel_dir) or '.'
+            rescan.add(rel_dir)
+
+        # Parents first, so a vanished subtree is not listed again below
+        for rel_dir in sorted(rescan, key=lambda rel_dir: (rel_dir != '.', rel_dir.count(os.sep))):
+            old = self.dirs.get(rel_dir)
+            if old is None and rel_dir != '.':
+                continue
+            listing = self._list_dir(rel_dir)
+            if listing is None:
+                self._drop(rel_dir, removed)
+                continue
+            subdirs, filenames, followed = listing
+            old_subdirs, old_files = old if old is not None else ([], [])
+            added.update(join_rel(rel_dir, name) for name in set(filenames) - set(old_files))
+            removed.update(join_rel(rel_dir, name) for name in set(old_files) - set(filenames))
+            for name in set(old_subdirs) - set(subdirs):
+                self._drop(join_rel(rel_dir, name), removed)
+            self.dirs[rel_dir] = (subdirs, filenames)
+            self._file_sets.pop(rel_dir, None)
+            for sub_dir in followed:
+                if sub_dir not in self.dirs:
+                    self._build(sub_dir, added)
+
+        for rel_file in removed:
+            self._stats.pop(str(self.root / rel_file), None)
+            self._blobs.pop(rel_file, None)
+        # A path can vanish and come back (e.g. an editor replacing a file)
+        return added - removed, removed - added
+
+    def walk(self) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        Iterate the indexed tree top-down, mirroring os.walk.
+
+        Yields (rel_dir, dirnames, filenames). As with os.walk, removing
+        entries from dirnames prevents descending into them.
+        """
+        pending = ['.']
+        while pending:
+            rel_dir = pending.pop()
+            entry = self.dirs.get(rel_dir)
+            if entry is None:
+                continue
+            dirnames = list(entry[0])
+            yield rel_dir, dirnames, entry[1]
+            # Reverse so directories are visited in listed order
+            for name in reversed(dirnames):
+                pending.append(join_rel(rel_dir, name))
+
+    def iter_rel_files(self) -> Iterator[str]:
+        """
+        Iterate every indexed file as a path relative to the root (top-down, in walk order).
+
+        Yields:
+            Relative file paths
+        """
+        for rel_dir, _, filenames in self.walk():
+            for filename in filenames:
+                yield join_rel(rel_dir, filename)
+
+    def rel_files(self) -> List[str]:
+        """
+        Get every indexed file as a path relative to the root.
+
+        Returns:
+            List of relative file paths
+        """
+        return list(self.iter_rel_files())
+
+    def all_files(self) -> List[Path]:
+        """
+        Get every indexed file as an absolute path.
+
+        Returns:
+            List of all file paths
+        """
+        return [self.root / rel_file for rel_file in self.rel_files()]
+
+    def files_in(self, rel_dir: str) -> FrozenSet[str]:
+        """
+        Get the set of file names directly inside a directory.
+
+        Args:
+            rel_dir: Directory relative to the index root
+
+        Returns:
+            Frozen set of file names (empty if the directory is not indexed)
+        """
+        file_set = self._file_sets.get(rel_dir)
+        if file_set is None:
+            entry = self.dirs.get(rel_dir)
+            file_set = frozenset(entry[1]) if entry else frozenset()
+            self._file_sets[rel_dir] = file_set
+        return file_set
+
+    def relative(self, path: Path) -> Optional[str]:
+        """
+        Convert an absolute path to a path relative to the index root.
+
+        Args:
+            path: Absolute path
+
+        Returns:
+            Relative path, or None if the path is outside the root
+        """
+        rel = os.path.relpath(os.path.normpath(str(path)), str(self.root))
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            return None
+        return rel
+
+    def is_file(self, path: Path) -> bool:
+        """Check whether an absolute path is an indexed file."""
+        rel = self.relative(path)
+        if rel is None or rel == '.':
+            return False
+        rel_dir, name = os.path.split(rel)
+        return name in self.files_in(rel_dir or '.')
+
+    def is_dir(self, path: Path) -> bool:
+        """Check whether an absolute path is an indexed directory."""
+        rel = self.relative(path)
+        return rel is not None and rel in self.dirs
+
+    def blob(self, rel_file: str) -> Optional[str]:
+        """
+        Get the git blob ID of a file, a key of its content.
+
+        Args:
+            rel_file: Path relative to the root
+
+        Returns:
+            Blob ID from the git index, or None if the index was walked or the
+            file is untracked or modified
+        """
+        return self._blobs.get(rel_file)
+
+    def stat(self, path: Path) -> Optional[os.stat_result]:
+        """
+        Get the (memoized) stat result of a file.
+
+        Args:
+            path: Absolute path of the file
+
+        Returns:
+            stat result, or None if the file cannot be stat'ed
+        """
+        key = str(path)
+        result = self._stats.get(key)
+        if result is None:
+            self.stat_calls += 1
+            try:
+                result = os.stat(key)
+            except OSError:
+                return None
+            self._stats[key] = result
+        return result
@@ -0,0 +1,105 @@
+"""
+Ignore Rules
+
+Directories and files an analysis never reports, read from ignore.json
+next to this module (shared by find-unused-files.py, find-untested-files.py
+and `python3 -m jisaku_scan`).
+
+ignore.json has one section per analysis ('unused', 'orphaned_tests',
+'unused_exports', 'affected_tests', 'unused_assets', 'component_usage',
+'untested'), each listing ignored_dirs, ignored_files and their temporary
+counterparts (to be revisited), with the reason for each entry. Directory
+rules are compiled into a single anchored regex and applied while walking
+the file index by removing matches from dirnames, so ignored subtrees are
+never descended into.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from jisaku_scan.fs_index import FileIndex, join_rel
+
+
+IGNORE_FILE = Path(__file__).resolve().parent / 'ignore.json'
+
+# Keys of an analysis section, each mapping paths to the reason they are ignored
+DIR_KEYS = ['ignored_dirs', 'temp_ignored_dirs']
+FILE_KEYS = ['ignored_files', 'temp_ignored_files']
+
+
+class IgnoreRules:
+    """
+    Compiled ignore rules of one analysis.
+
+    Attributes:
+        dirs: Ignored directories (relative, with everything below them)
+        files: Ignored files (relative paths)
+    """
+
+    def __init__(self, dirs: Iterable[str] = (), files: Iterable[str] = ()):
+        """
+        Compile the rules.
+
+        Args:
+            dirs: Ignored directories relative to the root ('/'-separated)
+            files: Ignored files relative to the root ('/'-separated)
+        """
+        self.dirs = frozenset(os.path.normpath(rel_dir) for rel_dir in dirs)
+        self.files = frozenset(os.path.normpath(rel_file) for rel_file in files)
+        # One alternation anchored at the start, ending at a separator or the
+        # end, so 'src/db' matches 'src/db/x' but not 'src/dbx'
+        self._dir_pattern = re.compile(
+            '(?:' + '|'.join(re.escape(rel_dir) for rel_dir in sorted(self.dirs)) + ')(?:'
+            + re.escape(os.sep) + '|$)'
+        ) if self.dirs else None
+
+    def ignores_dir(self, rel_dir: str) -> bool:
+        """Check whether a directory (relative to the root) is ignored, with its subtree."""
+        return self._dir_pattern is not None and self._dir_pattern.match(rel_dir) is not None
+
+    def walk(self, index: FileIndex) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        Walk the file index without descending into ignored directories.
+
+        Args:
+            index: File index of the root
+
+        Yields:
+            (rel_dir, dirnames, filenames) as FileIndex.walk, ignored directories left out
+        """
+        for rel_dir, dirnames, filenames in index.walk():
+            if self._dir_pattern is not None:
+                dirnames[:] = [name for name in dirnames if not self.ignores_dir(join_rel(rel_dir, name))]
+            yield rel_dir, dirnames, filenames
+
+
+@lru_cache(maxsize=None)
+def load_ignore_rules(analysis: str, config_path: Path = IGNORE_FILE) -> IgnoreRules:
+    """
+    Read and compile the ignore rules of an analysis.
+
+    Args:
+        analysis: Section of the config ('unused', 'orphaned_tests', 'unused_exports',
+            'affected_tests', 'unused_assets', 'component_usage' or 'untested')
+        config_path: Ignore config file
+
+    Returns:
+        Compiled IgnoreRules
+
+    Raises:
+        ValueError: If the file cannot be read or the section is missing or malformed
+    """
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            section = json.load(f)[analysis]
+        dirs = [rel_dir for key in DIR_KEYS for rel_dir in section.get(key, {})]
+        files = [rel_file for key in FILE_KEYS for rel_file in section.get(key, {})]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"invalid ignore config '{config_path}' ({analysis}): {e!r}") from e
+    if not all(isinstance(path, str) for path in dirs + files):
+        raise ValueError(f"invalid ignore config '{config_path}' ({analysis}): paths must be strings")
+    return IgnoreRules(dirs, files)
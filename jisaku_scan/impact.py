@@ -0,0 +1,114 @@
+"""
+Test Impact
+
+Maps changed files to the vitest test files that can observe the change:
+every .test.ts or .spec.ts file that imports a changed file, directly or
+through barrels, composables and intermediate components.
+
+The module graph of the unused files analysis is built with the test files
+added as nodes (sharing its parse cache), and the changed files are followed
+backwards over import edges. A change to a global test input (vitest.config.ts,
+its setupFiles, tsconfig.json, package.json, the lockfile) or to a file
+those import affects every test.
+
+Deleted files have no node left in the graph; their importers are found
+through the edits that removed the imports. Test files in the
+'affected_tests' ignored directories of jisaku_scan/ignore.json (not run by
+vitest) are never returned.
+"""
+
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from jisaku_scan.cache import open_parse_cache
+from jisaku_scan.ignore import load_ignore_rules
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.stats import STATS
+from jisaku_scan.unused import build_module_graph, extract_imports
+
+
+# Suffixes of test files, as matched by make test-changed before it used the graph
+TEST_SUFFIXES = ('.test.ts', '.spec.ts')
+
+# Files every test depends on without importing them
+GLOBAL_TEST_INPUTS = ['vitest.config.ts', 'tsconfig.json', 'package.json', 'pnpm-lock.yaml']
+
+# setupFiles: ['test/setup.ts', ...] in vitest.config.ts
+SETUP_FILES_PATTERN = re.compile(r'\bsetupFiles\s*:\s*\[([^\]]*)\]')
+STRING_PATTERN = re.compile(r'''['"]([^'"\n]+)['"]''')
+
+
+def read_setup_files(root_dir: Path) -> List[str]:
+    """
+    Read the setupFiles of vitest.config.ts.
+
+    Args:
+        root_dir: Project root
+
+    Returns:
+        Setup files relative to the root (empty if there are none or no config)
+    """
+    try:
+        with open(Path(root_dir) / 'vitest.config.ts', 'r', encoding='utf-8') as f:
+            match = SETUP_FILES_PATTERN.search(f.read())
+    except (OSError, UnicodeDecodeError):
+        return []
+    if match is None:
+        return []
+    return [str(Path(path)) for path in STRING_PATTERN.findall(match.group(1))]
+
+
+def is_test_file(rel_file: str) -> bool:
+    """Check if a file is a test file (.test.ts or .spec.ts)."""
+    return rel_file.endswith(TEST_SUFFIXES)
+
+
+def find_affected_tests(root_dir: Path, changed: Iterable[str], scan: Optional[ProjectScan] = None,
+                        use_cache: bool = True, jobs: int = 1) -> List[str]:
+    """
+    Find the test files that import any of the changed files, transitively.
+
+    Args:
+        root_dir: Root directory
+        changed: Changed, added or deleted files relative to root_dir
+        scan: Shared scan of root_dir (built if not given)
+        use_cache: Reuse and update the on-disk parse cache
+        jobs: Maximum number of worker processes for parsing
+
+    Returns:
+        Sorted test file paths relative to root_dir
+
+    Raises:
+        ValueError: If the ignore configuration is invalid
+    """
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    root_dir = scan.root
+    index = scan.index
+    rules = load_ignore_rules('affected_tests')
+    tests = [
+        rel_file for rel_file in index.rel_files()
+        if is_test_file(rel_file) and rel_file not in rules.files
+        and not rules.ignores_dir(str(Path(rel_file).parent))
+    ]
+    changed = {str(Path(rel_file)) for rel_file in changed}
+    if not changed:
+        return []
+
+    # Same extractor as the unused files analysis, so the non-test files come
+    # from its cache entries
+    with open_parse_cache(root_dir, extract_imports, index.rel_files(), use_cache) as cache:
+        graph = build_module_graph(root_dir, index, scan.barrels, cache, jobs, scan.resolver, include_tests=True)
+
+    with STATS.phase('impact'):
+        global_inputs = [*GLOBAL_TEST_INPUTS, *read_setup_files(root_dir)]
+        global_nodes = {str(root_dir / rel_file) for rel_file in global_inputs}
+        dependents = graph.dependents_of(str(root_dir / rel_file) for rel_file in changed)
+        if changed.intersection(global_inputs) or not dependents.isdisjoint(global_nodes):
+            affected = tests
+        else:
+            affected = [rel_file for rel_file in tests if str(root_dir / rel_file) in dependents]
+
+    STATS.collect(scan, cache)
+    return sorted(affected)
@@ -0,0 +1,194 @@
+"""
+Incremental Scanning
+
+Git helpers for re-evaluating only the part of the tree an edit can affect.
+
+The dependency edges of every scanned file are recorded in the parse cache
+and loaded into a DependencyGraph (see jisaku_scan.graph). These helpers
+list what changed relative to a git ref and read what changed files
+looked like at that ref. git_list_files reads the file list of the work
+tree from the local git index for the file index (see jisaku_scan.fs_index),
+and git_ignored tells which paths the ignore rules exclude.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Index entry modes: submodules (gitlinks) are not part of the tree
+GITLINK_MODE = '160000'
+SYMLINK_MODE = '120000'
+
+
+def git_changed_files(root_dir: Path, ref: str) -> Set[str]:
+    """
+    List files changed relative to a git ref, plus untracked files.
+
+    Includes committed, staged and unstaged changes (and deletions).
+
+    Args:
+        root_dir: Directory to run git in; paths are returned relative to it
+        ref: Git ref to compare the working tree against (e.g. 'HEAD', 'main')
+
+    Returns:
+        Set of relative file paths
+
+    Raises:
+        ValueError: If git fails (not a repository, unknown ref, ...)
+    """
+    commands = [
+        ['git', 'diff', '--name-only', '--relative', ref, '--'],
+        ['git', 'ls-files', '--others', '--exclude-standard'],
+    ]
+    changed: Set[str] = set()
+    for command in commands:
+        try:
+            result = subprocess.run(command, cwd=root_dir, capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, 'stderr', '') or str(e)
+            raise ValueError(f"git failed for ref '{ref}': {detail.strip()}") from e
+        changed.update(line for line in result.stdout.splitlines() if line)
+    return changed
+
+
+def git_show_files(root_dir: Path, ref: str, rel_paths: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Read the content of files at a git ref with a single git process.
+
+    Args:
+        root_dir: Directory to run git in; paths are relative to it
+        ref: Git ref to read from
+        rel_paths: Relative file paths
+
+    Returns:
+        Mapping of path -> content (None if missing at the ref or not UTF-8)
+    """
+    if not rel_paths:
+        return {}
+    request = ''.join(f'{ref}:./{rel_path}\n' for rel_path in rel_paths).encode()
+    try:
+        result = subprocess.run(['git', 'cat-file', '--batch'], cwd=root_dir, input=request,
+                                capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return {rel_path: None for rel_path in rel_paths}
+
+    # Output per object: "<sha> blob <size>\n<content>\n" or "<name> missing\n"
+    contents: Dict[str, Optional[str]] = {}
+    output = result.stdout
+    pos = 0
+    for rel_path in rel_paths:
+        header_end = output.index(b'\n', pos)
+        header = output[pos:header_end].split()
+        pos = header_end + 1
+        if len(header) == 3 and header[1] == b'blob':
+            size = int(header[2])
+            try:
+                contents[rel_path] = output[pos:pos + size].decode('utf-8')
+            except UnicodeDecodeError:
+                contents[rel_path] = None
+            pos += size + 1
+        else:
+            contents[rel_path] = None
+    return contents
+
+
+def _git_ls_files(root_dir: Path, options: List[str]) -> Optional[List[str]]:
+    """Run git ls-files -z with options in root_dir; None if git fails."""
+    try:
+        result = subprocess.run(['git', 'ls-files', '-z', *options], cwd=root_dir, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    try:
+        return [entry for entry in result.stdout.decode('utf-8').split('\0') if entry]
+    except UnicodeDecodeError:
+        return None
+
+
+def git_ignored(root_dir: Path, rel_paths: List[str]) -> Optional[Set[str]]:
+    """
+    Find which of some paths git ignores (.gitignore, info/exclude, core.excludesFile).
+
+    Tracked files are never ignored. A directory path matches directory
+    patterns ('dist/') whether or not it ends with a separator.
+
+    Args:
+        root_dir: Directory inside a git work tree; paths are relative to it
+        rel_paths: Relative paths ('.' for root_dir itself)
+
+    Returns:
+        The ignored paths among rel_paths, or None if git fails
+    """
+    if not rel_paths:
+        return set()
+    request = ''.join(rel_path + '\0' for rel_path in rel_paths).encode('utf-8')
+    try:
+        result = subprocess.run(['git', 'check-ignore', '-z', '--stdin'], cwd=root_dir, input=request,
+                                capture_output=True)
+    except OSError:
+        return None
+    # Exit code 1: none of the paths is ignored
+    if result.returncode not in (0, 1):
+        return None
+    try:
+        return {entry for entry in result.stdout.decode('utf-8').split('\0') if entry}
+    except UnicodeDecodeError:
+        return None
+
+
+def git_list_files(root_dir: Path) -> Optional[Tuple[Dict[str, Optional[str]], List[str]]]:
+    """
+    List the files of the work tree below root_dir from the local git index.
+
+    Tracked files come with the blob ID recorded in the index, unless they
+    are modified in the work tree (or symlinks); files deleted from the
+    work tree are left out. Untracked files that are not ignored are listed
+    too. Untracked directories (and tracked symlinks to directories) are
+    returned whole, for the caller to walk.
+
+    Args:
+        root_dir: Directory inside a git work tree; paths are relative to it
+
+    Returns:
+        Tuple of (relative file path -> blob ID or None, relative directories
+        to walk), or None if root_dir is not in a git work tree or git fails
+    """
+    staged = _git_ls_files(root_dir, ['--stage'])
+    changed = _git_ls_files(root_dir, ['-t', '--modified', '--deleted'])
+    others = _git_ls_files(root_dir, ['--others', '--exclude-standard', '--directory'])
+    if not staged or changed is None or others is None or './' in others:
+        return None
+
+    files: Dict[str, Optional[str]] = {}
+    dirs = []
+    for entry in staged:
+        # "<mode> <blob> <stage>\t<path>"
+        info, _, path = entry.partition('\t')
+        mode, blob, stage = info.split(' ')
+        if mode == GITLINK_MODE:
+            continue
+        rel_file = os.path.normpath(path)
+        if mode == SYMLINK_MODE:
+            if os.path.isdir(os.path.join(root_dir, rel_file)):
+                dirs.append(rel_file)
+                continue
+            blob = None
+        # Unmerged paths have one entry per stage and no single blob
+        files[rel_file] = blob if stage == '0' and rel_file not in files else None
+
+    for entry in changed:
+        # "C <path>" for modified files, "R <path>" for deleted ones
+        tag, _, path = entry.partition(' ')
+        rel_file = os.path.normpath(path)
+        if tag == 'R':
+            files.pop(rel_file, None)
+        elif rel_file in files:
+            files[rel_file] = None
+
+    for path in others:
+        if path.endswith('/'):
+            dirs.append(os.path.normpath(path))
+        else:
+            files[os.path.normpath(path)] = None
+    return files, dirs
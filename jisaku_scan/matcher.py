@@ -0,0 +1,99 @@
+"""
+Multi-Pattern Matching
+
+Finds which of many literal strings occur in a text in a single pass.
+
+The literals are merged into a trie and compiled into one regex whose
+alternations follow the trie: at each position of the text the engine
+follows one branch per character, sharing the common prefixes of all
+literals as an Aho-Corasick automaton does, instead of trying every
+literal in turn (as a flat alternation or one search per literal would).
+The scan itself runs in the C regex engine.
+
+A regex starting with a lookbehind is tried at every position of the
+text, so a boundary before the literals is checked after their first
+character instead: the engine then only stops where a literal can start.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, Set
+
+
+class LiteralMatcher:
+    """
+    Compiled set of literals, optionally framed by boundary assertions.
+
+    Attributes:
+        pattern: Compiled regex; group 1 is the matched literal
+        binary: Whether the pattern matches bytes
+    """
+
+    def __init__(self, literals: Iterable[str], not_after: str = '', after: str = '', binary: bool = False):
+        """
+        Compile the literals.
+
+        Args:
+            literals: Strings to find (empty strings are ignored)
+            not_after: Character class (e.g. r'[\w-]') the character before a
+                literal must not belong to
+            after: Regex (usually a lookahead) required after a literal
+            binary: Match bytes (UTF-8) instead of str
+        """
+        trie: Dict[str, Any] = {}
+        for literal in literals:
+            if not literal:
+                continue
+            if binary:
+                # One trie level per byte (latin-1 maps each byte to one character)
+                literal = literal.encode('utf-8').decode('latin-1')
+            node = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[''] = True
+        # A regex that never matches when there is nothing to find
+        guard = f'(?<!{not_after}(?s:.))' if not_after else ''
+        source = f'({_trie_regex(trie, guard)}){after}' if trie else '(?!)'
+        self.binary = binary
+        self.pattern = re.compile(source.encode('latin-1') if binary else source)
+
+    def finditer(self, text: Any) -> Iterator[str]:
+        """
+        Iterate the literals found in a text, left to right, without overlaps.
+
+        At a given position the longest literal satisfying the boundaries wins.
+
+        Args:
+            text: str, or bytes (or any buffer, e.g. an mmap) for a binary matcher
+
+        Yields:
+            Matched literals (as str)
+        """
+        for match in self.pattern.finditer(text):
+            literal = match.group(1)
+            yield literal.decode('utf-8') if self.binary else literal
+
+    def matches(self, text: Any) -> Set[str]:
+        """Get the set of literals found in a text (see finditer)."""
+        return set(self.finditer(text))
+
+
+def _trie_regex(node: Dict[str, Any], guard: str = '') -> str:
+    """
+    Build the regex of a trie node: its branches as an alternation, optional if a literal ends here.
+
+    Args:
+        node: Trie node (character -> child node; '' marks the end of a literal)
+        guard: Assertion placed after the first character of each branch (root only)
+
+    Returns:
+        Regex source
+    """
+    branches = [re.escape(char) + guard + _trie_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    if '' in node:
+        # Greedy, so the longer literal is tried first
+        return '(?:' + '|'.join(branches) + ')?'
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
@@ -0,0 +1,74 @@
+"""
+Parallel Mapping
+
+Ordered map over a process pool with a serial fallback.
+
+Import extraction is CPU-bound regex work, so threads would serialize on
+the GIL; a process pool is used instead. Results come back in input order,
+which keeps the scanners' output deterministic, and are yielded as they
+arrive so callers can consume them without holding all of them.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, List, Sequence, TypeVar
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Below this many items per worker, pool startup and pickling cost more than they save
+MIN_ITEMS_PER_JOB = 250
+
+
+def default_jobs() -> int:
+    """Get the default number of workers (the CPU count)."""
+    return os.cpu_count() or 1
+
+
+def imap_ordered(func: Callable[[T], R], items: Sequence[T], jobs: int) -> Iterator[R]:
+    """
+    Apply func to every item, in a process pool when it pays off, yielding results in order.
+
+    Falls back to a plain loop for a single job, for small inputs, or when
+    a pool cannot be started (e.g. no semaphore support in a sandbox); if
+    the pool breaks midway, the remaining items are processed serially.
+
+    Args:
+        func: Picklable (module-level) function
+        items: Picklable inputs
+        jobs: Maximum number of worker processes
+
+    Yields:
+        Results in the same order as items
+    """
+    done = 0
+    workers = min(jobs, len(items) // MIN_ITEMS_PER_JOB)
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(items) // (workers * 4))
+                for result in pool.map(func, items, chunksize=chunksize):
+                    done += 1
+                    yield result
+                return
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+    for item in items[done:]:
+        yield func(item)
+
+
+def map_ordered(func: Callable[[T], R], items: Sequence[T], jobs: int) -> List[R]:
+    """
+    Apply func to every item, in a process pool when it pays off.
+
+    Args:
+        func: Picklable (module-level) function
+        items: Picklable inputs
+        jobs: Maximum number of worker processes
+
+    Returns:
+        Results in the same order as items (see imap_ordered)
+    """
+    return list(imap_ordered(func, items, jobs))
@@ -0,0 +1,44 @@
+"""
+Project Scan
+
+The state shared by every analysis of one project tree.
+
+Walking the tree, loading tsconfig paths and detecting barrels happen once
+per process; the unused and untested analyses both read from the same
+ProjectScan when run together (`python3 -m jisaku_scan check`). Inside a
+git work tree the file list comes from the git index (see FileIndex).
+"""
+
+from pathlib import Path
+
+from jisaku_scan.barrels import BarrelIndex
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.resolver import ImportResolver
+from jisaku_scan.stats import STATS
+
+
+class ProjectScan:
+    """
+    File index, import resolver and barrel index of a project root.
+
+    Attributes:
+        root: Absolute root directory
+        index: FileIndex of the tree
+        resolver: ImportResolver answering from the index
+        barrels: BarrelIndex resolving re-exports with the resolver
+    """
+
+    def __init__(self, root_dir: Path, use_git: bool = True):
+        """
+        Walk root_dir once and set up the shared indexes.
+
+        Args:
+            root_dir: Root directory of the project
+            use_git: List the files from the git index when root_dir is in a
+                git work tree
+        """
+        self.root = Path(root_dir).resolve()
+        with STATS.phase('walk'):
+            self.index = FileIndex(self.root, use_git=use_git)
+            self.resolver = ImportResolver(self.root, self.index)
+        self.barrels = BarrelIndex(self.resolver.resolve)
@@ -0,0 +1,137 @@
+"""
+Vue Single-File Components
+
+Splits .vue files into their top-level blocks without parsing the template.
+
+Only `<script>` / `<script setup>` blocks can hold ES imports, so import
+extraction runs on those alone; large `<template>` and `<style scoped>`
+sections are skipped, and template text such as `@import-database="..."`
+can no longer be mistaken for an import. Style dependencies (`@import` in
+`<style>` and `<style src="...">`) are extracted separately.
+"""
+
+import re
+from typing import Dict, List, NamedTuple
+
+
+class SfcBlock(NamedTuple):
+    """
+    A top-level block of a single-file component.
+
+    Attributes:
+        tag: Lower-case tag name ('template', 'script', 'style' or a custom block)
+        attrs: Attributes of the opening tag (valueless attributes map to '')
+        content: Text between the opening and closing tags
+    """
+
+    tag: str
+    attrs: Dict[str, str]
+    content: str
+
+
+# Top-level HTML comment or opening tag
+TOP_LEVEL_PATTERN = re.compile(r'<!--[\s\S]*?(?:-->|\Z)|<([A-Za-z][\w-]*)(\s[^>]*)?>')
+ATTRIBUTE_PATTERN = re.compile(r'''([^\s=/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?''')
+# Nested <template> tags (v-slot, v-if groups) inside the template block
+TEMPLATE_TAG_PATTERN = re.compile(r'<(/?)template\b([^>]*)>', re.IGNORECASE)
+
+# CSS @import 'x' / @import "x" / @import url(x), ignoring comments
+STYLE_IMPORT_PATTERN = re.compile(
+    r'''/\*[\s\S]*?(?:\*/|\Z)|@import\s+(?:url\(\s*)?(['"]?)([^'"()\s;]+)\1'''
+)
+
+
+def parse_attributes(text: str) -> Dict[str, str]:
+    """
+    Parse the attributes of an opening tag.
+
+    Args:
+        text: Text between the tag name and '>'
+
+    Returns:
+        Mapping of attribute name -> value
+    """
+    attrs = {}
+    for match in ATTRIBUTE_PATTERN.finditer(text):
+        name, double, single, bare = match.groups()
+        attrs[name.lower()] = next((value for value in (double, single, bare) if value is not None), '')
+    return attrs
+
+
+def _block_end(source: str, tag: str, pos: int) -> int:
+    """Find where the content of a block opened before pos ends (-1 if unclosed)."""
+    if tag != 'template':
+        # Script and style content is raw text: the first closing tag ends it
+        closing = re.compile(r'</' + re.escape(tag) + r'\s*>', re.IGNORECASE).search(source, pos)
+        return closing.start() if closing else -1
+
+    depth = 1
+    for match in TEMPLATE_TAG_PATTERN.finditer(source, pos):
+        if match.group(1):
+            depth -= 1
+            if depth == 0:
+                return match.start()
+        elif not match.group(2).rstrip().endswith('/'):
+            depth += 1
+    return -1
+
+
+def split_sfc(source: str) -> List[SfcBlock]:
+    """
+    Split a single-file component into its top-level blocks.
+
+    Args:
+        source: Content of a .vue file
+
+    Returns:
+        Blocks in source order
+    """
+    blocks: List[SfcBlock] = []
+    pos = 0
+    while True:
+        match = TOP_LEVEL_PATTERN.search(source, pos)
+        if match is None:
+            break
+        if match.group(1) is None:
+            # HTML comment
+            pos = match.end()
+            continue
+
+        tag = match.group(1).lower()
+        attr_text = match.group(2) or ''
+        if attr_text.rstrip().endswith('/'):
+            # Self-closing, e.g. <style src="./theme.css" />
+            blocks.append(SfcBlock(tag, parse_attributes(attr_text.rstrip()[:-1]), ''))
+            pos = match.end()
+            continue
+
+        end = _block_end(source, tag, match.end())
+        if end == -1:
+            blocks.append(SfcBlock(tag, parse_attributes(attr_text), source[match.end():]))
+            break
+        blocks.append(SfcBlock(tag, parse_attributes(attr_text), source[match.end():end]))
+        # Continue after the closing tag
+        pos = source.index('>', end) + 1
+    return blocks
+
+
+def style_references(blocks: List[SfcBlock]) -> List[str]:
+    """
+    Extract the stylesheets referenced from `<style>` blocks.
+
+    Args:
+        blocks: Result of split_sfc
+
+    Returns:
+        Specifiers from `<style src="...">` and CSS `@import` rules
+    """
+    references = []
+    for block in blocks:
+        if block.tag != 'style':
+            continue
+        if block.attrs.get('src'):
+            references.append(block.attrs['src'])
+        for match in STYLE_IMPORT_PATTERN.finditer(block.content):
+            if match.group(2):
+                references.append(match.group(2))
+    return references
@@ -0,0 +1,211 @@
+"""
+Sharded Scan
+
+Splits the parse and resolve work of the unused files analysis across CI
+machines. `python3 -m jisaku_scan check --shard I/N` extracts and resolves
+imports only for the files of shard I (of N) and writes their edges as a
+partial graph; `python3 -m jisaku_scan merge` reads the N partial graphs
+and reports unused, orphaned-test and untested files exactly as a
+single-machine `check` on the same tree would.
+
+Files are assigned to shards by a CRC-32 of their '/'-separated relative
+path, so every machine computes the same partition without coordination
+and a file stays in its shard as the tree grows. Mark-and-sweep needs the
+whole graph, so it runs at the merge; the orphaned-test and untested
+analyses only read the file index and run there too.
+
+A partial graph is gzip-compressed JSON with an interned path table:
+
+    {"format": 1, "shard": [I, N], "tree": <tree signature>,
+     "extractor": <name>, "paths": [...],
+     "nodes": [[path id, [used ids], [reexports ids], [styles ids],
+                [unresolved ids]], ...]}
+
+The tree signature (see tree_signature) lets the merge refuse partial
+graphs of another checkout, so partial graphs must be kept outside the
+scanned tree: `check --shard` only writes to an explicit --shard-out file
+and refuses one inside the root.
+"""
+
+import gzip
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from jisaku_scan.cache import tree_signature
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.graph import REEXPORTS, STYLES, UNRESOLVED, USED, DependencyGraph
+
+
+# Version of the partial graph format
+PARTIAL_FORMAT = 1
+
+# Edge kinds of a node entry, in order
+PARTIAL_EDGE_KINDS = [USED, REEXPORTS, STYLES, UNRESOLVED]
+
+# Keys every partial graph has besides 'format'
+PARTIAL_KEYS = ['shard', 'tree', 'extractor', 'paths', 'nodes']
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification.
+
+    Args:
+        spec: 'I/N' with 1 <= I <= N (as vitest --shard)
+
+    Returns:
+        Tuple of (I, N)
+
+    Raises:
+        ValueError: If the specification is malformed or out of range
+    """
+    index, sep, count = spec.partition('/')
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        shard = None
+    if not sep or shard is None or not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f"invalid shard '{spec}' (expected I/N with 1 <= I <= N)")
+    return shard
+
+
+def in_shard(rel_file: str, shard: Tuple[int, int]) -> bool:
+    """
+    Check whether a file belongs to a shard.
+
+    Args:
+        rel_file: Path relative to the root
+        shard: (I, N) as returned by parse_shard
+
+    Returns:
+        True if the file is parsed by shard I of N
+    """
+    index, count = shard
+    key = rel_file.replace(os.sep, '/').encode('utf-8')
+    return zlib.crc32(key) % count == index - 1
+
+
+def write_partial(out_path: Path, graph: DependencyGraph, root_dir: Path, index: FileIndex,
+                  shard: Tuple[int, int], extractor: str) -> None:
+    """
+    Write the edges a shard resolved as a partial graph.
+
+    Args:
+        out_path: File to write (gzip-compressed JSON)
+        graph: Module graph holding the nodes of the shard only
+        root_dir: Root directory the paths are made relative to
+        index: File index of the root (for the tree signature)
+        shard: (I, N) of the shard
+        extractor: Name of the import extractor used
+    """
+    paths: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        # Paths are stored relative to the root; unresolved specifiers as they are
+        return paths.setdefault(value, len(paths))
+
+    def rel(node: str) -> str:
+        return os.path.relpath(node, root_dir)
+
+    nodes = []
+    for node in sorted(graph.edges):
+        edges = graph.edges[node]
+        entry = [intern(rel(node))]
+        for kind in PARTIAL_EDGE_KINDS:
+            values = edges.get(kind, ())
+            entry.append([intern(value if kind == UNRESOLVED else rel(value)) for value in sorted(values)])
+        nodes.append(entry)
+
+    content = {
+        'format': PARTIAL_FORMAT,
+        'shard': list(shard),
+        'tree': tree_signature(index.rel_files()),
+        'extractor': extractor,
+        'paths': list(paths),
+        'nodes': nodes,
+    }
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(out_path, 'wt', encoding='utf-8') as f:
+        json.dump(content, f, separators=(',', ':'))
+
+
+def read_partial(partial_path: Path) -> dict:
+    """
+    Read a partial graph.
+
+    Args:
+        partial_path: File written by write_partial
+
+    Returns:
+        Decoded content
+
+    Raises:
+        ValueError: If the file cannot be read or has another format
+    """
+    try:
+        with gzip.open(partial_path, 'rt', encoding='utf-8') as f:
+            content = json.load(f)
+    except (OSError, EOFError, ValueError) as e:
+        raise ValueError(f"cannot read partial graph '{partial_path}': {e}") from e
+    if not isinstance(content, dict) or content.get('format') != PARTIAL_FORMAT:
+        raise ValueError(f"'{partial_path}' is not a partial graph of format {PARTIAL_FORMAT}")
+    if not all(key in content for key in PARTIAL_KEYS):
+        raise ValueError(f"'{partial_path}' is missing one of {', '.join(PARTIAL_KEYS)}")
+    return content
+
+
+def merge_partials(partial_paths: Iterable[Path], root_dir: Path, index: FileIndex) -> DependencyGraph:
+    """
+    Combine the partial graphs of every shard into the module graph.
+
+    Args:
+        partial_paths: Files written by the N shards of one run
+        root_dir: Root directory of the checkout being merged
+        index: File index of the root
+
+    Returns:
+        DependencyGraph equal to the one a single-machine run builds
+
+    Raises:
+        ValueError: If a partial graph cannot be read, a shard is missing or
+            repeated, or the shards scanned another tree or used different
+            extractors
+    """
+    tree = tree_signature(index.rel_files())
+    graph = DependencyGraph()
+    seen: Dict[int, Path] = {}
+    count = None
+    extractors = set()
+    for partial_path in partial_paths:
+        content = read_partial(partial_path)
+        shard_index, shard_count = content['shard']
+        if count is None:
+            count = shard_count
+        elif shard_count != count:
+            raise ValueError(f"'{partial_path}' is shard {shard_index}/{shard_count}, expected one of {count}")
+        if shard_index in seen:
+            raise ValueError(f"shard {shard_index}/{count} given twice ('{seen[shard_index]}', '{partial_path}')")
+        seen[shard_index] = partial_path
+        if content['tree'] != tree:
+            raise ValueError(f"'{partial_path}' was written for another file tree than '{root_dir}'")
+        extractors.add(content['extractor'])
+
+        paths: List[str] = content['paths']
+        for node_id, *values in content['nodes']:
+            edges = {}
+            for kind, ids in zip(PARTIAL_EDGE_KINDS, values):
+                if ids:
+                    edges[kind] = [paths[i] if kind == UNRESOLVED else str(root_dir / paths[i]) for i in ids]
+            graph.set_edges(str(root_dir / paths[node_id]), edges)
+
+    if count is None:
+        raise ValueError("no partial graphs given")
+    missing = sorted(set(range(1, count + 1)) - set(seen))
+    if missing:
+        raise ValueError(f"missing shards: {', '.join(f'{index}/{count}' for index in missing)}")
+    if len(extractors) > 1:
+        raise ValueError(f"shards used different import extractors: {', '.join(sorted(extractors))}")
+    return graph
@@ -0,0 +1,213 @@
+"""
+Scanner Statistics
+
+Per-phase wall time and hot-path counters, printed with --timings or
+written as JSON with --stats-json.
+
+Collection is off unless a command line flag enables it. Phases are timed
+with a context manager that does nothing while disabled, and counters are
+plain integers on the objects doing the work (FileIndex, ImportResolver,
+BarrelIndex, ParseCache) that are only read when the report is built, so
+a disabled run costs a few attribute increments at most.
+"""
+
+import json
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from jisaku_scan.cache import ParseCache
+    from jisaku_scan.scan import ProjectScan
+
+
+# Counter names and what they measure, in report order
+COUNTERS = {
+    'files_indexed': 'files in the file index',
+    'stat_calls': 'os.stat calls (memoized per file)',
+    'files_read': 'files read for import extraction',
+    'bytes_decoded': 'bytes decoded for import extraction',
+    'parse_reused': 'files read but unchanged by content hash',
+    'files_prefiltered': 'files read but skipped without decoding (no import/export bytes)',
+    'import_matches': 'import/export statements matched',
+    'asset_files_read': 'files searched for asset references',
+    'resolve_calls': 'specifier resolutions requested',
+    'resolve_memo_hits': 'resolutions answered from the memo',
+    'barrel_files_read': 'files read to parse re-exports',
+    'barrel_lookups': 'barrel name lookups',
+    'cache_hits': 'parse cache hits',
+    'cache_misses': 'parse cache misses',
+    'cache_blob_hits': 'parse cache hits by git blob ID (no stat)',
+}
+
+
+class _Phase:
+    """Context manager adding its wall time to a phase."""
+
+    def __init__(self, stats: 'Stats', name: str):
+        self.stats = stats
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.stats.phases[self.name] = self.stats.phases.get(self.name, 0.0) + elapsed
+
+
+class _NoPhase:
+    """Context manager used while collection is disabled."""
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+T = TypeVar('T')
+
+
+class Stats:
+    """
+    Phase timings and counters of one run.
+
+    Attributes:
+        enabled: Whether timings and counters are collected
+        phases: Phase name -> seconds, in the order phases first ran
+        counters: Counter name -> value
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def phase(self, name: str):
+        """
+        Time a block of code as a named phase (accumulates if entered again).
+
+        Args:
+            name: Phase name (e.g. 'walk', 'parse')
+
+        Returns:
+            Context manager
+        """
+        return _Phase(self, name) if self.enabled else _NO_PHASE
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterable[T]:
+        """
+        Time the work done producing each item of a generator as a named phase.
+
+        Unlike phase(), the consumer's work between items is not counted, so
+        a streaming stage can be timed apart from the stage consuming it.
+
+        Args:
+            name: Phase name
+            items: Iterable (typically a generator) to time
+
+        Returns:
+            The items, unchanged (the iterable itself while disabled)
+        """
+        return self._timed(name, iter(items)) if self.enabled else items
+
+    def _timed(self, name: str, items: Iterator[T]) -> Iterator[T]:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                elapsed = time.perf_counter() - start
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            yield item
+
+    def add(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name (see COUNTERS)
+            value: Amount to add
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def collect(self, scan: Optional['ProjectScan'] = None, cache: Optional['ParseCache'] = None) -> None:
+        """
+        Read the counters kept by the shared scan objects and the parse cache.
+
+        Args:
+            scan: ProjectScan whose index, resolver and barrels were used
+            cache: ParseCache used by the run
+        """
+        if not self.enabled:
+            return
+        if scan is not None:
+            self.counters['files_indexed'] = sum(len(entry[1]) for entry in scan.index.dirs.values())
+            self.counters['stat_calls'] = scan.index.stat_calls
+            self.counters['resolve_calls'] = scan.resolver.calls
+            self.counters['resolve_memo_hits'] = scan.resolver.memo_hits
+            self.counters['barrel_files_read'] = scan.barrels.files_read
+            self.counters['barrel_lookups'] = scan.barrels.lookups
+        if cache is not None:
+            self.counters['cache_hits'] = cache.hits
+            self.counters['cache_misses'] = cache.misses
+            self.counters['cache_blob_hits'] = cache.blob_hits
+
+    def to_json(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the statistics as JSON-serializable data.
+
+        Returns:
+            Dict with 'phases' (seconds) and 'counters'
+        """
+        return {
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'counters': {name: self.counters[name] for name in self._counter_names()},
+        }
+
+    def format_table(self) -> str:
+        """
+        Format the statistics as a table.
+
+        Returns:
+            Printable table of phase times (ms) and counters
+        """
+        total = sum(self.phases.values())
+        lines = ['Timings:']
+        for name, seconds in self.phases.items():
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"  {name:<16} {seconds * 1000:>10.1f} ms {share:>5.1f}%")
+        lines.append(f"  {'total':<16} {total * 1000:>10.1f} ms")
+        lines.append('Counters:')
+        for name in self._counter_names():
+            description = COUNTERS.get(name, '')
+            lines.append(f"  {name:<18} {self.counters[name]:>10}  {description}")
+        return '\n'.join(lines)
+
+    def _counter_names(self) -> List[str]:
+        known = [name for name in COUNTERS if name in self.counters]
+        return known + sorted(name for name in self.counters if name not in COUNTERS)
+
+    def write_json(self, path: Optional[str]) -> None:
+        """
+        Write the statistics as JSON.
+
+        Args:
+            path: File to write, or '-' for stdout
+        """
+        content = json.dumps(self.to_json(), indent=2) + '\n'
+        if path == '-':
+            print(content, end='')
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+
+# Statistics of the current process, enabled by --timings / --stats-json
+STATS = Stats()
@@ -0,0 +1,225 @@
+"""
+Synthetic Repositories
+
+Generates Vue/TS trees shaped like this repository, for benchmarking the
+scanners at sizes the real tree does not reach (1k, 10k, 100k files).
+
+Each feature module gets `components/` and `composables/` with colocated
+tests, a nested barrel per folder plus a module barrel, `@/` and relative
+imports, and a few cross-feature imports. Pages are lazily imported by the
+router, `src/legacy` holds frozen code, and a small share of files is dead
+(including dead clusters) so every analysis has findings to report.
+Output is deterministic for a given size and seed.
+"""
+
+import json
+import random
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+
+# Bump when the generated layout changes so cached trees are regenerated
+GENERATOR_VERSION = '1'
+
+# Named sizes accepted by the benchmark
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000}
+
+# Approximate number of files per feature module
+FILES_PER_FEATURE = 40
+
+MARKER_FILE = '.synthetic.json'
+
+WORDS = [
+    'kanji', 'radical', 'reading', 'meaning', 'stroke', 'vocabulary', 'component',
+    'position', 'classification', 'grade', 'jlpt', 'frequency', 'note', 'source',
+    'example', 'variant', 'form', 'group', 'tag', 'deck',
+]
+PARTS = ['Root', 'Section', 'Dialog', 'Item', 'List', 'Form', 'Header', 'Filter', 'Card', 'Editor']
+
+
+def _pascal(name: str) -> str:
+    return ''.join(part.capitalize() for part in name.split('-'))
+
+
+def _feature_names(count: int) -> List[str]:
+    names = []
+    for i in range(count):
+        base = f'{WORDS[i % len(WORDS)]}-{WORDS[(i // len(WORDS)) % len(WORDS)]}'
+        names.append(base if i < len(WORDS) ** 2 else f'{base}-{i}')
+    return names
+
+
+def _component(script: str, name: str, lines: int) -> str:
+    template = '\n'.join(
+        f'    <p class="{name}-line" :data-index="{i}">Line {i} of {name}, don\'t import this</p>'
+        for i in range(lines)
+    )
+    return (
+        f'<script setup lang="ts">\n{script}</script>\n\n'
+        f'<template>\n  <div class="{name}">\n{template}\n    <template v-if="true"><span /></template>\n'
+        f'  </div>\n</template>\n\n'
+        f'<style scoped>\n.{name} {{\n  display: flex;\n}}\n</style>\n'
+    )
+
+
+def _test(import_line: str, name: str) -> str:
+    return (
+        "import { describe, expect, it } from 'vitest'\n"
+        f'{import_line}\n\n'
+        f"describe('{name}', () => {{\n  it('exists', () => {{\n    expect({name}).toBeDefined()\n  }})\n}})\n"
+    )
+
+
+def generate_files(total_files: int, seed: int = 0) -> Dict[str, str]:
+    """
+    Build the content of a synthetic tree in memory.
+
+    Args:
+        total_files: Approximate number of files to generate
+        seed: Seed for the random choices (same seed, same tree)
+
+    Returns:
+        Mapping of relative path -> file content
+    """
+    rng = random.Random(seed)
+    files: Dict[str, str] = {}
+    # A tenth of the tree is legacy code, the rest feature modules
+    feature_count = max(2, round(total_files * 0.9 / FILES_PER_FEATURE))
+    features = _feature_names(feature_count)
+    # Components and composables per feature; each comes with a test, and
+    # every feature adds three barrels, a types file and a page
+    per_feature = (FILES_PER_FEATURE - 5) // 4
+
+    files['tsconfig.json'] = json.dumps({
+        'compilerOptions': {'baseUrl': '.', 'paths': {'@/*': ['src/*'], '@test/*': ['test/*']}},
+    }, indent=2) + '\n'
+    files['index.html'] = '<script type="module" src="/src/main.ts"></script>\n'
+    files['vite.config.ts'] = "import { defineConfig } from 'vite'\n\nexport default defineConfig({})\n"
+    files['src/main.ts'] = (
+        "import { createApp } from 'vue'\n\nimport App from './App.vue'\nimport router from './router'\n\n"
+        "createApp(App).use(router).mount('#app')\n"
+    )
+    files['src/App.vue'] = _component("import { RouterView } from 'vue-router'\n", 'app', 2)
+
+    # Shared components with a barrel
+    shared = [f'Shared{part}' for part in PARTS]
+    for name in shared:
+        files[f'src/shared/components/{name}.vue'] = _component("import { ref } from 'vue'\n", name.lower(), 8)
+        files[f'src/shared/components/{name}.test.ts'] = _test(f"import {name} from './{name}.vue'", name)
+    files['src/shared/components/index.ts'] = ''.join(
+        f"export {{ default as {name} }} from './{name}.vue'\n" for name in shared
+    )
+
+    routes = []
+    for position, feature in enumerate(features):
+        module = f'src/modules/{feature}'
+        pascal = _pascal(feature)
+        composables = []
+        for i in range(per_feature):
+            name = f'use-{feature}-{PARTS[i % len(PARTS)].lower()}{i // len(PARTS) or ""}'
+            export = 'use' + _pascal(name[4:])
+            composables.append((name, export))
+            body = "import { computed, ref } from 'vue'\n"
+            if i > 0:
+                body += f"import {{ {composables[i - 1][1]} }} from './{composables[i - 1][0]}'\n"
+            body += f'\n// {export} keeps {feature} state; see {name}.test.ts\n'
+            body += f'export function {export}() {{\n  const value = ref(0)\n'
+            body += '  const doubled = computed(() => value.value * 2)\n  return { value, doubled }\n}\n'
+            files[f'{module}/composables/{name}.ts'] = body
+            files[f'{module}/composables/{name}.test.ts'] = _test(f"import {{ {export} }} from './{name}'", export)
+        files[f'{module}/composables/index.ts'] = ''.join(
+            f"export {{ {export} }} from './{name}'\n" for name, export in composables
+        )
+
+        components = []
+        for i in range(per_feature):
+            name = f'{pascal}{PARTS[i % len(PARTS)]}{i // len(PARTS) or ""}'
+            components.append(name)
+            composable = composables[i][1]
+            script = (
+                f"import {{ {composable} }} from '../composables'\n"
+                "import { SharedHeader } from '@/shared/components'\n"
+            )
+            if i > 0:
+                script += f"import {components[i - 1]} from './{components[i - 1]}.vue'\n"
+            if position > 0 and rng.random() < 0.3:
+                other = features[rng.randrange(position)]
+                script += f"import {{ use{_pascal(other)}Root }} from '@/modules/{other}'\n"
+            script += f'\nconst state = {composable}()\n'
+            files[f'{module}/components/{name}.vue'] = _component(script, name.lower(), rng.randint(10, 60))
+            files[f'{module}/components/{name}.test.ts'] = _test(f"import {name} from './{name}.vue'", name)
+        files[f'{module}/components/index.ts'] = ''.join(
+            f"export {{ default as {name} }} from './{name}.vue'\n" for name in components
+        )
+
+        files[f'{module}/index.ts'] = (
+            "export * from './components'\nexport * from './composables'\n"
+            f"export {{ {composables[0][1]} as use{pascal}Root }} from './composables/{composables[0][0]}'\n"
+        )
+        files[f'{module}/{feature}-types.ts'] = f'export interface {pascal}Item {{\n  id: number\n}}\n'
+
+        page = f'{pascal}Page'
+        files[f'src/pages/{page}.vue'] = _component(
+            f"import {{ {components[-1]} }} from '@/modules/{feature}'\n", page.lower(), 4
+        )
+        routes.append(f"  {{ path: '/{feature}', component: () => import('@/pages/{page}.vue') }},")
+
+        # A dead cluster in every tenth feature: nothing reaches the first file
+        if position % 10 == 0:
+            files[f'{module}/components/{pascal}Dead.ts'] = (
+                f"import {{ x }} from './{pascal}DeadHelper'\nexport const y = x\n"
+            )
+            files[f'{module}/components/{pascal}DeadHelper.ts'] = 'export const x = 1\n'
+
+    files['src/router/index.ts'] = (
+        "import { createRouter, createWebHistory } from 'vue-router'\n\nimport { routes } from './routes'\n\n"
+        'export default createRouter({ history: createWebHistory(), routes })\n'
+    )
+    files['src/router/routes.ts'] = 'export const routes = [\n' + '\n'.join(routes) + '\n]\n'
+
+    # Frozen legacy code fills the tree up to the requested size
+    for i in range(max(1, total_files - len(files))):
+        files[f'src/legacy/area-{i // 50}/legacy-module-{i}.ts'] = (
+            f"import {{ ref }} from 'vue'\n\nexport const legacy{i} = ref({i})\n"
+        )
+    return files
+
+
+def generate_repo(out_dir: Path, total_files: int, seed: int = 0) -> int:
+    """
+    Write a synthetic tree, reusing an existing one generated with the same inputs.
+
+    Args:
+        out_dir: Directory to write into (created if missing)
+        total_files: Approximate number of files to generate
+        seed: Seed for the random choices
+
+    Returns:
+        Number of files in the tree
+
+    Raises:
+        ValueError: If out_dir exists, is not empty and was not generated here
+    """
+    out_dir = Path(out_dir)
+    marker = {'generator': GENERATOR_VERSION, 'files': total_files, 'seed': seed}
+    marker_path = out_dir / MARKER_FILE
+    try:
+        existing = json.loads(marker_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        existing = None
+    if existing is not None and existing.get('params') == marker:
+        return existing['count']
+    if existing is not None:
+        # Generated with other inputs: start over
+        shutil.rmtree(out_dir)
+    elif out_dir.exists() and any(out_dir.iterdir()):
+        raise ValueError(f"'{out_dir}' is not empty and was not created by the generator")
+
+    files = generate_files(total_files, seed)
+    for rel_path, content in files.items():
+        path = out_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    marker_path.write_text(json.dumps({'params': marker, 'count': len(files)}) + '\n', encoding='utf-8')
+    return len(files)
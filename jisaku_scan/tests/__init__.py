@@ -0,0 +1 @@
+"""Tests of the jisaku_scan scanners (run with make test-scan)."""
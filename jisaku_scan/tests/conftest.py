@@ -0,0 +1,124 @@
+"""
+Fixtures of the scanner tests: small project trees written to tmp_path.
+
+PROJECT_FILES is shaped like this repository (tsconfig aliases, a router
+with lazy pages, a component barrel, colocated tests) with one file of
+each kind the analyses report.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import pytest
+
+from jisaku_scan.stats import STATS, Stats
+
+
+PROJECT_FILES: Dict[str, str] = {
+    'tsconfig.json': '{\n  // Aliases as in the app\n  "compilerOptions": {"paths": {"@/*": ["./src/*"],},},\n}\n',
+    'index.html': '<link rel="icon" href="/favicon.svg" />\n<script type="module" src="/src/main.ts"></script>\n',
+    'public/favicon.svg': '<svg/>\n',
+    'public/unused.png': 'x' * 300,
+    'src/main.ts': (
+        "import { createApp } from 'vue'\n"
+        "import App from './App.vue'\n"
+        "import router from './router'\n"
+        "import './styles/base.css'\n"
+        "createApp(App).use(router).mount('#app')\n"
+    ),
+    'src/App.vue': '<template>\n  <RouterView />\n</template>\n',
+    'src/router/index.ts': (
+        "import { createRouter } from 'vue-router'\n"
+        "export default createRouter({ routes: [\n"
+        "  { path: '/', component: () => import('@/pages/HomePage.vue') },\n"
+        "] })\n"
+    ),
+    'src/pages/HomePage.vue': (
+        '<template>\n'
+        '  <BaseButton @click="go" />\n'
+        '  <base-card>{{ title }}</base-card>\n'
+        '</template>\n'
+        '<script setup lang="ts">\n'
+        "import type { CardProps } from '@/base/components'\n"
+        "import { BaseButton, BaseCard, BaseWidget } from '@/base/components'\n"
+        "import { formatHome } from '@/modules/home/home-utils'\n"
+        "const title = formatHome('home')\n"
+        'function go() {}\n'
+        '</script>\n'
+        '<style scoped src="./home.css"></style>\n'
+    ),
+    'src/pages/home.css': '.home { color: red; }\n',
+    'src/base/components/index.ts': (
+        "export { default as BaseButton } from './BaseButton.vue'\n"
+        "export { default as BaseCard } from './BaseCard.vue'\n"
+        "export { default as BaseWidget } from './BaseWidget.vue'\n"
+        "export type { CardProps } from './base-card-types'\n"
+    ),
+    'src/base/components/BaseButton.vue': '<template><button /></template>\n',
+    'src/base/components/BaseButton.test.ts': "import BaseButton from './BaseButton.vue'\n",
+    'src/base/components/BaseCard.vue': '<template><div><slot /></div></template>\n',
+    'src/base/components/BaseWidget.vue': '<template><span /></template>\n',
+    'src/base/components/base-card-types.ts': 'export interface CardProps { title: string }\n',
+    'src/modules/home/home-utils.ts': (
+        'export function formatHome(name: string): string {\n'
+        '  return name.toUpperCase()\n'
+        '}\n'
+        'export const unusedHelper = 1\n'
+    ),
+    'src/modules/home/home-utils.test.ts': "import { formatHome } from './home-utils'\n",
+    'src/modules/home/dead-code.ts': "import { formatHome } from './home-utils'\nexport const dead = formatHome('x')\n",
+    'src/modules/home/orphan.test.ts': "import { it } from 'vitest'\n",
+    'src/styles/base.css': "@import './tokens.css';\n",
+    'src/styles/tokens.css': ':root { --c: red; }\n',
+}
+
+
+def write_tree(root: Path, files: Dict[str, str]) -> Path:
+    """Write files (relative path -> content) below root and return root."""
+    for rel_file, content in files.items():
+        path = root / rel_file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    return root
+
+
+def rel_paths(root: Path, paths: Iterable[Path]) -> List[str]:
+    """Paths relative to root, as the reports print them."""
+    return [str(Path(path).relative_to(root)) for path in paths]
+
+
+def git(root: Path, *args: str) -> str:
+    """Run git in root and return its output."""
+    return subprocess.run(['git', *args], cwd=root, check=True, capture_output=True, text=True).stdout
+
+
+def git_init(root: Path) -> Path:
+    """Make root a git repository with everything below it committed."""
+    git(root, 'init', '-q')
+    git(root, 'config', 'user.email', 'test@example.com')
+    git(root, 'config', 'user.name', 'test')
+    git(root, 'add', '-A')
+    git(root, 'commit', '-q', '-m', 'fixture')
+    return root
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Project tree (not a git repository)."""
+    return write_tree(tmp_path / 'project', PROJECT_FILES)
+
+
+@pytest.fixture
+def git_project(project: Path) -> Path:
+    """Project tree committed to a git repository."""
+    return git_init(project)
+
+
+@pytest.fixture
+def stats(monkeypatch) -> Stats:
+    """Enabled STATS with empty phases and counters (read after a run)."""
+    monkeypatch.setattr(STATS, 'enabled', True)
+    monkeypatch.setattr(STATS, 'phases', {})
+    monkeypatch.setattr(STATS, 'counters', {})
+    return STATS
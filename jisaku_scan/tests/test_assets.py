@@ -0,0 +1,32 @@
+"""Unused public assets."""
+
+import json
+from pathlib import Path
+
+from jisaku_scan import assets
+from jisaku_scan.assets import find_unused_assets
+from jisaku_scan.ignore import IGNORE_FILE, load_ignore_rules
+from jisaku_scan.tests.conftest import write_tree
+
+
+def test_unused_assets(project: Path):
+    assert [(asset.path, asset.size) for asset in find_unused_assets(project)] == [('public/unused.png', 300)]
+    write_tree(project, {'src/styles/tokens.css': ":root { --bg: url('/unused.png'); }\n"})
+    assert find_unused_assets(project) == []
+
+
+def test_the_scanners_ignore_config_does_not_reference_assets(project: Path, monkeypatch):
+    config = json.loads(IGNORE_FILE.read_text(encoding='utf-8'))
+    config['unused_assets']['ignored_files']['public/unused.png'] = 'Located at runtime'
+    package = write_tree(project, {'jisaku_scan/ignore.json': json.dumps(config)}) / 'jisaku_scan'
+    monkeypatch.setattr(assets, 'PACKAGE_DIR', package)
+    # Read the edited config on every run (load_ignore_rules caches by path)
+    monkeypatch.setattr(assets, 'load_ignore_rules',
+                        lambda analysis: load_ignore_rules.__wrapped__(analysis, package / 'ignore.json'))
+    assert find_unused_assets(project) == []
+
+    # Without its ignore entry the asset is reported, although ignore.json still names it in prose
+    del config['unused_assets']['ignored_files']['public/unused.png']
+    config['unused_assets']['note'] = 'public/unused.png was located at runtime'
+    write_tree(project, {'jisaku_scan/ignore.json': json.dumps(config)})
+    assert [asset.path for asset in find_unused_assets(project)] == ['public/unused.png']
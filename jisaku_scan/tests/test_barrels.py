@@ -0,0 +1,35 @@
+"""Barrel export index."""
+
+from pathlib import Path
+
+from jisaku_scan.barrels import BarrelIndex
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.resolver import ImportResolver
+from jisaku_scan.tests.conftest import write_tree
+
+
+def test_barrel_lookup_follows_named_and_star_reexports(project: Path):
+    write_tree(project, {
+        'src/shared/index.ts': "export * from './inner'\nexport { BaseCard as Card } from '@/base/components'\n",
+        'src/shared/inner/index.ts': "export { helper } from './helper'\n",
+        'src/shared/inner/helper.ts': 'export const helper = 1\n',
+    })
+    resolver = ImportResolver(project, FileIndex(project))
+    barrels = BarrelIndex(resolver.resolve)
+    shared = project / 'src/shared/index.ts'
+    assert barrels.is_barrel(shared)
+    assert not barrels.is_barrel(project / 'src/main.ts')
+    assert barrels.lookup(shared, 'helper') == [project / 'src/shared/inner/index.ts',
+                                                 project / 'src/shared/inner/helper.ts']
+    assert barrels.lookup(shared, 'Card')[-1] == project / 'src/base/components/BaseCard.vue'
+    assert barrels.lookup(shared, 'missing') == []
+
+
+def test_multiline_reexports_are_indexed(project: Path):
+    write_tree(project, {
+        'src/shared/index.ts': "export {\n  BaseButton,\n  BaseCard as Card,\n} from '@/base/components'\n",
+    })
+    barrels = BarrelIndex(ImportResolver(project, FileIndex(project)).resolve)
+    shared = project / 'src/shared/index.ts'
+    assert barrels.lookup(shared, 'Card')[-1] == project / 'src/base/components/BaseCard.vue'
+    assert barrels.lookup(shared, 'BaseButton')[-1] == project / 'src/base/components/BaseButton.vue'
@@ -0,0 +1,13 @@
+"""Benchmark harness."""
+
+from pathlib import Path
+
+from jisaku_scan.bench import run_benchmark
+from jisaku_scan.tests.conftest import write_tree
+
+
+def test_benchmark_scans_a_tree_under_an_ignored_directory(git_project: Path):
+    write_tree(git_project, {'.gitignore': 'node_modules/\n'})
+    result = run_benchmark('tiny', 200, repeat=1, bench_dir=git_project / 'node_modules/.cache/bench')
+    assert result['files'] == 200
+    assert result['findings']['untested'] > 0
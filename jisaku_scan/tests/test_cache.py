@@ -0,0 +1,71 @@
+"""Parse cache: location, namespaces and incremental runs on a warm cache."""
+
+from pathlib import Path
+
+import pytest
+
+from jisaku_scan.cache import ParseCache, cache_dir_for
+from jisaku_scan.chunks import find_route_weights
+from jisaku_scan.components import find_component_usage
+from jisaku_scan.exports import find_unused_exports
+from jisaku_scan.fanout import find_barrel_costs
+from jisaku_scan.tests.conftest import git, write_tree
+from jisaku_scan.unused import find_unused_files
+
+
+OUTCOME = ('digest', 3, False, {'imports': []}, True)
+
+
+def test_cache_lives_below_the_scanned_root(project: Path):
+    find_unused_files(project)
+    assert cache_dir_for(project) == project / 'node_modules/.cache/jisaku-scan'
+    (database,) = cache_dir_for(project).glob('*.sqlite')
+    assert database.name.endswith('-extract_imports.sqlite')
+
+
+def test_namespaces_keep_their_entries_across_fingerprints(tmp_path: Path):
+    for namespace in ['first', 'second']:
+        cache = ParseCache(tmp_path, f'{namespace}-config', namespace)
+        cache.record('a.ts', None, OUTCOME)
+        cache.close()
+    assert ParseCache(tmp_path, 'first-config', 'first').paths() == ['a.ts']
+    assert ParseCache(tmp_path, 'second-config', 'second').paths() == ['a.ts']
+    # A new fingerprint only drops the entries of its own namespace
+    assert ParseCache(tmp_path, 'changed', 'first').paths() == []
+    assert ParseCache(tmp_path, 'second-config', 'second').paths() == ['a.ts']
+
+
+@pytest.mark.parametrize('analysis', [find_route_weights, find_barrel_costs, find_component_usage])
+def test_runtime_import_analyses_do_not_evict_check(project: Path, stats, analysis):
+    find_unused_files(project)
+    analysis(project)
+    find_unused_files(project)
+    assert stats.counters['cache_misses'] == 0
+    assert stats.counters['cache_hits'] > 0
+    analysis(project)
+    assert stats.counters['cache_misses'] == 0
+
+
+def test_exports_and_check_keep_each_others_entries(project: Path, stats):
+    find_unused_files(project)
+    find_unused_exports(project)
+    find_unused_files(project)
+    assert stats.counters['cache_misses'] == 0
+    find_unused_exports(project)
+    assert stats.counters['cache_misses'] == 0
+
+
+def test_changed_on_a_warm_cache_reports_only_what_an_edit_can_affect(git_project: Path):
+    write_tree(git_project, {'src/features/old.ts': 'export const old = 1\n'})
+    git(git_project, 'add', '-A')
+    git(git_project, 'commit', '-q', '-m', 'feature')
+    full = [str(path.relative_to(git_project)) for path in find_unused_files(git_project)]
+    assert 'src/features/old.ts' in full
+
+    page = git_project / 'src/pages/HomePage.vue'
+    content = page.read_text(encoding='utf-8')
+    content = content.replace("import { formatHome } from '@/modules/home/home-utils'\n", '')
+    page.write_text(content.replace("formatHome('home')", "'home'"), encoding='utf-8')
+    changed = [str(path.relative_to(git_project)) for path in find_unused_files(git_project, changed_ref='HEAD')]
+    assert 'src/features/old.ts' not in changed
+    assert 'src/modules/home/home-utils.ts' in changed
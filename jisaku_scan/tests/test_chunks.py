@@ -0,0 +1,27 @@
+"""Route chunk weights."""
+
+from pathlib import Path
+
+from jisaku_scan.chunks import find_route_weights
+from jisaku_scan.unused import extract_runtime_imports
+
+
+def test_runtime_imports_drop_erased_and_dynamic_imports():
+    parsed = extract_runtime_imports(
+        "import d, { e as f, type G } from './real'\n"
+        "import type { H } from './types'\n"
+        "import './side-effect.css'\n"
+        "export { x } from './reexported'\n"
+        "export type { Y } from './type-reexport'\n"
+        "export * from './star'\n"
+        "const lazy = () => import('./lazy')\n"
+    )
+    assert parsed['imports'] == ['./real', './side-effect.css']
+    assert parsed['named'] == [[' e as f', './real']]
+    assert parsed['reexports'] == ['./reexported', './star']
+
+
+def test_route_weights(project: Path):
+    report = find_route_weights(project, use_cache=False)
+    assert (report.entry_modules, report.entry_bytes) == (4, 375)
+    assert [(route.page, route.modules) for route in report.routes] == [('src/pages/HomePage.vue', 7)]
@@ -0,0 +1,44 @@
+"""Command line entry points: imports and the defaults resolved by the handlers."""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+from jisaku_scan.cli import main
+
+
+def run_main(argv) -> Optional[int]:
+    """Run the entry point and return its exit code (None for the reports without one)."""
+    try:
+        main(argv)
+    except SystemExit as e:
+        return e.code
+    return None
+
+
+def test_importing_the_cli_leaves_the_other_commands_unloaded():
+    loaded = subprocess.run(
+        [sys.executable, '-c', 'import sys, jisaku_scan.cli; print(" ".join(sorted(sys.modules)))'],
+        check=True, capture_output=True, text=True,
+    ).stdout.split()
+    for module in ['assets', 'bench', 'chunks', 'components', 'daemon', 'exports', 'fanout', 'impact',
+                   'synthetic', 'watcher']:
+        assert f'jisaku_scan.{module}' not in loaded
+    assert 'jisaku_scan.unused' in loaded
+
+
+def test_handlers_fall_back_to_the_module_defaults(project: Path, capsys):
+    assert run_main(['assets', str(project)]) == 1
+    assert f"unused assets in: {project / 'public'}" in capsys.readouterr().out
+    assert run_main(['barrels', str(project), '--no-cache']) is None
+    assert 'using less than 25% of the fan-out' in capsys.readouterr().out
+    assert run_main(['chunks', str(project), '--no-cache']) is None
+    assert 'Entry chunk (src/main.ts)' in capsys.readouterr().out
+
+
+def test_invalid_options_are_reported_by_the_handlers(project: Path, capsys):
+    assert run_main(['bench', '--size', '5k']) == 1
+    assert "unknown size '5k' (choose from 1k, 10k, 100k)" in capsys.readouterr().out
+    assert run_main(['barrels', str(project), '--fraction', '0']) == 1
+    assert '--fraction must be in (0, 1]' in capsys.readouterr().out
@@ -0,0 +1,30 @@
+"""Component usage index."""
+
+from pathlib import Path
+
+import pytest
+
+from jisaku_scan.cli import main
+from jisaku_scan.components import find_component_usage, hyphenate
+from jisaku_scan.tests.conftest import PROJECT_FILES, write_tree
+
+
+def test_component_usage(project: Path):
+    assert hyphenate('BaseSwitch') == 'base-switch'
+    report = find_component_usage(project, use_cache=False)
+    assert (report.components, report.templates) == (4, 1)
+    assert [(component.path, component.importers) for component in report.unrendered] == [
+        ('src/base/components/BaseWidget.vue', ['src/pages/HomePage.vue']),
+    ]
+
+
+def test_components_command_fails_on_unrendered_components(project: Path):
+    with pytest.raises(SystemExit) as exit_info:
+        main(['components', str(project), '--no-cache'])
+    assert exit_info.value.code == 1
+
+    page = PROJECT_FILES['src/pages/HomePage.vue'].replace('  <base-card>', '  <BaseWidget />\n  <base-card>')
+    write_tree(project, {'src/pages/HomePage.vue': page})
+    with pytest.raises(SystemExit) as exit_info:
+        main(['components', str(project), '--no-cache'])
+    assert exit_info.value.code == 0
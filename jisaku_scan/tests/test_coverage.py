@@ -0,0 +1,73 @@
+"""lcov reports and coverage-aware test gaps."""
+
+from pathlib import Path
+
+import pytest
+
+from jisaku_scan.coverage import DEFAULT_THRESHOLD, iter_lcov_records, load_coverage, read_lines_threshold
+from jisaku_scan.tests.conftest import write_tree
+from jisaku_scan.untested import find_test_gaps
+
+
+LCOV = '''TN:
+SF:{root}/src/modules/home/home-utils.ts
+FN:1,formatHome
+FNF:1
+FNH:0
+DA:1,0
+DA:2,1
+LF:2
+LH:1
+end_of_record
+SF:src/base/components/BaseCard.vue
+LF:0
+LH:0
+end_of_record
+'''
+
+
+def test_lcov_summary_counters(project: Path):
+    lcov = write_tree(project, {'coverage/lcov.info': LCOV.format(root=project)}) / 'coverage/lcov.info'
+    records = dict(iter_lcov_records(lcov))
+    utils = records[f'{project}/src/modules/home/home-utils.ts']
+    assert (utils.lines_found, utils.lines_hit, utils.functions_found, utils.functions_hit) == (2, 1, 1, 0)
+    assert utils.lines == 50.0
+
+    coverage = load_coverage(lcov, project)
+    assert set(coverage) == {'src/modules/home/home-utils.ts', 'src/base/components/BaseCard.vue'}
+    assert coverage['src/base/components/BaseCard.vue'].lines == 100.0
+
+
+def test_lcov_errors(project: Path):
+    with pytest.raises(ValueError, match='cannot read'):
+        list(iter_lcov_records(project / 'missing.info'))
+    lcov = write_tree(project, {'lcov.info': 'SF:a.ts\nLF:x\nend_of_record\n'}) / 'lcov.info'
+    with pytest.raises(ValueError, match=r'lcov.info:2: invalid LF'):
+        list(iter_lcov_records(lcov))
+
+
+def test_lines_threshold_from_vitest_config(project: Path):
+    assert read_lines_threshold(project) == DEFAULT_THRESHOLD
+    write_tree(project, {'vitest.config.ts': 'coverage: { thresholds: { functions: 60, lines: 85.5 } }\n'})
+    assert read_lines_threshold(project) == 85.5
+
+
+def test_test_gaps_with_and_without_coverage(project: Path):
+    assert [gap.path for gap in find_test_gaps(str(project))] == [
+        'src/base/components/BaseCard.vue',
+        'src/base/components/BaseWidget.vue',
+        'src/base/components/base-card-types.ts',
+        'src/modules/home/dead-code.ts',
+    ]
+    lcov = write_tree(project, {'lcov.info': LCOV.format(root=project)}) / 'lcov.info'
+    gaps = find_test_gaps(str(project), coverage=load_coverage(lcov, project), threshold=70.0)
+    # Files with a colocated test are reported below the threshold only
+    assert [gap for gap in gaps if gap.coverage is not None] == [('src/modules/home/home-utils.ts', 50.0)]
+    assert find_test_gaps(str(project), coverage=load_coverage(lcov, project), threshold=50.0) == [
+        (path, None) for path in [
+            'src/base/components/BaseCard.vue',
+            'src/base/components/BaseWidget.vue',
+            'src/base/components/base-card-types.ts',
+            'src/modules/home/dead-code.ts',
+        ]
+    ]
@@ -0,0 +1,53 @@
+"""Watch daemon: the resident scan answers as check does."""
+
+from pathlib import Path
+
+from jisaku_scan.daemon import ResidentScan
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.tests.conftest import git, write_tree
+from jisaku_scan.unused import find_unused_files
+from jisaku_scan.untested import find_untested_files
+
+
+def check_report(root: Path):
+    """Unused and untested files as `check` reports them (one shared scan)."""
+    scan = ProjectScan(root)
+    unused = {str(path.relative_to(root)) for path in find_unused_files(root, use_cache=False, scan=scan)}
+    return unused, set(find_untested_files(str(root), scan.index, scan.barrels))
+
+
+def test_refresh_reports_added_and_removed_files(project: Path):
+    index = FileIndex(project)
+    (project / 'src/modules/home/dead-code.ts').unlink()
+    write_tree(project, {'src/modules/new/feature.ts': ''})
+    added, removed = index.refresh(['src/modules/home/dead-code.ts', 'src/modules/new'])
+    assert added == {'src/modules/new/feature.ts'}
+    assert removed == {'src/modules/home/dead-code.ts'}
+    assert 'src/modules/new/feature.ts' in index.rel_files()
+
+
+def test_resident_scan_matches_check_in_a_git_tree(git_project: Path):
+    write_tree(git_project, {'.gitignore': 'coverage/\n*.local.ts\n'})
+    git(git_project, 'add', '-A')
+    git(git_project, 'commit', '-q', '-m', 'ignore')
+    state = ResidentScan(git_project)
+    assert state.report() == check_report(git_project)
+
+    write_tree(git_project, {
+        'coverage/report.ts': 'export const report = 1\n',
+        'src/modules/home/scratch.local.ts': 'export const scratch = 1\n',
+        'src/modules/new/feature.ts': 'export const feature = 1\n',
+    })
+    (git_project / 'src/modules/home/dead-code.ts').unlink()
+    state.apply({'coverage', 'src/modules/home/scratch.local.ts', 'src/modules/new',
+                 'src/modules/home/dead-code.ts'})
+    unused, untested = state.report()
+    assert (unused, untested) == check_report(git_project)
+    assert 'src/modules/new/feature.ts' in unused
+    assert not any(path.startswith('coverage') or path.endswith('.local.ts') for path in unused | untested)
+
+    write_tree(git_project, {'.gitignore': 'coverage/\n'})
+    state.apply({'.gitignore'})
+    assert state.report() == check_report(git_project)
+    assert 'src/modules/home/scratch.local.ts' in state.report()[0]
@@ -0,0 +1,31 @@
+"""Symbol-level unused exports."""
+
+from pathlib import Path
+
+from jisaku_scan.exports import find_unused_exports
+from jisaku_scan.tests.conftest import write_tree
+
+
+def unused_exports(root: Path):
+    return [(str(path.relative_to(root)), name) for path, name in find_unused_exports(root, use_cache=False)]
+
+
+def test_unused_exports(project: Path):
+    assert unused_exports(project) == [
+        ('src/modules/home/home-utils.ts', 'unusedHelper'),
+        ('src/modules/home/dead-code.ts', 'dead'),
+    ]
+
+
+def test_unused_exports_are_reported_once_at_the_declaring_module(project: Path):
+    write_tree(project, {
+        'src/api/index.ts': "export { autoPersist, save } from './persistence'\nexport * from './types'\n",
+        'src/api/persistence.ts': 'export const autoPersist = 1\nexport function save() {}\n',
+        'src/api/types.ts': 'export interface RepositoryError { code: number }\n',
+        'src/modules/home/home-api.ts': "import { save } from '@/api'\nexport default save\n",
+    })
+    unused = unused_exports(project)
+    assert ('src/api/persistence.ts', 'autoPersist') in unused
+    assert ('src/api/types.ts', 'RepositoryError') in unused
+    assert not [entry for entry in unused if entry[0] == 'src/api/index.ts']
+    assert ('src/api/persistence.ts', 'save') not in unused
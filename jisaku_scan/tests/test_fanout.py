@@ -0,0 +1,11 @@
+"""Barrel fan-out costs."""
+
+from pathlib import Path
+
+from jisaku_scan.fanout import find_barrel_costs
+
+
+def test_barrel_costs(project: Path):
+    (cost,) = find_barrel_costs(project, use_cache=False)
+    assert (cost.path, cost.modules, cost.importers, cost.wasted) == ('src/base/components/index.ts', 4, 1, 218)
+    assert cost.consumers[0].names == ['BaseButton', 'BaseCard', 'BaseWidget']
@@ -0,0 +1,41 @@
+"""File index shared by the scanner phases."""
+
+from pathlib import Path
+
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.tests.conftest import write_tree
+
+
+def test_index_skips_node_modules_and_lists_every_file(project: Path):
+    write_tree(project, {'node_modules/vue/index.js': ''})
+    index = FileIndex(project)
+    rel_files = index.rel_files()
+    assert 'src/main.ts' in rel_files
+    assert not any(rel_file.startswith('node_modules') for rel_file in rel_files)
+    assert index.files_in('src/pages') == frozenset({'HomePage.vue', 'home.css'})
+
+
+def test_git_index_lists_the_same_files_as_the_walk(git_project: Path):
+    write_tree(git_project, {'src/modules/new/untracked.ts': '', 'dist/app.js': '', '.gitignore': 'dist/\n'})
+    (git_project / 'src/modules/home/dead-code.ts').unlink()
+    index = FileIndex(git_project, use_git=True)
+    assert index.backend == 'git'
+    walked = set(FileIndex(git_project).rel_files())
+    assert set(index.rel_files()) == walked - {'dist/app.js'}
+    assert index.blob('src/main.ts') is not None
+    assert index.blob('src/modules/new/untracked.ts') is None
+
+
+def test_git_index_falls_back_to_the_walk_for_an_untracked_root(git_project: Path):
+    root = write_tree(git_project / 'generated/tree', {'src/a.ts': '', 'src/b/c.ts': ''})
+    index = FileIndex(root, use_git=True)
+    assert index.backend == 'walk'
+    assert sorted(index.rel_files()) == ['src/a.ts', 'src/b/c.ts']
+
+
+def test_git_index_falls_back_to_the_walk_for_an_ignored_root(git_project: Path):
+    write_tree(git_project, {'.gitignore': 'generated/\n'})
+    root = write_tree(git_project / 'generated/tree', {'src/a.ts': ''})
+    index = FileIndex(root, use_git=True)
+    assert index.backend == 'walk'
+    assert index.rel_files() == ['src/a.ts']
@@ -0,0 +1,40 @@
+"""Tests affected by changed files."""
+
+from pathlib import Path
+
+from jisaku_scan.graph import STYLES, USED, DependencyGraph
+from jisaku_scan.impact import find_affected_tests
+from jisaku_scan.tests.conftest import write_tree
+
+
+def test_dependents_follow_imports_and_styles_backwards():
+    graph = DependencyGraph()
+    graph.set_edges('/a', {USED: ['/b']})
+    graph.set_edges('/b', {USED: ['/c'], STYLES: ['/s.css']})
+    graph.set_edges('/d', {USED: ['/c']})
+    assert graph.dependents_of(['/c']) == {'/a', '/b', '/c', '/d'}
+    assert graph.dependents_of(['/s.css']) == {'/a', '/b', '/s.css'}
+
+
+def test_affected_tests_follow_imports_transitively(project: Path):
+    write_tree(project, {'src/pages/HomePage.test.ts': "import HomePage from './HomePage.vue'\n"})
+    assert find_affected_tests(project, ['src/modules/home/home-utils.ts'], use_cache=False) == [
+        'src/modules/home/home-utils.test.ts',
+        'src/pages/HomePage.test.ts',
+    ]
+    assert find_affected_tests(project, ['src/base/components/BaseButton.vue'], use_cache=False) == [
+        'src/base/components/BaseButton.test.ts',
+        'src/pages/HomePage.test.ts',
+    ]
+    assert find_affected_tests(project, [], use_cache=False) == []
+
+
+def test_affected_tests_include_spec_files(project: Path):
+    write_tree(project, {'src/modules/home/home-utils.spec.ts': "import { formatHome } from './home-utils'\n"})
+    assert find_affected_tests(project, ['src/modules/home/home-utils.ts'], use_cache=False) == [
+        'src/modules/home/home-utils.spec.ts',
+        'src/modules/home/home-utils.test.ts',
+    ]
+    assert find_affected_tests(project, ['src/modules/home/home-utils.spec.ts'], use_cache=False) == [
+        'src/modules/home/home-utils.spec.ts',
+    ]
@@ -0,0 +1,28 @@
+"""Incremental --changed mode of the unused files analysis."""
+
+from pathlib import Path
+
+import pytest
+
+from jisaku_scan.tests.conftest import rel_paths
+from jisaku_scan.unused import find_unused_files
+
+
+def test_changed_without_cache_reevaluates_everything(git_project: Path):
+    page = git_project / 'src/pages/HomePage.vue'
+    content = page.read_text(encoding='utf-8')
+    content = content.replace("import { formatHome } from '@/modules/home/home-utils'\n", '')
+    page.write_text(content.replace("formatHome('home')", "'home'"), encoding='utf-8')
+
+    changed = rel_paths(git_project, find_unused_files(git_project, use_cache=False, changed_ref='HEAD'))
+    assert changed == [
+        'src/modules/home/dead-code.ts',
+        'src/modules/home/home-utils.ts',
+        'src/modules/home/orphan.test.ts',
+    ]
+    assert changed == rel_paths(git_project, find_unused_files(git_project, use_cache=False))
+
+
+def test_changed_needs_a_git_repository(project: Path):
+    with pytest.raises(ValueError):
+        find_unused_files(project, use_cache=False, changed_ref='HEAD')
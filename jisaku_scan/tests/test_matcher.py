@@ -0,0 +1,16 @@
+"""Multi-literal matcher."""
+
+from jisaku_scan.matcher import LiteralMatcher
+
+
+def test_literal_matcher_prefers_the_longest_literal_within_boundaries():
+    matcher = LiteralMatcher(['<Base', '<BaseButton', '<base-card'], after=r'(?=[\s/>])')
+    assert matcher.matches('<BaseButton /><base-card>x</base-card><BaseButtonGroup>') == {'<BaseButton', '<base-card'}
+    assert LiteralMatcher([]).matches('anything') == set()
+
+
+def test_literal_matcher_binary_guard_with_multibyte_literals():
+    matcher = LiteralMatcher(['/é.png', '/logo.svg'], not_after=r'[\w.-]', binary=True)
+    text = 'url(/é.png) src="a/logo.svg" x="/logo.svg"'.encode('utf-8')
+    assert matcher.matches(text) == {'/é.png', '/logo.svg'}
+    assert matcher.matches(b'a/logo.svg') == set()
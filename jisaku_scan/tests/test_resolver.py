@@ -0,0 +1,20 @@
+"""Import resolver and tsconfig paths."""
+
+from pathlib import Path
+
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.resolver import ImportResolver, load_tsconfig_paths
+
+
+def test_tsconfig_paths_allow_comments_and_trailing_commas(project: Path):
+    assert load_tsconfig_paths(project) == [('@/', '', ['src/*'])]
+
+
+def test_resolver_tries_extensions_index_files_and_aliases(project: Path):
+    resolver = ImportResolver(project, FileIndex(project))
+    main = project / 'src/main.ts'
+    assert resolver.resolve(main, './App.vue') == project / 'src/App.vue'
+    assert resolver.resolve(main, './router') == project / 'src/router/index.ts'
+    assert resolver.resolve(main, '@/modules/home/home-utils') == project / 'src/modules/home/home-utils.ts'
+    assert resolver.resolve(main, 'vue') is None
+    assert resolver.resolve(main, './missing') is None
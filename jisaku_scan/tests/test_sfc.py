@@ -0,0 +1,29 @@
+"""Vue single-file component splitter."""
+
+from jisaku_scan.sfc import split_sfc, style_references
+from jisaku_scan.unused import extract_sfc_imports
+
+
+def test_sfc_imports_come_from_script_blocks_only():
+    source = (
+        '<template><div @import-data="x">import z from "./tpl"</div></template>\n'
+        '<script setup lang="ts">import a from "./a"</script>\n'
+        '<style src="./s.css" />\n'
+        '<style>@import "./t.css"; /* @import "./commented.css"; */</style>\n'
+    )
+    parsed = extract_sfc_imports(source)
+    assert parsed['imports'] == ['./a']
+    assert parsed['styles'] == ['./s.css', './t.css']
+
+
+def test_split_sfc_keeps_nested_templates_in_the_template_block():
+    source = (
+        '<!-- <script>import x from "./comment"</script> -->\n'
+        '<template>\n  <template v-if="a"><b /></template>\n  <i />\n</template>\n'
+        '<script src="./logic.ts"></script>\n'
+    )
+    blocks = split_sfc(source)
+    assert [block.tag for block in blocks] == ['template', 'script']
+    assert '<i />' in blocks[0].content
+    assert blocks[1].attrs == {'src': './logic.ts'}
+    assert style_references(blocks) == []
@@ -0,0 +1,49 @@
+"""Sharded unused files scan and the merge of its partial graphs."""
+
+from pathlib import Path
+
+import pytest
+
+from jisaku_scan.cli import main
+from jisaku_scan.fs_index import FileIndex
+from jisaku_scan.shard import in_shard, merge_partials, parse_shard
+from jisaku_scan.tests.conftest import rel_paths, write_tree
+from jisaku_scan.unused import find_unused_files, write_shard
+
+
+def test_parse_shard():
+    assert parse_shard('2/3') == (2, 3)
+    for spec in ['0/3', '4/3', '1', 'a/b']:
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_merged_shards_equal_a_single_run(project: Path, tmp_path: Path):
+    rel_files = FileIndex(project).rel_files()
+    assert sum(in_shard(rel_file, (i, 3)) for rel_file in rel_files for i in (1, 2, 3)) == len(rel_files)
+
+    partials = [tmp_path / f'shard-{i}.json.gz' for i in (1, 2, 3)]
+    for i, partial in enumerate(partials, 1):
+        write_shard(project, (i, 3), partial, use_cache=False)
+    graph = merge_partials(partials, project, FileIndex(project))
+    assert rel_paths(project, find_unused_files(project, use_cache=False, graph=graph)) == \
+        rel_paths(project, find_unused_files(project, use_cache=False))
+
+    with pytest.raises(ValueError, match='given twice'):
+        merge_partials([partials[0], partials[0]], project, FileIndex(project))
+    write_tree(project, {'src/new.ts': ''})
+    with pytest.raises(ValueError, match='another file tree'):
+        merge_partials(partials, project, FileIndex(project))
+
+
+def test_shard_output_must_be_explicit_and_outside_the_tree(project: Path, tmp_path: Path, capsys):
+    for extra in [[], ['--shard-out', str(project / 'shard-1.json.gz')]]:
+        with pytest.raises(SystemExit) as exit_info:
+            main(['check', str(project), '--no-cache', '--shard', '1/2', *extra])
+        assert exit_info.value.code == 1
+        assert '--shard-out' in capsys.readouterr().out
+    assert not (project / 'shard-1.json.gz').exists()
+    with pytest.raises(SystemExit) as exit_info:
+        main(['check', str(project), '--no-cache', '--shard', '1/2', '--shard-out', str(tmp_path / 'shard-1.json.gz')])
+    assert exit_info.value.code == 0
+    assert (tmp_path / 'shard-1.json.gz').exists()
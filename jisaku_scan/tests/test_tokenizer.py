@@ -0,0 +1,43 @@
+"""Import extraction with the tokenizer and with the legacy regexes."""
+
+from pathlib import Path
+
+from jisaku_scan.tests.conftest import PROJECT_FILES, rel_paths, write_tree
+from jisaku_scan.unused import extract_imports, extract_imports_regex, find_unused_files
+
+
+SOURCE = '''// import a from './commented'
+/* import b from './block' */
+const s = "import c from './string'"
+import d, { e as f, type G } from './real'
+import type { H } from './types'
+import './side-effect.css'
+export { x } from './reexported'
+export type { Y } from './type-reexport'
+export * from './star'
+const lazy = () => import('./lazy')
+const re = /import x from 'y'/
+'''
+
+
+def test_tokenizer_skips_comments_strings_and_regexes():
+    parsed = extract_imports(SOURCE)
+    assert parsed['imports'] == ['./real', './types', './side-effect.css', './lazy']
+    assert parsed['reexports'] == ['./reexported', './type-reexport', './star']
+    assert parsed['named'] == [[' e as f, type G ', './real'], [' H ', './types']]
+    assert parsed['bindings'] == [['default', './real'], ['*', './lazy']]
+
+
+def test_legacy_regex_matches_inside_comments_and_strings():
+    imports = extract_imports_regex(SOURCE)['imports']
+    assert {'./commented', './block', './string', 'y'} <= set(imports)
+    # Side-effect imports are not seen by the legacy regexes
+    assert './side-effect.css' not in imports
+
+
+def test_legacy_regex_keeps_commented_imports_alive(project: Path):
+    write_tree(project, {'src/main.ts': PROJECT_FILES['src/main.ts'] +
+                         "// import { dead } from '@/modules/home/dead-code'\n"})
+    assert 'src/modules/home/dead-code.ts' in rel_paths(project, find_unused_files(project, use_cache=False))
+    legacy = rel_paths(project, find_unused_files(project, use_cache=False, extract=extract_imports_regex))
+    assert 'src/modules/home/dead-code.ts' not in legacy
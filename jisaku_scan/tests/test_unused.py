@@ -0,0 +1,34 @@
+"""Module graph and mark-and-sweep over it."""
+
+from pathlib import Path
+
+from jisaku_scan.graph import STYLES, USED, DependencyGraph
+from jisaku_scan.tests.conftest import rel_paths
+from jisaku_scan.unused import find_unused_files
+
+
+def test_graph_reachability():
+    graph = DependencyGraph()
+    graph.set_edges('/a', {USED: ['/b']})
+    graph.set_edges('/b', {USED: ['/c'], STYLES: ['/s.css']})
+    graph.set_edges('/d', {USED: ['/c']})
+    assert graph.reachable(['/a']) == {'/a', '/b', '/c'}
+    graph.remove('/b')
+    assert graph.reachable(['/a']) == {'/a', '/b'}
+
+
+def test_compact_graph_marks_from_integer_ids():
+    graph = DependencyGraph()
+    graph.set_edges('/a', {USED: ['/b', '/c']})
+    graph.set_edges('/c', {USED: ['/a']})
+    compact = graph.compact()
+    marked = compact.mark(compact.ids_of(['/c']), [compact.forward[USED]])
+    assert compact.marked_nodes(marked) == {'/a', '/b', '/c'}
+    assert graph.compact() is compact
+
+
+def test_unused_files_and_orphaned_tests(project: Path):
+    assert rel_paths(project, find_unused_files(project, use_cache=False)) == [
+        'src/modules/home/dead-code.ts',
+        'src/modules/home/orphan.test.ts',
+    ]
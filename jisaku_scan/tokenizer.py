@@ -0,0 +1,210 @@
+"""
+Import Tokenizer
+
+Single-pass extraction of module specifiers from JavaScript/TypeScript.
+
+The scanner jumps between the few characters that matter (quotes,
+backticks, slashes, braces and the `import`/`export` keywords), skips
+comments, string, template and regex literals, and matches each import or
+export statement with an anchored, non-backtracking pattern. Every byte is
+visited a bounded number of times, so long files without semicolons
+(prettier style) cost the same as any other file, and lexing stops after
+the last `import`/`from` in the file (the last `export` when local
+declarations are collected too).
+
+Captured references:
+    - import x from '...' / import { a } from '...' / import * as ns from '...'
+    - import type { T } from '...'
+    - import '...' (side effect)
+    - import('...') (dynamic)
+    - export { a } from '...' / export * from '...' / export type { T } from '...'
+    - optionally, export const a / export function f / export { a, b as c } /
+      export default (local declarations, as the names the module exports)
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class ModuleReference(NamedTuple):
+    """
+    A module specifier found in source text.
+
+    Attributes:
+        kind: 'import', 'type' (import type), 'side-effect', 'dynamic',
+            'export' (re-export), 'type-export' (export type ... from) or
+            'declaration' (local export, no specifier)
+        specifier: The module specifier (e.g. '@/modules/kanji', './KanjiForm.vue')
+        names: Text between the braces of a named import/export, if any; for a
+            declaration, the declared name ('default' for export default) or
+            the text between the braces of a local export list
+        bindings: Exports taken apart from the braces: 'default' for a default
+            import, '*' for a namespace or dynamic import
+    """
+
+    kind: str
+    specifier: str
+    names: Optional[str]
+    bindings: Tuple[str, ...] = ()
+
+
+# Next token of interest. Comments and string literals are consumed whole
+# (strings end at an unescaped quote or, unterminated, at a newline); other
+# matches are template/regex literal starts and the two keywords. Braces
+# only matter inside template literal ${ ... } expressions.
+_SKIPPED = r'''//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?'''
+JUMP_PATTERN = re.compile(_SKIPPED + r'''|[`/]|\b(?:import|export)\b''')
+TEMPLATE_JUMP_PATTERN = re.compile(_SKIPPED + r'''|[`/{}]|\b(?:import|export)\b''')
+
+# Template literal text up to the closing backtick or the next ${
+TEMPLATE_TEXT_PATTERN = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*')
+# Regex literal (single line), including character classes
+REGEX_LITERAL_PATTERN = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# Statements, matched at the keyword position
+STATIC_IMPORT_PATTERN = re.compile(
+    r'''import\s+(type\s+)?(?:([\w$]+)\s*(?:,\s*)?)?(?:(\*)\s*as\s+[\w$]+\s*|\{([^}]*)\}\s*)?'''
+    r'''from\s*(['"])([^'"\n]*)\5'''
+)
+SIDE_EFFECT_IMPORT_PATTERN = re.compile(r'''import\s*(['"])([^'"\n]*)\1''')
+DYNAMIC_IMPORT_PATTERN = re.compile(r'''import\s*\(\s*(['"`])([^'"`\n$]*)\1''')
+REEXPORT_PATTERN = re.compile(
+    r'''export\s+(type\s+)?(?:\*(?:\s*as\s+[\w$]+)?\s*|\{([^}]*)\}\s*)from\s*(['"])([^'"\n]*)\3'''
+)
+# Local exports: export [declare] [async] const/function/class/... name,
+# export { a, b as c } (tried after REEXPORT_PATTERN) and export default
+DECLARATION_PATTERN = re.compile(
+    r'export\s+(?:declare\s+)?(?:async\s+)?'
+    r'(?:const|let|var|function\s*\*?|class|interface|type|enum|abstract\s+class)\s+([\w$]+)'
+)
+LOCAL_EXPORT_LIST_PATTERN = re.compile(r'export\s+(?:type\s+)?\{([^}]*)\}')
+DEFAULT_EXPORT_PATTERN = re.compile(r'export\s+default\b')
+
+# Keywords after which a slash starts a regex literal rather than a division
+REGEX_KEYWORDS = frozenset({
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'instanceof', 'new',
+    'delete', 'void', 'throw', 'yield', 'await', 'of',
+})
+
+
+def _regex_allowed(source: str, pos: int) -> bool:
+    """Decide whether a slash at pos starts a regex literal (vs. a division)."""
+    i = pos - 1
+    while i >= 0 and source[i] in ' \t\r\n':
+        i -= 1
+    if i < 0:
+        return True
+    prev = source[i]
+    if prev in ')]':
+        return False
+    if prev.isalnum() or prev in '_$':
+        end = i + 1
+        while i >= 0 and (source[i].isalnum() or source[i] in '_$'):
+            i -= 1
+        return source[i + 1:end] in REGEX_KEYWORDS
+    return True
+
+
+def _previous_char(source: str, pos: int) -> str:
+    i = pos - 1
+    while i >= 0 and source[i] in ' \t\r\n':
+        i -= 1
+    return source[i] if i >= 0 else ''
+
+
+def scan_module_references(source: str, declarations: bool = False) -> List[ModuleReference]:
+    """
+    Extract every module reference from source text in one linear scan.
+
+    Args:
+        source: JavaScript/TypeScript source text
+        declarations: Also report local exports ('declaration' references);
+            the scan then runs to the last `export` instead of stopping
+            after the last import
+
+    Returns:
+        References in source order
+    """
+    references: List[ModuleReference] = []
+    # Braces open inside template expressions; True marks the ${ itself
+    braces: List[bool] = []
+    pos = 0
+    # Every reference contains `import` or `from` (or `export`, for
+    # declarations); nothing after the last one can be captured, so lexing
+    # stops there
+    length = max(source.rfind('import'), source.rfind('from'),
+                 source.rfind('export') if declarations else -1) + 1
+    search_end = length + len('import')
+
+    while pos < length:
+        match = (TEMPLATE_JUMP_PATTERN if braces else JUMP_PATTERN).search(source, pos, search_end)
+        if match is None:
+            break
+        start = match.start()
+        token = match.group()
+
+        if token[0] in '"\'' or len(token) > 1 and token[0] == '/':
+            # Comment or string literal
+            pos = match.end()
+
+        elif token == '`' or (token == '}' and braces and braces[-1]):
+            if token == '}':
+                braces.pop()
+            # Template text up to the closing backtick or an embedded expression
+            pos = TEMPLATE_TEXT_PATTERN.match(source, start + 1).end()
+            if source.startswith('${', pos):
+                braces.append(True)
+                pos += 2
+            else:
+                pos += 1
+
+        elif token == '{':
+            braces.append(False)
+            pos = start + 1
+
+        elif token == '}':
+            braces.pop()
+            pos = start + 1
+
+        elif token == '/':
+            literal = REGEX_LITERAL_PATTERN.match(source, start) if _regex_allowed(source, start) else None
+            pos = literal.end() if literal else start + 1
+
+        elif _previous_char(source, start) == '.':
+            # Property access such as foo.import
+            pos = match.end()
+
+        elif token == 'import':
+            statement = STATIC_IMPORT_PATTERN.match(source, start)
+            if statement:
+                kind = 'type' if statement.group(1) else 'import'
+                bindings = ('default',) if statement.group(2) else ()
+                if statement.group(3):
+                    bindings += ('*',)
+                references.append(ModuleReference(kind, statement.group(6), statement.group(4), bindings))
+            else:
+                statement = SIDE_EFFECT_IMPORT_PATTERN.match(source, start)
+                if statement:
+                    references.append(ModuleReference('side-effect', statement.group(2), None))
+                else:
+                    statement = DYNAMIC_IMPORT_PATTERN.match(source, start)
+                    if statement:
+                        references.append(ModuleReference('dynamic', statement.group(2), None, ('*',)))
+            pos = statement.end() if statement else match.end()
+
+        else:
+            statement = REEXPORT_PATTERN.match(source, start)
+            if statement:
+                kind = 'type-export' if statement.group(1) else 'export'
+                references.append(ModuleReference(kind, statement.group(4), statement.group(2)))
+            elif declarations:
+                statement = (DECLARATION_PATTERN.match(source, start)
+                             or LOCAL_EXPORT_LIST_PATTERN.match(source, start))
+                if statement:
+                    references.append(ModuleReference('declaration', '', statement.group(1)))
+                elif DEFAULT_EXPORT_PATTERN.match(source, start):
+                    references.append(ModuleReference('declaration', '', 'default'))
+            # A declaration is only consumed up to its name: its body is lexed
+            pos = statement.end() if statement else match.end()
+
+    return references
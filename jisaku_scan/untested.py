@@ -0,0 +1,174 @@
+"""
+Untested Files
+
+Finds source files (.vue, .ts) without a colocated .test.ts file and,
+given a vitest lcov report, files whose line coverage is below a threshold.
+
+Ignored directories and files are listed in jisaku_scan/ignore.json;
+barrel files (index.ts with only re-exports) are detected automatically.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from jisaku_scan.barrels import BarrelIndex
+from jisaku_scan.coverage import DEFAULT_THRESHOLD, FileCoverage
+from jisaku_scan.fs_index import FileIndex, join_rel
+from jisaku_scan.ignore import load_ignore_rules
+
+
+def is_barrel_export(file_path: str, barrels: Optional[BarrelIndex] = None) -> bool:
+    """
+    Check if a file is a barrel export (only contains export statements).
+    
+    Args:
+        file_path: Path to the file to check
+        barrels: Shared barrel index (a fresh one is used if not given)
+        
+    Returns:
+        True if the file is a barrel export
+    """
+    if barrels is None:
+        barrels = BarrelIndex()
+    return barrels.is_barrel(Path(file_path))
+
+
+class TestGap(NamedTuple):
+    """
+    A source file reported by the untested files analysis.
+
+    Attributes:
+        path: Path relative to the root
+        coverage: Line coverage (percent) if reported for coverage below the
+            threshold; None if reported for having no colocated test file
+    """
+
+    path: str
+    coverage: Optional[float] = None
+
+
+def iter_test_gaps(root_dir: str, index: Optional[FileIndex] = None,
+                   barrels: Optional[BarrelIndex] = None,
+                   coverage: Optional[Dict[str, FileCoverage]] = None,
+                   threshold: float = DEFAULT_THRESHOLD) -> Iterator[TestGap]:
+    """
+    Find source files without colocated test files, and with coverage below a threshold.
+
+    Both checks run in the same walk. A file with a colocated test is
+    reported when the coverage report lists it with less line coverage than
+    the threshold; files missing from the report (excluded from coverage)
+    are not.
+
+    Args:
+        root_dir: Root directory to search
+        index: Shared file index (built from root_dir if not given)
+        barrels: Shared barrel index (built if not given)
+        coverage: Per-file coverage by relative path (see load_coverage);
+            only colocation is checked if not given
+        threshold: Line coverage in percent below which a file is reported
+
+    Yields:
+        TestGap per reported file, in walk order
+    """
+    root_path = Path(root_dir).resolve()
+    if index is None:
+        index = FileIndex(root_path)
+    if barrels is None:
+        barrels = BarrelIndex()
+
+    # Ignored directories are pruned from the walk (see jisaku_scan/ignore.json)
+    rules = load_ignore_rules('untested')
+
+    for rel_dir, dirnames, filenames in rules.walk(index):
+        for filename in filenames:
+            # Check if it's a source file (.vue or .ts but not .test.ts)
+            if filename.endswith('.vue') or (filename.endswith('.ts') and not filename.endswith('.test.ts')):
+                # Skip .d.ts files
+                if filename.endswith('.d.ts'):
+                    continue
+
+                # Get relative file path
+                rel_file = join_rel(rel_dir, filename)
+
+                # Skip ignored files (permanent and temporary)
+                if rel_file in rules.files:
+                    continue
+
+                # Skip barrel export files (index.ts with only export statements)
+                if filename == 'index.ts':
+                    file_path_full = os.path.join(root_path, rel_dir, filename)
+                    if is_barrel_export(file_path_full, barrels):
+                        continue
+
+                # Get the base name without extension
+                base_name = filename.rsplit('.', 1)[0]
+                # Expected test file name
+                test_file = base_name + '.test.ts'
+
+                # Check if test file exists in the same directory
+                if test_file not in index.files_in(rel_dir):
+                    yield TestGap(rel_file)
+                elif coverage is not None:
+                    counters = coverage.get(rel_file)
+                    if counters is not None and counters.lines < threshold:
+                        yield TestGap(rel_file, counters.lines)
+
+
+def iter_untested_files(root_dir: str, index: Optional[FileIndex] = None,
+                        barrels: Optional[BarrelIndex] = None) -> Iterator[str]:
+    """
+    Find source files that don't have colocated test files, one at a time.
+
+    Args:
+        root_dir: Root directory to search
+        index: Shared file index (built from root_dir if not given)
+        barrels: Shared barrel index (built if not given)
+
+    Yields:
+        File paths (relative to root_dir) that are missing test files, in walk order
+    """
+    for gap in iter_test_gaps(root_dir, index, barrels):
+        yield gap.path
+
+
+def find_test_gaps(root_dir: str, index: Optional[FileIndex] = None,
+                   barrels: Optional[BarrelIndex] = None, fail_fast: bool = False,
+                   coverage: Optional[Dict[str, FileCoverage]] = None,
+                   threshold: float = DEFAULT_THRESHOLD) -> List[TestGap]:
+    """
+    Find source files without colocated test files or with too little coverage.
+
+    Args:
+        root_dir: Root directory to search
+        index: Shared file index (built from root_dir if not given)
+        barrels: Shared barrel index (built if not given)
+        fail_fast: Stop the walk at the first reported file
+        coverage: Per-file coverage by relative path (see iter_test_gaps)
+        threshold: Line coverage in percent below which a file is reported
+
+    Returns:
+        TestGap list sorted by path; at most one with fail_fast
+    """
+    found = iter_test_gaps(root_dir, index, barrels, coverage, threshold)
+    if fail_fast:
+        return [gap for gap, _ in zip(found, range(1))]
+    return sorted(found)
+
+
+def find_untested_files(root_dir: str, index: Optional[FileIndex] = None,
+                        barrels: Optional[BarrelIndex] = None, fail_fast: bool = False) -> List[str]:
+    """
+    Find source files that don't have colocated test files.
+
+    Args:
+        root_dir: Root directory to search
+        index: Shared file index (built from root_dir if not given)
+        barrels: Shared barrel index (built if not given)
+        fail_fast: Stop the walk at the first untested file
+
+    Returns:
+        List of file paths (relative to root_dir) that are missing test files;
+        at most one with fail_fast
+    """
+    return [gap.path for gap in find_test_gaps(root_dir, index, barrels, fail_fast)]
@@ -0,0 +1,1009 @@
+"""
+Unused Files
+
+Finds source files (.vue, .ts, .js) that are not reachable from any entry
+point through imports, and test files without a corresponding source file.
+
+Imports are extracted per file (with an on-disk parse cache and optional
+worker processes), resolved against the file index and tsconfig paths,
+and collected into a module graph. Unused files are found by marking
+everything reachable from the entry points and sweeping the rest.
+"""
+
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Optional, Tuple
+
+from jisaku_scan.barrels import BarrelIndex, parse_specifiers, strip_comments
+from jisaku_scan.cache import ParseCache, Prefilter, open_parse_cache, read_and_parse, tree_signature
+from jisaku_scan.fs_index import FileIndex, join_rel
+from jisaku_scan.ignore import load_ignore_rules
+from jisaku_scan.parallel import imap_ordered
+from jisaku_scan.resolver import ImportResolver
+from jisaku_scan.scan import ProjectScan
+from jisaku_scan.stats import STATS
+from jisaku_scan.sfc import split_sfc, style_references
+from jisaku_scan.tokenizer import scan_module_references
+from jisaku_scan.graph import REEXPORTS, STYLES, UNRESOLVED, USED, DependencyGraph, write_graph
+from jisaku_scan.incremental import git_changed_files, git_show_files
+from jisaku_scan.shard import in_shard, write_partial
+
+
+def find_all_files(root_dir: Path, index: Optional[FileIndex] = None) -> Iterator[Path]:
+    """
+    Find all files in the project, excluding skipped directories.
+
+    Args:
+        root_dir: Root directory to search
+        index: Shared file index (built from root_dir if not given)
+
+    Yields:
+        File paths, one at a time (nothing is materialized)
+    """
+    if index is None:
+        index = FileIndex(root_dir)
+    for rel_file in index.iter_rel_files():
+        yield index.root / rel_file
+
+
+def is_barrel_export(file_path: Path, barrels: Optional[BarrelIndex] = None) -> bool:
+    """
+    Check if a file is a barrel export (only contains export statements).
+    
+    Args:
+        file_path: Path to the file to check
+        barrels: Shared barrel index (a fresh one is used if not given)
+        
+    Returns:
+        True if the file is a barrel export
+    """
+    if barrels is None:
+        barrels = BarrelIndex()
+    return barrels.is_barrel(file_path)
+
+
+def find_source_files(root_dir: Path, index: Optional[FileIndex] = None,
+                      barrels: Optional[BarrelIndex] = None) -> List[Path]:
+    """
+    Find source files that should be checked for usage.
+
+    Args:
+        root_dir: Root directory
+        index: Shared file index (built from root_dir if not given)
+        barrels: Shared barrel index (built if not given)
+
+    Returns:
+        List of source file paths
+    """
+    if index is None:
+        index = FileIndex(root_dir)
+    if barrels is None:
+        barrels = BarrelIndex()
+    source_files = []
+    # Ignored directories are pruned from the walk (see jisaku_scan/ignore.json)
+    rules = load_ignore_rules('unused')
+
+    # Files with 'config' in the name
+    config_pattern = re.compile(r'config', re.IGNORECASE)
+
+    for rel_dir, dirnames, filenames in rules.walk(index):
+        for filename in filenames:
+            # Check if it's a source file (.vue, .ts, .js but not .test.ts, .d.ts)
+            if filename.endswith(('.vue', '.ts', '.js')) and not filename.endswith(('.test.ts', '.d.ts')):
+                # Get relative file path
+                rel_file = join_rel(rel_dir, filename)
+
+                # Skip ignored files
+                if rel_file in rules.files:
+                    continue
+
+                # Skip config files
+                if config_pattern.search(filename):
+                    continue
+
+                file_path = root_dir / rel_file
+                
+                # Skip barrel export files (index.ts with only export statements)
+                if filename == 'index.ts' and is_barrel_export(file_path, barrels):
+                    continue
+
+                source_files.append(file_path)
+
+    return source_files
+
+
+def extract_imports(content: str) -> Dict[str, list]:
+    """
+    Extract import specifiers from the content of a source file.
+
+    Uses the single-pass tokenizer, which ignores comments and strings and
+    also sees side-effect imports and `import type`.
+
+    Args:
+        content: Decoded file content
+
+    Returns:
+        Dict with 'imports' (all import paths), 'named'
+        ([imports_str, import_path] pairs of named imports),
+        'bindings' ([export name, import_path] pairs of default ('default')
+        and namespace or dynamic ('*') imports), 'reexports' (paths of
+        export ... from statements) and 'styles' (stylesheet references,
+        only found in .vue files)
+    """
+    return _extract_references(content, declarations=False)
+
+
+def extract_imports_and_exports(content: str) -> Dict[str, list]:
+    """
+    Extract import specifiers and the names a module exports, in the same pass.
+
+    Used by the unused exports analysis; the unused files analysis does not
+    pay for lexing past the last import.
+
+    Args:
+        content: Decoded file content
+
+    Returns:
+        Same shape as extract_imports, plus 'exports' (names the module
+        declares as exports, 'default' included; re-exports not included)
+    """
+    return _extract_references(content, declarations=True)
+
+
+def extract_runtime_imports(content: str) -> Dict[str, list]:
+    """
+    Extract the imports that survive the build into the same chunk.
+
+    Used by the route chunk weights analysis. Leaves out what the compiler
+    erases (`import type`, `export type ... from`, named imports whose
+    specifiers all carry a `type` modifier) and dynamic imports, which
+    Vite splits into chunks of their own. Named imports keep only their
+    value specifiers, so a barrel lookup does not follow type-only names.
+
+    Args:
+        content: Decoded file content
+
+    Returns:
+        Same shape as extract_imports
+    """
+    return _extract_references(content, declarations=False, runtime=True)
+
+
+# A `type X` / `type X as Y` specifier (but not an import named `type`)
+TYPE_SPECIFIER_PATTERN = re.compile(r'\s*type\s+(?!as\b)[\w$]')
+
+
+def value_specifiers(specifiers: str) -> str:
+    """Drop the `type`-modified entries of a `{ ... }` specifier list."""
+    return ','.join(part for part in specifiers.split(',')
+                    if part.strip() and not TYPE_SPECIFIER_PATTERN.match(part))
+
+
+def _extract_references(content: str, declarations: bool, runtime: bool = False) -> Dict[str, list]:
+    imports = []
+    named = []
+    bindings = []
+    reexports = []
+    exports = []
+    for reference in scan_module_references(content, declarations):
+        if reference.kind == 'declaration':
+            exports.extend(alias for _, alias in parse_specifiers(strip_comments(reference.names)))
+            continue
+        if runtime and reference.kind in ('type', 'type-export', 'dynamic'):
+            continue
+        if reference.kind in ('export', 'type-export'):
+            reexports.append(reference.specifier)
+            continue
+        names = strip_comments(reference.names) if reference.names is not None else None
+        if runtime and names is not None:
+            values = value_specifiers(names)
+            if not values and not reference.bindings and parse_specifiers(names):
+                # import { type A, type B } from: elided like import type
+                continue
+            names = values
+        imports.append(reference.specifier)
+        if names is not None:
+            named.append([names, reference.specifier])
+        bindings.extend([name, reference.specifier] for name in reference.bindings)
+
+    parsed = {
+        'imports': imports,
+        'named': named,
+        'bindings': bindings,
+        'reexports': reexports,
+        'styles': [],
+    }
+    if declarations:
+        parsed['exports'] = exports
+    return parsed
+
+
+def extract_sfc_imports(content: str) -> Dict[str, list]:
+    """
+    Extract imports and stylesheet references from a Vue single-file component.
+
+    Imports are only read from `<script>` / `<script setup>` blocks, so
+    template and style text is never scanned for them.
+
+    Args:
+        content: Decoded .vue file content
+
+    Returns:
+        Same shape as extract_imports
+    """
+    return _extract_sfc(content, extract_imports)
+
+
+def extract_sfc_runtime_imports(content: str) -> Dict[str, list]:
+    """
+    Extract the runtime imports and stylesheet references of a Vue component.
+
+    Script blocks are read with extract_runtime_imports.
+
+    Args:
+        content: Decoded .vue file content
+
+    Returns:
+        Same shape as extract_imports
+    """
+    return _extract_sfc(content, extract_runtime_imports)
+
+
+def _extract_sfc(content: str, extract_script: Callable[[str], Dict[str, list]]) -> Dict[str, list]:
+    blocks = split_sfc(content)
+    scripts = [block for block in blocks if block.tag == 'script']
+    parsed = extract_script('\n'.join(block.content for block in scripts))
+    # <script src="./x.ts"> pulls in the whole file like an import
+    sources = [block.attrs['src'] for block in scripts if block.attrs.get('src')]
+    parsed['imports'].extend(sources)
+    parsed['bindings'].extend(['*', src] for src in sources)
+    parsed['styles'] = style_references(blocks)
+    return parsed
+
+
+def extract_imports_regex(content: str) -> Dict[str, list]:
+    """
+    Extract import specifiers with the original regexes.
+
+    Kept behind --legacy-regex for differential testing against the tokenizer.
+    It misses side-effect imports and named imports combined with a default
+    import, and matches inside comments and strings.
+
+    Args:
+        content: Decoded file content
+
+    Returns:
+        Dict with 'imports' (all import paths), 'named'
+        ([imports_str, import_path] pairs of named imports) and
+        'reexports' (paths of export ... from statements)
+    """
+    # Find all import statements (including named imports)
+    # Pattern: import { Name1, Name2, ... } from "path"
+    # Pattern: import Name from "path"
+    # Pattern: import ... from "path"
+
+    # First, extract all complete import statements
+    import_lines = re.findall(r'import\s+[^;]*?from\s+[\'"]([^\'"]+)[\'"]', content, re.DOTALL)
+    # Also match dynamic imports: import("path")
+    dynamic_imports = re.findall(r'import\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', content)
+
+    # Also find named imports separately
+    named_imports = re.findall(r'import\s*{([^}]+)}\s*from\s+[\'"]([^\'"]+)[\'"]', content, re.DOTALL)
+
+    # Re-exports: export { ... } from "path" / export * from "path"
+    reexports = re.findall(
+        r'export\s+(?:type\s+)?(?:\*(?:\s+as\s+[\w$]+)?|{[^}]*})\s*from\s*[\'"]([^\'"]+)[\'"]', content
+    )
+
+    return {
+        'imports': import_lines + dynamic_imports,
+        'named': [list(pair) for pair in named_imports],
+        'reexports': reexports,
+    }
+
+
+# Signature shared by extract_imports, extract_imports_and_exports, extract_runtime_imports
+# and extract_imports_regex
+Extractor = Callable[[str], Dict[str, list]]
+
+
+def extractor_for(rel_file: str, extract: Extractor) -> Extractor:
+    """
+    Pick the extractor for a file.
+
+    Args:
+        rel_file: Path of the file
+        extract: Extractor chosen on the command line
+
+    Returns:
+        extract_sfc_imports (extract_sfc_runtime_imports for
+        extract_runtime_imports) for .vue files with the tokenizer, else extract
+    """
+    if rel_file.endswith('.vue'):
+        if extract in (extract_imports, extract_imports_and_exports):
+            return extract_sfc_imports
+        if extract is extract_runtime_imports:
+            return extract_sfc_runtime_imports
+    return extract
+
+
+def is_scanned_file(file_path: Path) -> bool:
+    """Check if a file is parsed for imports (.ts, .vue, .js but not .test.ts)."""
+    return file_path.suffix in ['.ts', '.vue', '.js'] and not file_path.name.endswith('.test.ts')
+
+
+# A src attribute on <script> or <style> (HTML attribute names ignore case)
+SFC_SRC_PATTERN = re.compile(rb'src', re.IGNORECASE)
+
+
+def has_module_keywords(data: bytes) -> bool:
+    """
+    Byte-level prefilter of the import extractors (tokenizer and regexes).
+
+    Every statement they match contains `import` or `export`, so a file
+    with neither byte sequence is skipped without being decoded.
+
+    Args:
+        data: Raw file content (bytes or mmap)
+
+    Returns:
+        True if the file may contain imports
+    """
+    return data.find(b'import') != -1 or data.find(b'export') != -1
+
+
+def has_sfc_references(data: bytes) -> bool:
+    """
+    Byte-level prefilter of extract_sfc_imports: module keywords or a src attribute.
+
+    Args:
+        data: Raw file content (bytes or mmap)
+
+    Returns:
+        True if the component may reference other files
+    """
+    return has_module_keywords(data) or SFC_SRC_PATTERN.search(data) is not None
+
+
+def prefilter_for(extract: Extractor) -> Optional[Prefilter]:
+    """
+    Get the byte-level prefilter matching an extractor.
+
+    Args:
+        extract: Extractor a file is parsed with (see extractor_for)
+
+    Returns:
+        Prefilter function, or None for an extractor without one
+    """
+    if extract in (extract_sfc_imports, extract_sfc_runtime_imports):
+        return has_sfc_references
+    if extract in (extract_imports, extract_imports_and_exports, extract_runtime_imports, extract_imports_regex):
+        return has_module_keywords
+    return None
+
+
+def iter_parsed(root_dir: Path, rel_files: Iterable[str], index: FileIndex,
+                cache: Optional[ParseCache] = None, jobs: int = 1,
+                extract: Extractor = extract_imports) -> Iterator[Tuple[str, Optional[Dict[str, list]]]]:
+    """
+    Extract imports from many files, yielding each result as soon as it is ready.
+
+    Files with a fresh cache entry (same git blob, or same mtime and size)
+    are not read. The rest are read as bytes (memory-mapped when large) and
+    hashed; files the extractor's prefilter
+    rejects are never decoded, the others are decoded and parsed. This runs
+    in up to `jobs` worker processes and no file content outlives its parse.
+    Results do not depend on `jobs`.
+
+    Args:
+        root_dir: Root directory
+        rel_files: Paths relative to root_dir
+        index: Shared file index
+        cache: On-disk parse cache (every file is parsed if not given)
+        jobs: Maximum number of worker processes
+        extract: Import extractor (extract_imports or extract_imports_regex)
+
+    Yields:
+        (relative path, extract result or None if unreadable); fresh cache
+        entries first, then the parsed files in input order
+    """
+    pending = []
+    matches = 0
+    for rel_file in rel_files:
+        blob = index.blob(rel_file)
+        if cache is not None and (cache.matches_blob(rel_file, blob)
+                                  or cache.is_fresh(rel_file, index.stat(root_dir / rel_file), blob)):
+            result = cache.result(rel_file)
+            if STATS.enabled and result is not None:
+                matches += len(result['imports']) + len(result['reexports']) + len(result.get('styles', ()))
+            yield rel_file, result
+        else:
+            pending.append(rel_file)
+
+    tasks = []
+    for rel_file in pending:
+        file_extract = extractor_for(rel_file, extract)
+        known_digest = cache.known_digest(rel_file) if cache is not None else None
+        tasks.append((str(root_dir / rel_file), known_digest, file_extract, prefilter_for(file_extract)))
+
+    bytes_decoded = 0
+    reused = 0
+    prefiltered = 0
+    for rel_file, outcome in zip(pending, imap_ordered(read_and_parse, tasks, jobs)):
+        digest, size, was_reused, _, decoded = outcome
+        reused += was_reused
+        if decoded:
+            bytes_decoded += size
+        elif digest is not None and not was_reused:
+            prefiltered += 1
+        if cache is not None:
+            result = cache.record(rel_file, index.stat(root_dir / rel_file), outcome, index.blob(rel_file))
+        else:
+            result = outcome[3]
+        if STATS.enabled and result is not None:
+            matches += len(result['imports']) + len(result['reexports']) + len(result.get('styles', ()))
+        yield rel_file, result
+
+    STATS.add('files_read', len(pending))
+    STATS.add('bytes_decoded', bytes_decoded)
+    STATS.add('parse_reused', reused)
+    STATS.add('files_prefiltered', prefiltered)
+    STATS.add('import_matches', matches)
+
+
+def parse_files(root_dir: Path, rel_files: Iterable[str], index: FileIndex,
+                cache: Optional[ParseCache] = None, jobs: int = 1,
+                extract: Extractor = extract_imports) -> Dict[str, Optional[Dict[str, list]]]:
+    """
+    Extract imports from many files, in parallel where it pays off (see iter_parsed).
+
+    Args:
+        root_dir: Root directory
+        rel_files: Paths relative to root_dir
+        index: Shared file index
+        cache: On-disk parse cache (every file is parsed if not given)
+        jobs: Maximum number of worker processes
+        extract: Import extractor (extract_imports or extract_imports_regex)
+
+    Returns:
+        Mapping of relative path -> extract result (None if unreadable)
+    """
+    return dict(STATS.timed('parse', iter_parsed(root_dir, rel_files, index, cache, jobs, extract)))
+
+
+def resolve_edges(file_path: Path, parsed: Dict[str, list], barrels: BarrelIndex, resolver: ImportResolver,
+                  resolutions: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Set[str]]:
+    """
+    Resolve the extracted imports of a file into dependency edges.
+
+    Args:
+        file_path: Path of the importing file
+        parsed: Result of extract_imports for the file
+        barrels: Shared barrel index
+        resolver: Shared import resolver
+        resolutions: Previously resolved specifiers (resolved again if not given)
+
+    Returns:
+        Dict with USED (files marked used), REEXPORTS (files re-exported from),
+        STYLES (stylesheets referenced from <style> blocks) and UNRESOLVED
+        (local specifiers that did not resolve)
+    """
+    if resolutions is None:
+        resolutions = resolve_specifiers(file_path, parsed, resolver)
+
+    used: Set[str] = set()
+
+    # Process regular imports
+    for import_path in set(parsed['imports']):
+        resolved_str = resolutions.get(import_path)
+        if resolved_str:
+            used.add(resolved_str)
+
+    # Process named imports - resolve the barrel and the actual exports
+    for imports_str, import_path in parsed['named']:
+        resolved_str = resolutions.get(import_path)
+        if resolved_str:
+            resolved = Path(resolved_str)
+            used.add(resolved_str)
+
+            # If resolved to a barrel export (index.ts), find the actual source files
+            if resolved.name == 'index.ts':
+                # Look up each imported name under its exported name
+                # ("import { Foo as Bar }" imports the export "Foo")
+                for name, _ in parse_specifiers(imports_str):
+                    used.update(str(source) for source in barrels.lookup(resolved, name))
+
+    reexports = {resolutions[spec] for spec in parsed['reexports'] if resolutions.get(spec)}
+    styles = {resolutions[spec] for spec in parsed.get('styles', ()) if resolutions.get(spec)}
+    unresolved = {
+        spec for spec, resolved_str in resolutions.items()
+        if resolved_str is None and spec.startswith(('@/', './', '../'))
+    }
+    return {USED: used, REEXPORTS: reexports, STYLES: styles, UNRESOLVED: unresolved}
+
+
+def resolve_specifiers(file_path: Path, parsed: Dict[str, list],
+                       resolver: ImportResolver) -> Dict[str, Optional[str]]:
+    """
+    Resolve every distinct specifier extracted from a file.
+
+    Args:
+        file_path: Path of the importing file
+        parsed: Result of extract_imports for the file
+        resolver: Shared import resolver
+
+    Returns:
+        Mapping of specifier -> resolved absolute path (None if unresolved)
+    """
+    specifiers = set(parsed['imports'])
+    specifiers.update(import_path for _, import_path in parsed['named'])
+    specifiers.update(parsed['reexports'])
+    specifiers.update(parsed.get('styles', ()))
+    resolutions = {}
+    for import_path in specifiers:
+        resolved = resolver.resolve(file_path, import_path)
+        resolutions[import_path] = str(resolved) if resolved else None
+    return resolutions
+
+
+def find_file_edges(root_dir: Path, rel_file: str, parsed: Optional[Dict[str, list]],
+                    barrels: BarrelIndex, resolver: ImportResolver, cache: Optional[ParseCache] = None,
+                    tree_key: str = '') -> Optional[Dict[str, Set[str]]]:
+    """
+    Resolve the parsed imports of a single file into dependency edges.
+
+    Args:
+        root_dir: Root directory
+        rel_file: Path of the file relative to root_dir
+        parsed: Result of extract_imports for the file (None if unreadable)
+        barrels: Shared barrel index
+        resolver: Shared import resolver
+        cache: On-disk parse cache (for cached resolutions)
+        tree_key: Signature of the indexed file set (for cached resolutions)
+
+    Returns:
+        Edges as returned by resolve_edges, or None if the file cannot be read
+    """
+    if parsed is None:
+        return None
+    file_path = root_dir / rel_file
+
+    resolutions = cache.resolved(rel_file, tree_key) if cache is not None else None
+    if resolutions is None:
+        resolutions = resolve_specifiers(file_path, parsed, resolver)
+        if cache is not None:
+            cache.store_resolved(rel_file, tree_key, resolutions)
+
+    return resolve_edges(file_path, parsed, barrels, resolver, resolutions)
+
+
+def update_graph(graph: DependencyGraph, root_dir: Path, rel_files: List[str],
+                 parsed_files: Dict[str, Optional[Dict[str, list]]], barrels: BarrelIndex,
+                 resolver: ImportResolver, cache: Optional[ParseCache] = None, tree_key: str = '') -> None:
+    """
+    Resolve the parsed imports of files and set them as their edges in the graph.
+
+    Args:
+        graph: Module graph to update
+        root_dir: Root directory
+        rel_files: Paths (relative to root_dir) of the files to update
+        parsed_files: Extract results by relative path (see parse_files)
+        barrels: Shared barrel index
+        resolver: Shared import resolver
+        cache: On-disk parse cache (for cached resolutions; edges are recorded in it)
+        tree_key: Signature of the indexed file set (for cached resolutions)
+    """
+    with STATS.phase('resolve'):
+        for rel_file in rel_files:
+            set_file_edges(graph, root_dir, rel_file, parsed_files[rel_file], barrels, resolver, cache, tree_key)
+
+
+def set_file_edges(graph: DependencyGraph, root_dir: Path, rel_file: str, parsed: Optional[Dict[str, list]],
+                   barrels: BarrelIndex, resolver: ImportResolver, cache: Optional[ParseCache] = None,
+                   tree_key: str = '') -> None:
+    """
+    Resolve the parsed imports of one file and set them as its edges in the graph.
+
+    Args:
+        graph: Module graph to update
+        root_dir: Root directory
+        rel_file: Path of the file relative to root_dir
+        parsed: Extract result of the file (None if unreadable)
+        barrels: Shared barrel index
+        resolver: Shared import resolver
+        cache: On-disk parse cache (for cached resolutions; edges are recorded in it)
+        tree_key: Signature of the indexed file set (for cached resolutions)
+    """
+    edges = find_file_edges(root_dir, rel_file, parsed, barrels, resolver, cache, tree_key)
+    if edges is None:
+        graph.set_edges(str(root_dir / rel_file), {})
+        return
+    if cache is not None:
+        # Recorded for later --changed runs
+        cache.store_edges(rel_file, edges)
+    graph.set_edges(str(root_dir / rel_file), edges)
+
+
+def build_module_graph(root_dir: Path, index: Optional[FileIndex] = None,
+                       barrels: Optional[BarrelIndex] = None,
+                       cache: Optional[ParseCache] = None, jobs: int = 1,
+                       resolver: Optional[ImportResolver] = None,
+                       extract: Extractor = extract_imports, include_tests: bool = False,
+                       shard: Optional[Tuple[int, int]] = None) -> DependencyGraph:
+    """
+    Build the module graph: every scanned file with its resolved imports.
+
+    Args:
+        root_dir: Root directory
+        index: Shared file index (built from root_dir if not given)
+        barrels: Shared barrel index (built if not given)
+        cache: On-disk parse cache (files are always parsed if not given)
+        jobs: Maximum number of worker processes for parsing
+        resolver: Shared import resolver (built from the index if not given)
+        extract: Import extractor
+        include_tests: Add the .test.ts files as nodes too (for test impact)
+        shard: Only parse and resolve the files of shard (I, N) (see jisaku_scan.shard)
+
+    Returns:
+        DependencyGraph with one node per scanned file (of the shard)
+    """
+    if index is None:
+        index = FileIndex(root_dir)
+    if resolver is None:
+        resolver = ImportResolver(root_dir, index)
+    if barrels is None:
+        barrels = make_barrel_index(resolver)
+    graph = DependencyGraph()
+    rel_files = index.rel_files()
+    # Cached resolutions are only valid for the same set of files
+    tree_key = tree_signature(rel_files) if cache is not None else ''
+
+    # Streamed: each file's imports are resolved as soon as it is parsed and
+    # its parse result is dropped, so only the graph itself grows with the tree
+    scanned = (rel_file for rel_file in rel_files
+               if is_scanned_file(Path(rel_file)) or include_tests and rel_file.endswith('.test.ts'))
+    if shard is not None:
+        scanned = (rel_file for rel_file in scanned if in_shard(rel_file, shard))
+    for rel_file, parsed in STATS.timed('parse', iter_parsed(root_dir, scanned, index, cache, jobs, extract)):
+        with STATS.phase('resolve'):
+            set_file_edges(graph, root_dir, rel_file, parsed, barrels, resolver, cache, tree_key)
+    return graph
+
+
+def find_used_files(root_dir: Path, index: Optional[FileIndex] = None,
+                    barrels: Optional[BarrelIndex] = None,
+                    cache: Optional[ParseCache] = None, jobs: int = 1,
+                    resolver: Optional[ImportResolver] = None,
+                    extract: Extractor = extract_imports) -> Set[Path]:
+    """
+    Find all files that are imported somewhere in the codebase.
+
+    Unlike reachability from the entry points, a file only imported by
+    unused files still counts as used here.
+
+    Args:
+        root_dir: Root directory
+        index: Shared file index (built from root_dir if not given)
+        barrels: Shared barrel index (built if not given)
+        cache: On-disk parse cache (files are always parsed if not given)
+        jobs: Maximum number of worker processes for parsing
+        resolver: Shared import resolver (built from the index if not given)
+        extract: Import extractor
+
+    Returns:
+        Set of absolute paths to files that are imported
+    """
+    graph = build_module_graph(root_dir, index, barrels, cache, jobs, resolver, extract)
+    return {Path(target) for target in graph.used_targets()}
+
+
+def build_module_graph_incremental(root_dir: Path, changed: Set[str], index: FileIndex,
+                                   barrels: BarrelIndex, resolver: ImportResolver,
+                                   cache: Optional[ParseCache] = None,
+                                   changed_ref: Optional[str] = None, jobs: int = 1,
+                                   extract: Extractor = extract_imports) -> Tuple[DependencyGraph, Set[Path]]:
+    """
+    Build the module graph, re-evaluating only what an edit can affect.
+
+    Edges of files unchanged since the last run are loaded from the cache.
+    Touched files (changed, added or removed) and every file importing them,
+    directly or through barrels, are parsed and resolved again.
+
+    Args:
+        root_dir: Root directory
+        changed: Paths (relative to root_dir) changed relative to the git ref
+        index: Shared file index
+        barrels: Shared barrel index
+        resolver: Shared import resolver
+        cache: On-disk parse cache (without it, every file is re-evaluated)
+        changed_ref: The git ref, used to read what changed files imported before
+        jobs: Maximum number of worker processes for parsing
+        extract: Import extractor
+
+    Returns:
+        Tuple of (module graph, files whose reachability may have changed)
+    """
+    all_rel_files = index.rel_files()
+    present = set(all_rel_files)
+    scanned = {str(root_dir / rel): rel for rel in all_rel_files if is_scanned_file(Path(rel))}
+    cached_paths = set(cache.paths()) if cache is not None else set()
+
+    # Load the recorded graph; anything modified since the last run is stale
+    graph = DependencyGraph()
+    previous: Dict[str, Dict[str, List[str]]] = {}
+    stale: Set[str] = set()
+    for node, rel in scanned.items():
+        edges = cache.edges(rel) if cache is not None else None
+        if edges is not None:
+            previous[node] = edges
+        if edges is not None and (cache.matches_blob(rel, index.blob(rel))
+                                  or cache.is_fresh(rel, index.stat(Path(node)))):
+            graph.set_edges(node, edges)
+        else:
+            stale.add(node)
+
+    removed = set()
+    for rel in cached_paths - present:
+        node = str(root_dir / rel)
+        removed.add(node)
+        edges = cache.edges(rel)
+        if edges is not None:
+            previous[node] = edges
+
+    touched = stale | removed
+    added = [node for node in stale if scanned[node] not in cached_paths]
+    for node in added:
+        # A new file can shadow a sibling with the same stem (./foo -> foo.ts)
+        stem = str(Path(node).with_suffix(''))
+        touched.update(stem + ext for ext in ['', '.ts', '.vue', '.js'])
+
+    recompute = set(stale)
+    recompute.update(node for node in graph.importers_of(touched) if node in scanned)
+    if added or removed:
+        # New files may satisfy imports that did not resolve before
+        recompute.update(node for node, edges in graph.edges.items() if edges.get(UNRESOLVED))
+
+    tree_key = tree_signature(all_rel_files) if cache is not None else ''
+    recompute_rel = [scanned[node] for node in sorted(recompute)]
+    parsed_files = parse_files(root_dir, recompute_rel, index, cache, jobs, extract)
+    update_graph(graph, root_dir, recompute_rel, parsed_files, barrels, resolver, cache, tree_key)
+
+    with STATS.phase('scope'):
+        # Files whose status can differ: everything touched since the last run
+        # and the old and new targets of every re-evaluated file ...
+        scope = set(touched)
+        for node in recompute | removed:
+            scope.update(previous.get(node, {}).get(USED, ()))
+            scope.update(graph.edges.get(node, {}).get(USED, ()))
+
+        # ... plus everything changed relative to the ref, with what those files
+        # import now and what they imported (or re-exported) at the ref
+        changed_scanned = sorted(rel for rel in changed if is_scanned_file(Path(rel)))
+        old_contents = git_show_files(root_dir, changed_ref, changed_scanned) if changed_ref else {}
+        for rel in changed_scanned:
+            node = str(root_dir / rel)
+            scope.add(node)
+            scope.update(graph.edges.get(node, {}).get(USED, ()))
+            content = old_contents.get(rel)
+            if content is not None:
+                old_edges = resolve_edges(root_dir / rel, extractor_for(rel, extract)(content), barrels, resolver)
+                scope.update(old_edges[USED] | old_edges[REEXPORTS])
+        scope.update(str(root_dir / rel) for rel in changed)
+
+        # Reachability flows downstream: everything reachable from the scope,
+        # before or after the edit, may have gained or lost its last importer
+        before = DependencyGraph()
+        for node, edges in graph.edges.items():
+            before.set_edges(node, previous.get(node, {}) if node in recompute else edges)
+        for node in removed:
+            before.set_edges(node, previous.get(node, {}))
+        scope = graph.reachable(scope) | before.reachable(scope)
+
+    return graph, {Path(node) for node in scope}
+
+
+def make_barrel_index(resolver: ImportResolver) -> BarrelIndex:
+    """
+    Create a barrel index that resolves re-exports like regular imports.
+
+    Args:
+        resolver: Shared import resolver
+
+    Returns:
+        Empty BarrelIndex using the resolver
+    """
+    return BarrelIndex(resolver.resolve)
+
+
+def find_entry_points(root_dir: Path) -> Set[Path]:
+    """
+    Find entry points - files that are used without being imported.
+
+    Args:
+        root_dir: Root directory
+
+    Returns:
+        Set of absolute paths to entry point files
+    """
+    entry_points = {
+        root_dir / 'src/main.ts',
+        root_dir / 'src/App.vue',
+        root_dir / 'index.html',
+    }
+
+    # Add all pages (used by router)
+    pages_dir = root_dir / 'src/pages'
+    if pages_dir.exists():
+        for file_path in pages_dir.glob('*.vue'):
+            entry_points.add(file_path)
+
+    # Add router (index.ts and the route table with its lazy page imports)
+    router_dir = root_dir / 'src/router'
+    if router_dir.exists():
+        for file_path in router_dir.glob('*.ts'):
+            if not file_path.name.endswith('.test.ts'):
+                entry_points.add(file_path)
+
+    return entry_points
+
+
+def mark_and_sweep(root_dir: Path, graph: DependencyGraph,
+                   source_files: List[Path]) -> Tuple[Set[str], List[Path]]:
+    """
+    Mark everything reachable from the roots and sweep the source files.
+
+    The roots are the entry points plus every file that is never reported
+    (config, scripts, ignored directories); test files are not roots.
+
+    Args:
+        root_dir: Root directory
+        graph: Module graph
+        source_files: Files that can be reported (see find_source_files)
+
+    Returns:
+        Tuple of (roots, source files not reachable from them)
+    """
+    source_set = {str(file_path) for file_path in source_files}
+    roots = {str(file_path) for file_path in find_entry_points(root_dir)}
+    roots.update(
+        node for node in graph.edges
+        if node not in source_set and not node.endswith('.test.ts')
+    )
+    reachable = graph.reachable(roots)
+    return roots, [file_path for file_path in source_files if str(file_path) not in reachable]
+
+
+def find_orphaned_test_files(root_dir: Path, index: Optional[FileIndex] = None) -> List[Path]:
+    """
+    Find test files that don't have a corresponding source file.
+
+    Args:
+        root_dir: Root directory
+        index: Shared file index (built from root_dir if not given)
+
+    Returns:
+        List of orphaned test file paths (relative to root_dir)
+    """
+    if index is None:
+        index = FileIndex(root_dir)
+    orphaned = []
+    # Ignored directories are pruned from the walk (see jisaku_scan/ignore.json)
+    rules = load_ignore_rules('orphaned_tests')
+
+    for rel_dir, dirnames, filenames in rules.walk(index):
+        for filename in filenames:
+            if filename.endswith('.test.ts'):
+                # Get the base name without .test.ts
+                base_name = filename[:-8]  # Remove '.test.ts'
+
+                # Check for corresponding source files
+                has_source = False
+                file_set = index.files_in(rel_dir)
+                for ext in ['.ts', '.vue', '.js']:
+                    source_file = base_name + ext
+                    if source_file in file_set:
+                        has_source = True
+                        break
+
+                if not has_source:
+                    orphaned.append(root_dir / rel_dir / filename)
+
+    return sorted(orphaned)
+
+
+def write_shard(root_dir: Path, shard: Tuple[int, int], out_path: Path, use_cache: bool = True, jobs: int = 1,
+                extract: Extractor = extract_imports, scan: Optional[ProjectScan] = None) -> int:
+    """
+    Parse and resolve the files of one shard and write them as a partial graph.
+
+    Args:
+        root_dir: Root directory
+        shard: (I, N) of the shard (see jisaku_scan.shard)
+        out_path: Partial graph file to write
+        use_cache: Reuse and update the on-disk parse cache
+        jobs: Maximum number of worker processes for parsing
+        extract: Import extractor
+        scan: Shared scan of root_dir (built if not given)
+
+    Returns:
+        Number of files in the shard
+    """
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    index = scan.index
+    # Same cache entries as a full run: a machine can run any shard
+    with open_parse_cache(root_dir, extract, index.rel_files(), use_cache) as cache:
+        graph = build_module_graph(root_dir, index, scan.barrels, cache, jobs, scan.resolver, extract, shard=shard)
+    with STATS.phase('write partial'):
+        write_partial(out_path, graph, scan.root, index, shard, extract.__name__)
+    STATS.collect(scan, cache)
+    return len(graph.edges)
+
+
+def find_unused_files(root_dir: Path, use_cache: bool = True,
+                      changed_ref: Optional[str] = None, jobs: int = 1,
+                      extract: Extractor = extract_imports,
+                      graph_out: Optional[Path] = None,
+                      scan: Optional[ProjectScan] = None, fail_fast: bool = False,
+                      graph: Optional[DependencyGraph] = None) -> List[Path]:
+    """
+    Find source files that are not reachable from any entry point.
+
+    Args:
+        root_dir: Root directory
+        use_cache: Reuse and update the on-disk parse cache
+        changed_ref: Only report files an edit since this git ref can affect
+        jobs: Maximum number of worker processes for parsing
+        extract: Import extractor
+        graph_out: Write the module graph here (.dot for Graphviz, else JSON)
+        scan: Shared scan of root_dir (built if not given)
+        fail_fast: Stop at the first finding (reachability needs the whole
+            graph, so this only skips the work after the sweep)
+        graph: Module graph of the whole tree, already built (merged from
+            shards); nothing is parsed and the cache is not used
+
+    Returns:
+        List of unused file paths (relative to root_dir); at most one with fail_fast
+
+    Raises:
+        ValueError: If changed_ref is given and git cannot list changes
+    """
+    with STATS.phase('git'):
+        changed = git_changed_files(root_dir, changed_ref) if changed_ref else None
+
+    # Walk the tree once and share the index between all phases
+    if scan is None:
+        scan = ProjectScan(root_dir)
+    index, resolver, barrels = scan.index, scan.resolver, scan.barrels
+
+    with STATS.phase('classify'):
+        source_files = find_source_files(root_dir, index, barrels)
+    scope: Optional[Set[Path]] = None
+    # A given graph (merged from shards) is used as it is, without the cache
+    with open_parse_cache(root_dir, extract, index.rel_files(), use_cache and graph is None) as cache:
+        if graph is None and changed is None:
+            graph = build_module_graph(root_dir, index, barrels, cache, jobs, resolver, extract)
+        elif graph is None:
+            graph, scope = build_module_graph_incremental(
+                root_dir, changed, index, barrels, resolver, cache, changed_ref, jobs, extract
+            )
+    with STATS.phase('mark and sweep'):
+        roots, unused = mark_and_sweep(root_dir, graph, source_files)
+        if graph_out is not None:
+            write_graph(graph, graph_out, root_dir, roots)
+        if scope is not None:
+            unused = [file_path for file_path in unused if file_path in scope]
+    if fail_fast and unused:
+        STATS.collect(scan, cache)
+        return sorted(unused)[:1]
+
+    # Also find orphaned test files
+    with STATS.phase('orphaned tests'):
+        orphaned_tests = find_orphaned_test_files(root_dir, index)
+        if scope is not None:
+            scope_dirs = {file_path.parent for file_path in scope}
+            orphaned_tests = [test for test in orphaned_tests if test.parent in scope_dirs]
+    unused.extend(orphaned_tests)
+
+    STATS.collect(scan, cache)
+    return sorted(unused)[:1] if fail_fast else sorted(unused)
@@ -0,0 +1,273 @@
+"""
+File Watchers
+
+Change notification for the watch daemon (see jisaku_scan.daemon).
+
+On Linux the tree is watched with inotify, called through ctypes so no
+extra package is needed: one watch per indexed directory, added as new
+directories appear. Elsewhere, or when inotify is unavailable (watch limit
+reached, unsupported filesystem), the tree is polled: every interval it is
+walked again and file mtimes and sizes are compared.
+
+Both watchers report changed paths relative to the root. None means the
+watcher lost track (inotify queue overflow) and everything must be rescanned.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from jisaku_scan.fs_index import SKIP_DIRS, FileIndex, join_rel
+
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+EVENT_HEADER = struct.Struct('iIII')
+
+# Default seconds between two walks of the polling watcher
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class InotifyWatcher:
+    """
+    Watches every indexed directory with inotify.
+
+    Attributes:
+        kind: 'inotify'
+        timeout: Seconds the daemon may block between reads (None: wait for the fd)
+    """
+
+    kind = 'inotify'
+    timeout: Optional[float] = None
+
+    def __init__(self, root_dir: Path, rel_dirs: Iterable[str], skip_dirs: Iterable[str] = SKIP_DIRS):
+        """
+        Create the inotify instance and watch the given directories.
+
+        Args:
+            root_dir: Root directory of the project
+            rel_dirs: Directories to watch, relative to the root
+            skip_dirs: Directory names that are never watched
+
+        Raises:
+            OSError: If inotify is not available or a watch cannot be added
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError('inotify is only available on Linux')
+        self.root = Path(root_dir)
+        self.skip_dirs = frozenset(skip_dirs)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f'inotify_init1 failed: {os.strerror(errno)}')
+        # watch descriptor <-> directory relative to the root
+        self._dirs: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+        try:
+            for rel_dir in rel_dirs:
+                self._watch(rel_dir)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, rel_dir: str) -> None:
+        path = str(self.root) if rel_dir == '.' else os.path.join(str(self.root), rel_dir)
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            # The directory vanished before it could be watched
+            if errno in (2, 20):  # ENOENT, ENOTDIR
+                return
+            raise OSError(errno, f"cannot watch '{path}': {os.strerror(errno)}")
+        self._dirs[wd] = rel_dir
+        self._watches[rel_dir] = wd
+
+    def _watch_tree(self, top: str, changed: Set[str]) -> None:
+        """Watch a new directory and its subdirectories, reporting the files already in them."""
+        pending = [top]
+        while pending:
+            rel_dir = pending.pop()
+            if rel_dir in self._watches:
+                continue
+            self._watch(rel_dir)
+            try:
+                with os.scandir(self.root / rel_dir) as entries:
+                    for entry in entries:
+                        rel_path = join_rel(rel_dir, entry.name)
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.skip_dirs:
+                                pending.append(rel_path)
+                        changed.add(rel_path)
+            except OSError:
+                continue
+
+    def fileno(self) -> Optional[int]:
+        """Get the file descriptor to wait on."""
+        return self._fd
+
+    def read_changes(self) -> Optional[Set[str]]:
+        """
+        Read the pending events without blocking.
+
+        Returns:
+            Changed paths relative to the root, or None after a queue overflow
+        """
+        changed: Set[str] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                rel_dir = self._dirs.get(wd)
+                if rel_dir is None:
+                    continue
+                if mask & IN_IGNORED:
+                    # The directory was removed (or unmounted)
+                    del self._dirs[wd]
+                    self._watches.pop(rel_dir, None)
+                    continue
+                if not name:
+                    # Event on the watched directory itself (deleted or moved)
+                    changed.add(rel_dir)
+                    continue
+                if mask & IN_ISDIR and name in self.skip_dirs:
+                    continue
+                rel_path = join_rel(rel_dir, name)
+                changed.add(rel_path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(rel_path, changed)
+                elif mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                    self._forget(rel_path)
+        return None if overflow else changed
+
+    def _forget(self, top: str) -> None:
+        """Stop watching a directory moved out of its place (and its subdirectories)."""
+        prefix = top + os.sep
+        for rel_dir in [rel_dir for rel_dir in self._watches if rel_dir == top or rel_dir.startswith(prefix)]:
+            wd = self._watches.pop(rel_dir)
+            self._dirs.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def close(self) -> None:
+        """Release the inotify instance."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """
+    Detects changes by walking the tree every interval and comparing mtimes and sizes.
+
+    Attributes:
+        kind: 'poll'
+        timeout: Seconds between two walks
+    """
+
+    kind = 'poll'
+
+    def __init__(self, root_dir: Path, interval: float = DEFAULT_POLL_INTERVAL,
+                 skip_dirs: Iterable[str] = SKIP_DIRS):
+        """
+        Take the first snapshot of the tree.
+
+        Args:
+            root_dir: Root directory of the project
+            interval: Seconds between two walks
+            skip_dirs: Directory names that are not walked
+        """
+        self.root = Path(root_dir)
+        self.timeout = interval
+        self.skip_dirs = frozenset(skip_dirs)
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + interval
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for rel_file in FileIndex(self.root, self.skip_dirs).rel_files():
+            try:
+                stat = os.stat(self.root / rel_file)
+            except OSError:
+                continue
+            snapshot[rel_file] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def fileno(self) -> Optional[int]:
+        """Polling has no file descriptor to wait on."""
+        return None
+
+    def read_changes(self) -> Optional[Set[str]]:
+        """
+        Walk the tree if the interval has passed and report what differs.
+
+        Returns:
+            Changed paths relative to the root (empty between two walks)
+        """
+        now = time.monotonic()
+        if now < self._next_poll:
+            return set()
+        snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + self.timeout
+        changed = {rel_file for rel_file in snapshot.keys() | self._snapshot.keys()
+                   if snapshot.get(rel_file) != self._snapshot.get(rel_file)}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def make_watcher(root_dir: Path, index: FileIndex, poll: Optional[float] = None):
+    """
+    Create the best available watcher for a tree.
+
+    Args:
+        root_dir: Root directory of the project
+        index: File index of the tree (its directories are watched)
+        poll: Force polling with this interval in seconds
+
+    Returns:
+        InotifyWatcher, or PollingWatcher if polling was requested or
+        inotify is unavailable
+    """
+    if poll is None:
+        try:
+            return InotifyWatcher(root_dir, list(index.dirs), index.skip_dirs)
+        except OSError as e:
+            print(f"inotify unavailable ({e}), polling every {DEFAULT_POLL_INTERVAL:g}s instead")
+            poll = DEFAULT_POLL_INTERVAL
+    return PollingWatcher(root_dir, poll, index.skip_dirs)